@@ -0,0 +1,291 @@
+"""모든 Streamlit 페이지를 헤드리스(AppTest)로 돌려 렌더링 시간을 재는 벤치마크.
+
+페이지마다 새 프로세스에서
+- 콜드 스타트: 프로세스 시작 → 첫 렌더링 완료까지 (import 포함)
+- 첫 렌더링: 첫 `AppTest.run()` 한 번
+- 웜 리런: 아무것도 바꾸지 않고 다시 `run()`
+- 위젯 스윕: 날짜·호선, MBTI 유형, 슬라이더 값 등을 모두 바꿔 가며 `run()`
+  (지하철은 보기 방식마다 따로 — 스윕별 분포는 `sweeps`에도 남김)
+을 재고, 최대 메모리(프로세스 최대 RSS, 선택하면 tracemalloc 최고치)를 함께 기록한다.
+
+    python benchmarks/bench_pages.py                   # 전체 실행, 결과를 JSON으로 저장
+    python benchmarks/bench_pages.py --page subway     # 한 페이지만
+    python benchmarks/bench_pages.py --save-baseline   # 결과를 기준값으로 저장
+    python benchmarks/bench_pages.py --compare         # 기준값보다 느려졌으면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+RESULTS_PATH = ROOT / ".cache" / "bench" / "latest.json"
+
+# 페이지 이름 → (스크립트, 스윕). 스윕 하나는 위젯 목록이고, 앞 위젯의 값마다
+# 뒤 위젯의 선택지를 다시 읽어 모든 조합을 돈다 (예: 월 → 날짜 → 호선).
+# 위젯은 라벨(모든 선택지) 또는 (라벨, 값 목록) / (라벨, 개수: 선택지에서 고르게 뽑은 대표값)
+SUBWAY_MODE = "🔀 보기 방식"
+PAGES = {
+    "main": ("main.py", [["좋아하는 음식을 선택하세요!"]]),
+    "career": ("01_쁑뺭스.py", [["나의 MBTI"]]),
+    "career_simple": ("pages/00_뿡빵스.py", [["너의 MBTI 유형을 골라줘 💬"]]),
+    "tour": ("pages/02_관광지.py", [["여행 일수를 선택하세요:"]]),
+    "mbti": ("pages/03_MBTI분석.py", [["국가를 선택하세요:"], ["MBTI 유형을 선택하세요:"]]),
+    "subway": ("pages/04_지하철 분석.py", [
+        [(SUBWAY_MODE, ["📊 하루 Top 10"]), "🗓 월을 선택하세요", "📅 하루를 선택하세요", "🚏 호선을 선택하세요"],
+        [(SUBWAY_MODE, ["🏙 역별 Top N"]), "🗓 월을 선택하세요", ("📅 하루를 선택하세요", 5), "🏅 몇 위까지 볼까요?"],
+        [(SUBWAY_MODE, ["📈 기간 추이"]), ("🎯 무엇을 볼까요?", ["역명", "노선명"]), ("🔎 대상을 선택하세요", 3)],
+        [(SUBWAY_MODE, ["🗺 전체 역"]), "🗓 월을 선택하세요", ("🪶 점 줄이기 (다운샘플)", [True]),
+         ("최대 점 수", 3), ("📐 로그 눈금", [True, False])],
+        [(SUBWAY_MODE, ["🚨 이상치"]), ("🎚 얼마나 벗어나야 이상치일까요? (강건 z-점수)", 4),
+         ("📅 하루를 선택하세요", 5)],
+    ]),
+    "tea": ("pages/05_녹차레시피.py", [["🤏 부족해도 괜찮은 재료 수"]]),
+    "brands": ("pages/07_수행평가.py", [["어떤 브랜드 타입을 볼까?"], ["최소 해외 점포수 기준은?"]]),
+}
+
+# 기준값 대비 이만큼(비율) 넘게 느려지거나 커지면 회귀로 본다
+TOLERANCE = 0.25
+COMPARED = ["cold_start_s", "first_render_s", "warm_rerun_s.p50", "sweep_s.p50", "sweep_s.p95", "peak_mb"]
+
+
+def _summary(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max": ordered[-1],
+    }
+
+
+def _find(at, label):
+    for widget in [*at.selectbox, *at.radio, *at.slider, *at.checkbox]:
+        if widget.label == label:
+            return widget
+    return None
+
+
+def _choices(widget, pick=None):
+    """위젯에 넣어 볼 선택지. `pick`이 목록이면 그 값 그대로, 개수면 고르게 뽑은 대표값만."""
+    from streamlit.testing.v1.element_tree import Checkbox, Slider
+
+    if isinstance(pick, list):
+        return [("value", value) for value in pick]
+    if isinstance(widget, Slider):
+        step = widget.step or 1
+        count = int(round((widget.max - widget.min) / step))
+        choices = [widget.min + i * step for i in range(count + 1)]  # 실수 슬라이더(0.5 간격 등)도
+    elif isinstance(widget, Checkbox):
+        choices = [False, True]
+    else:
+        choices = list(range(len(widget.options)))
+    if pick and len(choices) > pick:
+        choices = [choices[round(i * (len(choices) - 1) / max(pick - 1, 1))] for i in range(pick)]
+    return [("choice", choice) for choice in choices]
+
+
+def _select(widget, choice):
+    from streamlit.testing.v1.element_tree import Radio, Selectbox
+
+    how, value = choice
+    if how == "value":
+        return widget.set_value(value)
+    if isinstance(widget, Selectbox):
+        return widget.select_index(value)
+    if isinstance(widget, Radio):
+        return widget.set_value(widget.options[value])
+    return widget.set_value(value)  # 슬라이더·체크박스는 값 그대로
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    return time.perf_counter() - start
+
+
+def _sweep(at, labels, samples, errors, limit):
+    """`labels` 위젯들의 모든 조합을 돌며 리런 시간을 `samples`에 모은다."""
+    if not labels or len(samples) >= limit:
+        return
+    label, pick = labels[0] if isinstance(labels[0], tuple) else (labels[0], None)
+    widget = _find(at, label)
+    if widget is None:
+        errors.append(f"위젯을 찾을 수 없음: {label}")
+        return
+    for choice in _choices(widget, pick):
+        if len(samples) >= limit:
+            return
+        widget = _find(at, label)
+        if widget is None:
+            return
+        samples.append(_timed_run(_select(widget, choice)))
+        errors.extend(e.message for e in at.exception)
+        _sweep(at, labels[1:], samples, errors, limit)
+
+
+def _sweep_name(labels):
+    """스윕 이름: 첫 위젯을 한 값으로 고정했으면 그 값 (지하철 보기 방식), 아니면 첫 라벨."""
+    first = labels[0]
+    if isinstance(first, tuple):
+        label, pick = first
+        return str(pick[0]) if isinstance(pick, list) and len(pick) == 1 else label
+    return first
+
+
+def bench_page(name, limit, trace_memory=False):
+    """현재 프로세스에서 한 페이지를 잰다 (자식 프로세스에서 실행됨)."""
+    from streamlit.testing.v1 import AppTest
+
+    script, sweeps = PAGES[name]
+    if trace_memory:
+        # 파이썬 할당까지 추적하면 정확하지만 실행이 몇 배 느려지므로 선택 사항
+        tracemalloc.start()
+    at = AppTest.from_file(str(ROOT / script), default_timeout=120)
+    first = _timed_run(at)
+    errors = [e.message for e in at.exception]
+    warm = [_timed_run(at) for _ in range(3)]
+
+    # 스윕마다 `limit`번까지 (앞 스윕이 한도를 다 써서 뒤 보기 방식을 못 재는 일이 없도록)
+    samples, by_sweep = [], {}
+    for labels in sweeps:
+        sweep_samples = []
+        _sweep(at, labels, sweep_samples, errors, limit)
+        by_sweep[_sweep_name(labels)] = _summary(sweep_samples)
+        samples += sweep_samples
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {
+        "first_render_s": first,
+        "warm_rerun_s": _summary(warm),
+        "sweep_s": _summary(samples),
+        "sweeps": by_sweep,
+        "peak_mb": rss / (1 << 20) if sys.platform == "darwin" else rss / 1024,
+        "errors": sorted(set(errors)),
+    }
+    if trace_memory:
+        result["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1 << 20)
+        tracemalloc.stop()
+    return result
+
+
+def run_page(name, limit, cold_disk, trace_memory=False):
+    """새 프로세스에서 페이지를 재고, 프로세스 시작부터의 시간을 콜드 스타트로 기록한다."""
+    if cold_disk:
+        shutil.rmtree(ROOT / ".cache", ignore_errors=True)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", name, "--limit", str(limit)]
+        + (["--trace-memory"] if trace_memory else []),
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"errors": [proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "실패"]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    total = time.perf_counter() - start
+    # 콜드 스타트 = 프로세스 시작 ~ 첫 렌더링 끝 (웜 리런·스윕에 쓴 시간은 뺌)
+    spent_after = sum(
+        (result[k]["p50"] * result[k]["n"]) if result.get(k) else 0 for k in ("warm_rerun_s", "sweep_s")
+    )
+    result["cold_start_s"] = max(result["first_render_s"], total - spent_after)
+    return result
+
+
+def _metric(result, path):
+    value = result
+    for part in path.split("."):
+        if not isinstance(value, dict) or value.get(part) is None:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """기준값보다 `tolerance` 넘게 나빠진 항목 목록."""
+    regressions = []
+    for name, result in current["pages"].items():
+        base = baseline["pages"].get(name)
+        if not base:
+            continue
+        for path in COMPARED:
+            now, before = _metric(result, path), _metric(base, path)
+            if now is None or not before:
+                continue
+            if now > before * (1 + tolerance):
+                regressions.append(f"{name}.{path}: {before:.3f} → {now:.3f} (+{now / before - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", action="append", choices=sorted(PAGES), help="잴 페이지 (여러 번 지정 가능)")
+    parser.add_argument("--limit", type=int, default=1000, help="스윕 하나당 리런 최대 횟수")
+    parser.add_argument("--cold-disk", action="store_true", help="페이지마다 .cache/를 지우고 시작")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc으로 파이썬 할당 최고치도 기록 (느림)")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        os.chdir(ROOT)
+        print(json.dumps(bench_page(args.child, args.limit, args.trace_memory)))
+        return 0
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "pages": {},
+    }
+    for name in args.page or PAGES:
+        result = run_page(name, args.limit, args.cold_disk, args.trace_memory)
+        results["pages"][name] = result
+        sweep = result.get("sweep_s") or {}
+        print(
+            f"{name:14s} cold {result.get('cold_start_s', float('nan')):7.3f}s"
+            f"  first {result.get('first_render_s', float('nan')):7.3f}s"
+            f"  warm p50 {(result.get('warm_rerun_s') or {}).get('p50', float('nan')):7.3f}s"
+            f"  sweep p50/p95 {sweep.get('p50', float('nan')):.3f}/{sweep.get('p95', float('nan')):.3f}s"
+            f" (n={sweep.get('n', 0)})  peak {result.get('peak_mb', float('nan')):6.1f}MB"
+            + (f"  ⚠ {'; '.join(result['errors'])}" if result.get("errors") else "")
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding="utf-8")
+    print(f"결과 저장: {args.output}")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding="utf-8")
+        print(f"기준값 저장: {BASELINE_PATH}")
+    if args.compare:
+        if not BASELINE_PATH.exists():
+            print("기준값이 없습니다: 먼저 --save-baseline 으로 저장하세요.")
+            return 1
+        regressions = compare(results, json.loads(BASELINE_PATH.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print("✅ 기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""역별 일일 승하차 이상치 탐지 (요일별 중앙값/MAD 기준).
+
+(노선, 역) × 날짜 행렬을 만든 뒤 요일마다 역별 중앙값과 MAD(중앙값 절대 편차)를
+한 번에 계산해 모든 날의 강건 z-점수를 미리 채워 둔다. 어느 날짜의 이상치 목록은
+그 날짜 열에서 기준을 넘는 칸을 고르는 조회일 뿐이다. 새 날짜가 들어오면 열을 덧붙이고
+그 날짜들의 요일만 다시 계산한다.
+"""
+import copy
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from common.subway import COUNT_COLS
+
+THRESHOLD = 3.5  # |강건 z| 이 값 이상이면 이상치 (Iglewicz-Hoaglin 기준)
+MIN_SCALE = 10.0  # MAD가 0에 가까운 역(거의 일정한 역)에서 점수가 튀지 않도록 하는 최소 척도
+REL_SCALE = 0.05  # 척도는 적어도 중앙값의 5%
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def _matrix(df, keys, days):
+    """(노선, 역) × 날짜 행렬 (승하차 컬럼별, 기록이 없는 칸은 NaN)."""
+    pairs = pd.MultiIndex.from_arrays([df["노선명"].astype(str), df["역명"].astype(str)])
+    rows = keys.get_indexer(pairs)
+    cols = days.get_indexer(df["사용일자"])
+    out = {}
+    for col in COUNT_COLS:
+        values = np.full((len(keys), len(days)), np.nan, dtype="float32")
+        values[rows, cols] = df[col].to_numpy()
+        out[col] = values
+    return out
+
+
+class AnomalyDetector:
+    """역별·요일별 기준선과 모든 날의 강건 z-점수를 미리 계산해 둔 묶음."""
+
+    def __init__(self, df, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.sources = None  # 만들 때 읽은 원본 조각의 지문 (색인 레지스트리가 채움)
+        self.keys = pd.MultiIndex.from_arrays(
+            [df["노선명"].astype(str), df["역명"].astype(str)], names=["노선명", "역명"]
+        ).unique().sort_values()
+        if len(df):
+            self.days = pd.date_range(df["사용일자"].min(), df["사용일자"].max(), freq="D", name="사용일자")
+        else:
+            self.days = pd.DatetimeIndex([], name="사용일자")
+        self.counts = _matrix(df, self.keys, self.days)
+        self.median = {col: np.full((len(self.keys), 7), np.nan, dtype="float32") for col in COUNT_COLS}
+        self.scale = {col: np.full((len(self.keys), 7), np.nan, dtype="float32") for col in COUNT_COLS}
+        self.scores = {col: np.full_like(values, np.nan) for col, values in self.counts.items()}
+        self._fit(range(7))
+
+    def _fit(self, weekdays):
+        """`weekdays` 요일의 기준선(중앙값, 1.4826·MAD)과 그 요일 날짜들의 점수를 다시 계산한다."""
+        dayofweek = self.days.dayofweek
+        for wd in weekdays:
+            cols = np.flatnonzero(dayofweek == wd)
+            if not len(cols):
+                continue
+            for col in COUNT_COLS:
+                x = self.counts[col][:, cols]
+                with warnings.catch_warnings():
+                    # 기록이 한 번도 없는 역·요일은 NaN으로 남음 (경고만 끔)
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    median = np.nanmedian(x, axis=1)
+                    mad = np.nanmedian(np.abs(x - median[:, None]), axis=1)
+                scale = np.maximum(1.4826 * mad, np.maximum(REL_SCALE * median, MIN_SCALE))
+                self.median[col][:, wd] = median
+                self.scale[col][:, wd] = scale
+                self.scores[col][:, cols] = (x - median[:, None]) / scale[:, None]
+
+    @property
+    def last_day(self):
+        return self.days[-1] if len(self.days) else None
+
+    def extend(self, df):
+        """`df`에서 마지막 날 이후의 날짜만 덧붙인 새 탐지기를 돌려준다.
+
+        기존 객체는 다른 세션이 쓰는 중일 수 있으므로 바꾸지 않는다. 새 날짜의
+        요일만 기준선을 다시 계산한다.
+        """
+        if self.last_day is not None:
+            df = df[df["사용일자"] > self.last_day]
+        if df.empty:
+            return self
+        new = copy.copy(self)
+        new.keys = self.keys.append(
+            pd.MultiIndex.from_arrays([df["노선명"].astype(str), df["역명"].astype(str)], names=self.keys.names)
+        ).unique()
+        start = self.days[0] if len(self.days) else df["사용일자"].min()
+        new.days = pd.date_range(start, df["사용일자"].max(), freq="D", name="사용일자")
+        added = _matrix(df, new.keys, new.days)
+        grow = len(new.keys) - len(self.keys)
+        for attr in ("counts", "scores", "median", "scale"):
+            setattr(new, attr, {})
+        for col in COUNT_COLS:
+            # 새 역은 아래에 행으로, 새 날짜는 오른쪽에 열로 붙임
+            old = np.pad(self.counts[col], ((0, grow), (0, len(new.days) - len(self.days))),
+                         constant_values=np.nan)
+            new.counts[col] = np.where(np.isnan(added[col]), old, added[col])
+            new.scores[col] = np.pad(self.scores[col], ((0, grow), (0, len(new.days) - len(self.days))),
+                                     constant_values=np.nan)
+            new.median[col] = np.pad(self.median[col], ((0, grow), (0, 0)), constant_values=np.nan)
+            new.scale[col] = np.pad(self.scale[col], ((0, grow), (0, 0)), constant_values=np.nan)
+        new._fit(sorted(set(pd.DatetimeIndex(df["사용일자"]).dayofweek)))
+        return new
+
+    def daily_counts(self, threshold=None):
+        """날짜별 이상치 칸 수 (승차·하차 합) — 달력처럼 훑어볼 때 사용."""
+        threshold = threshold or self.threshold
+        flagged = sum((np.abs(self.scores[col]) >= threshold).sum(axis=0) for col in COUNT_COLS)
+        return pd.Series(flagged, index=self.days, name="이상치 수")
+
+    def anomalies(self, date, threshold=None):
+        """해당 날짜의 이상치 목록 (|점수| 큰 순). 미리 채운 점수 열에서 고르기만 한다."""
+        threshold = threshold or self.threshold
+        j = self.days.get_indexer([pd.Timestamp(date)])[0]
+        if j < 0:
+            return pd.DataFrame(columns=["노선명", "역명", "구분", "값", "기준(중앙값)", "점수", "방향"])
+        wd = self.days[j].dayofweek
+        frames = []
+        for col in COUNT_COLS:
+            score = self.scores[col][:, j]
+            rows = np.flatnonzero(np.abs(score) >= threshold)
+            frames.append(pd.DataFrame({
+                "노선명": self.keys.get_level_values(0)[rows],
+                "역명": self.keys.get_level_values(1)[rows],
+                "구분": col.replace("총승객수", ""),
+                "값": self.counts[col][rows, j].astype("int64"),
+                "기준(중앙값)": self.median[col][rows, wd].round().astype("int64"),
+                "점수": score[rows].astype("float64").round(1),
+            }))
+        out = pd.concat(frames, ignore_index=True)
+        out["방향"] = np.where(out["점수"] > 0, "급증", "급감")
+        return out.iloc[np.argsort(-out["점수"].abs().to_numpy(), kind="stable")].reset_index(drop=True)
+
+    def history(self, line, station):
+        """한 (노선, 역)의 일별 승하차와 요일 기준선 (이상치 표에서 고른 역을 그릴 때)."""
+        i = self.keys.get_indexer([(line, station)])[0]
+        wd = self.days.dayofweek
+        table = pd.DataFrame(index=self.days)
+        for col in COUNT_COLS:
+            table[col] = self.counts[col][i]
+            table[f"{col}_기준"] = self.median[col][i, wd]
+            table[f"{col}_점수"] = self.scores[col][i]
+        return table
@@ -0,0 +1,145 @@
+"""K-브랜드 해외 진출 현황(altificial.csv)의 진출국가 색인.
+
+'미국(4), 베트남(1), ...' 같은 진출국가 문자열을 한 번만 풀어서
+(브랜드, 국가, 점포수) 긴 표와 국가 → 브랜드 역색인으로 만들어 둔다.
+"""
+import numpy as np
+import pandas as pd
+
+from common.validation import Schema
+
+COUNTRY_PATTERN = r"\s*(?P<국가>[^,()]+?)\s*\((?P<점포수>\d+)\)"
+
+# altificial.csv 열 타입과 검사 (헤더 공백은 검사 전에 떼므로 '주요메뉴 ' → '주요메뉴')
+SCHEMA = Schema(
+    dtype={"체명": str, "No": "int16", "브랜드": str, "주요메뉴": str,
+           "구분": str, "진출국가": str, "총점포수": "int32"},
+    required=("브랜드", "구분"),
+    ranges={"총점포수": (0, None)},
+    key=("브랜드",),
+)
+
+# 같은 나라의 다른 표기는 하나로 합침
+ALIASES = {"UAE": "아랍에미레이트"}
+
+# 지도(choropleth)용 ISO-3166 alpha-3 코드
+ISO3 = {
+    "나이지리아": "NGA", "남아프리카공화국": "ZAF", "뉴질랜드": "NZL", "대만": "TWN",
+    "러시아": "RUS", "마카오": "MAC", "말레이시아": "MYS", "멕시코": "MEX", "몽골": "MNG",
+    "미국": "USA", "베네주엘라": "VEN", "베트남": "VNM", "볼리비아": "BOL", "브라질": "BRA",
+    "사우디아라비아": "SAU", "스페인": "ESP", "싱가포르": "SGP", "아랍에미레이트": "ARE",
+    "에콰도르": "ECU", "엘살바도르": "SLV", "영국": "GBR", "우루과이": "URY", "이란": "IRN",
+    "이집트": "EGY", "인도": "IND", "인도네시아": "IDN", "일본": "JPN", "중국": "CHN",
+    "카자크스탄": "KAZ", "캄보디아": "KHM", "캐나다": "CAN", "코스타리카": "CRI",
+    "콜럼비아": "COL", "쿠웨이트": "KWT", "태국": "THA", "터키": "TUR", "파나마": "PAN",
+    "파라과이": "PRY", "파키스탄": "PAK", "페루": "PER", "피지": "FJI", "필리핀": "PHL",
+    "호주": "AUS", "홍콩": "HKG",
+}
+
+
+def prepare(df):
+    """문자열 공백 정리, 결측 채우기, 파생 열(국가수) 계산 — 로딩할 때 한 번만."""
+    df['구분'] = df['구분'].str.strip().astype("category")  # 한식/비한식 두 값뿐
+    df['주요메뉴'] = df['주요메뉴'].str.strip()
+    # NaN 값 처리: '체명'의 결측치는 '정보없음'으로 채워줍니다.
+    df['체명'] = df['체명'].fillna('정보없음')
+    df['국가수'] = count_countries(df)
+    return df
+
+
+def parse_countries(df):
+    """진출국가 문자열을 (행 번호, 브랜드, 국가, 점포수) 긴 표로 푼다 (벡터화)."""
+    found = df["진출국가"].str.extractall(COUNTRY_PATTERN)
+    rows = found.index.get_level_values(0)
+    return pd.DataFrame({
+        "행": df.index.get_indexer(rows),
+        "브랜드": df.loc[rows, "브랜드"].to_numpy(),
+        "국가": found["국가"].replace(ALIASES).to_numpy(),
+        "점포수": found["점포수"].astype("int32").to_numpy(),
+    })
+
+
+class CountryIndex:
+    """브랜드별 진출 국가와 국가별 브랜드를 양방향으로 바로 찾는 색인."""
+
+    def __init__(self, df):
+        self.long = parse_countries(df)
+        # 국가 → 진출 브랜드 행 번호 (오름차순 배열)
+        self.rows_by_country = {
+            country: np.sort(group.to_numpy())
+            for country, group in self.long.groupby("국가")["행"]
+        }
+
+    def countries(self):
+        return sorted(self.rows_by_country)
+
+    def rows_in(self, country, within=None):
+        """`country`에 진출한 브랜드 행 번호. `within`(불리언 마스크)이 있으면 그 안에서만."""
+        rows = self.rows_by_country.get(country, np.array([], dtype=int))
+        return rows if within is None else rows[within[rows]]
+
+    def totals(self, within=None):
+        """국가별 점포 합계·브랜드 수 (+ 지도용 ISO-3 코드), 점포 합계 내림차순."""
+        long = self.long if within is None else self.long[within[self.long["행"].to_numpy()]]
+        table = long.groupby("국가").agg(점포수=("점포수", "sum"), 브랜드수=("브랜드", "size"))
+        table["ISO3"] = table.index.map(ISO3)
+        return table.sort_values("점포수", ascending=False).reset_index()
+
+
+def count_countries(df):
+    """브랜드별 진출 국가 수 ('나라(점포수)' 항목 개수, 문자열 분할 없이 벡터화)."""
+    return df["진출국가"].str.count(COUNTRY_PATTERN).fillna(0).astype("int16")
+
+
+class BrandFilters:
+    """구분별 마스크와 점포수·국가수 정렬 순서를 미리 만들어 둔 필터.
+
+    점포수 기준은 내림차순 정렬의 앞부분이므로 경계만 이분 탐색으로 찾고,
+    1등 브랜드는 전체 정렬 없이 부분 선택(앞에서 첫 번째 / argmax)으로 고른다.
+    """
+
+    ALL = "전체"
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.stores = df["총점포수"].to_numpy()
+        self.countries = df["국가수"].to_numpy()
+        self.categories = [self.ALL, *df["구분"].unique().tolist()]
+        self.category_masks = {self.ALL: np.ones(self.n, dtype=bool)}
+        for category in self.categories[1:]:
+            self.category_masks[category] = (df["구분"] == category).to_numpy()
+        self.by_stores = np.argsort(-self.stores, kind="stable")
+        self._sorted_neg_stores = -self.stores[self.by_stores]
+
+    def mask(self, category, min_stores):
+        """구분이 `category`이고 총점포수가 `min_stores` 이상인 행 (불리언 마스크)."""
+        k = np.searchsorted(self._sorted_neg_stores, -min_stores, side="right")
+        mask = np.zeros(self.n, dtype=bool)
+        mask[self.by_stores[:k]] = True
+        return mask & self.category_masks[category]
+
+    def top_by_stores(self, mask):
+        """마스크 안에서 총점포수가 가장 많은 행 번호 (없으면 None)."""
+        hits = self.by_stores[mask[self.by_stores]]
+        return int(hits[0]) if len(hits) else None
+
+    def top_by_countries(self, mask):
+        """마스크 안에서 진출 국가 수가 가장 많은 행 번호 (없으면 None)."""
+        if not mask.any():
+            return None
+        return int(np.argmax(np.where(mask, self.countries, -1)))
+
+
+class BrandSnapshot:
+    """표와 그 표로 만든 진출국가 색인·필터를 한 묶음으로 들고 있는 스냅샷.
+
+    감시 스레드가 새 CSV로 바꿔 끼우는 동안 표와 색인을 따로 가져오면 새 표에 예전 마스크가
+    짝지어질 수 있다 (길이가 달라 불리언 인덱싱이 실패). 한 번에 가져오면 셋이 늘 같은 버전이다.
+    `version`은 표 내용의 지문 — 그림 캐시 키에 넣으면 스냅샷과 어긋난 결과를 쓰지 않는다.
+    """
+
+    def __init__(self, df):
+        self.frame = df
+        self.countries = CountryIndex(df)
+        self.filters = BrandFilters(df)
+        self.version = int(pd.util.hash_pandas_object(df, index=False).sum())
@@ -0,0 +1,181 @@
+"""CSV 원본을 컬럼형(Arrow IPC) 캐시로, 파생 색인을 피클로 보관하는 도구 모음.
+
+캐시는 원본 파일의 크기·수정시각·내용 해시(지문)로 무효화되므로,
+재시작하거나 새 워커 프로세스가 떠도 CSV를 다시 파싱하지 않는다.
+Arrow 파일은 압축 없이 쓰고 메모리 맵으로 열기 때문에, 같은 서버의 여러
+Streamlit 프로세스가 한 파일을 읽기 전용으로 공유한다 (OS 페이지 캐시 한 벌).
+"""
+import codecs
+import hashlib
+import io
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / ".cache"
+OBJECTS_DIR = CACHE_DIR / "objects"
+CODE_DIR = ROOT / "common"
+
+# utf-8-sig는 BOM이 있는/없는 utf-8을 모두 읽고, 실패하면 cp949(euc-kr 상위호환)로 읽는다
+ENCODINGS = ("utf-8-sig", "cp949")
+
+
+def hash_bytes(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def decode_bytes(raw, encodings=ENCODINGS):
+    """바이트를 한 번만 디코딩해 (텍스트, 인코딩)을 돌려준다."""
+    for encoding in encodings:
+        try:
+            return raw.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"지원하지 않는 인코딩입니다 (시도: {', '.join(encodings)})")
+
+
+def sniff_encoding(path, nbytes=1 << 16, encodings=ENCODINGS):
+    """파일 앞부분만 읽어 인코딩을 판별한다 (큰 파일을 통째로 읽지 않고 흘려 읽을 때 사용)."""
+    with open(path, "rb") as f:
+        head = f.read(nbytes)
+    for encoding in encodings:
+        try:
+            # 잘린 멀티바이트 문자 때문에 실패하지 않도록 final=False로 디코딩
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"지원하지 않는 인코딩입니다 (시도: {', '.join(encodings)})")
+
+
+def read_json(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def atomic_write(path, write):
+    # 여러 워커가 동시에 캐시를 만들어도 반쯤 쓰인 파일을 읽지 않도록 임시 파일 → 교체
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+# pandas 3부터는 문자열 열이 기본으로 Arrow 기반이라 그대로 복사 없이 읽힘.
+# 그 전 버전에서는 object 열로 풀리지 않도록 Arrow 기반 문자열 타입으로 지정한다.
+_STRING_TYPES = {} if int(pd.__version__.split(".")[0]) >= 3 else {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+
+def write_mapped(path, df):
+    """표를 압축 없는 Arrow IPC 파일로 쓴다 (메모리 맵으로 복사 없이 열 수 있게)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_mapped(path, select=None):
+    """Arrow IPC 파일을 메모리 맵으로 열어 표로 돌려준다.
+
+    숫자·날짜·문자열 열은 맵된 버퍼를 그대로 가리키므로(복사 없음) 프로세스마다
+    따로 메모리를 쓰지 않는다. 파일이 교체돼도 열려 있는 맵은 예전 내용을 계속 본다.
+    `select`(Arrow 표 → 표)를 주면 판다스로 바꾸기 전에 행·열을 골라 낸다 (slice·select는 복사 없음).
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    if select is not None:
+        table = select(table)
+    return table.to_pandas(split_blocks=True, types_mapper=_STRING_TYPES.get)
+
+
+def cached_frame(path, parse, name=None):
+    """`path`를 `parse(텍스트 버퍼)`로 읽되, 지문이 같으면 메모리 맵한 Arrow 캐시를 돌려준다.
+
+    크기·수정시각이 같으면 해시 없이 바로 캐시를 쓰고, 둘 중 하나가 달라졌을 때만
+    내용 해시를 계산한다. 해시까지 같으면(예: touch) 메타만 갱신한다.
+    common/ 코드(열 타입 선언·전처리)가 바뀌면 예전 타입으로 저장된 캐시는 다시 파싱한다.
+    """
+    path = Path(path)
+    name = name or path.stem
+    data_path = CACHE_DIR / f"{name}.arrow"
+    meta_path = CACHE_DIR / f"{name}.json"
+
+    stat = path.stat()
+    meta = read_json(meta_path)
+    code = hash_bytes(json.dumps(file_fingerprint(sorted(CODE_DIR.glob("*.py")))).encode())
+    cached = meta is not None and meta.get("code") == code and data_path.exists()
+    if cached and meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+        return read_mapped(data_path)
+
+    raw = path.read_bytes()
+    digest = hash_bytes(raw)
+    fingerprint = {"size": len(raw), "mtime_ns": stat.st_mtime_ns, "hash": digest, "code": code}
+    if cached and meta["size"] == len(raw) and meta["hash"] == digest:
+        df = read_mapped(data_path)
+    else:
+        text, encoding = decode_bytes(raw)
+        df = parse(io.StringIO(text))
+        fingerprint["encoding"] = encoding
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            atomic_write(data_path, lambda tmp: write_mapped(tmp, df))
+        except OSError:
+            # 읽기 전용 배포 환경 등에서는 캐시 없이 그대로 진행
+            return df
+        # 방금 파싱한 사본 대신 공유되는 맵을 돌려줘 프로세스마다 따로 들고 있지 않게 함
+        df = read_mapped(data_path)
+    meta = {**(meta or {}), **fingerprint}
+    try:
+        atomic_write(meta_path, lambda tmp: tmp.write_text(json.dumps(meta), encoding="utf-8"))
+    except OSError:
+        pass
+    return df
+
+
+def file_fingerprint(paths):
+    """파일마다 [경로, 크기, 수정시각] — 하나라도 바뀌면 값이 달라진다."""
+    fingerprint = []
+    for path in paths:
+        stat = Path(path).stat()
+        fingerprint.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def cached_object(name, sources, build):
+    """`build()` 결과를 피클로 보관해 두고, 원본(`sources`)과 common/ 코드가 그대로면 읽어서 돌려준다.
+
+    코드 지문도 함께 보므로 색인 클래스가 바뀐 뒤에 예전 피클을 읽는 일이 없다.
+    """
+    key = hash_bytes(json.dumps({
+        "sources": file_fingerprint(sources),
+        "code": file_fingerprint(sorted(CODE_DIR.glob("*.py"))),
+    }).encode())
+    data_path = OBJECTS_DIR / f"{name}.pkl"
+    meta_path = OBJECTS_DIR / f"{name}.json"
+
+    meta = read_json(meta_path)
+    if meta is not None and meta.get("key") == key and data_path.exists():
+        try:
+            with open(data_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # 깨졌거나 쓰는 중인 파일이면 새로 만듦
+
+    obj = build()
+    try:
+        OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(data_path, lambda tmp: tmp.write_bytes(payload))
+        text = json.dumps({"key": key, "bytes": len(payload), "built_at": time.time()})
+        atomic_write(meta_path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    except OSError:
+        pass
+    return obj
@@ -0,0 +1,147 @@
+"""MBTI 유형별 진로·학과·도서·영화 추천 카탈로그(mbti_catalog.json)와 역색인.
+
+카탈로그는 프로세스당 한 번 읽어 검증하고, 학과/진로/도서/영화 → 유형 역색인을
+함께 만들어 둔다. '컴퓨터공학에 맞는 유형은?' 같은 질의는 사전 조회 한 번
+(정확히 일치하지 않으면 정렬된 키에서 접두어 이분 탐색)으로 끝난다.
+"""
+import bisect
+import json
+import re
+
+from common.cache import ROOT
+from common.mbti import MBTI_TYPES
+
+CATALOG_PATH = ROOT / "mbti_catalog.json"
+
+# 필드 이름 → 기대하는 타입
+FIELDS = {
+    "personality": str,
+    "careers": list,
+    "majors": str,
+    "books": list,
+    "movies": list,
+    "recommendations": list,
+}
+RECOMMENDATION_FIELDS = ("career", "major", "trait")
+
+KINDS = {"major": "학과", "career": "진로", "book": "도서", "movie": "영화"}
+
+_TITLE = re.compile(r"[『《]([^』》]+)[』》]")
+_PAREN = re.compile(r"\(([^()]*)\)")
+_NOT_WORD = re.compile(r"[\W_]+")
+
+
+def validate(raw):
+    """카탈로그 구조를 확인하고 문제 목록을 한 번에 모아 ValueError로 알린다."""
+    problems = []
+    missing = [t for t in MBTI_TYPES if t not in raw]
+    if missing:
+        problems.append(f"빠진 유형: {', '.join(missing)}")
+    unknown = [t for t in raw if t not in MBTI_TYPES]
+    if unknown:
+        problems.append(f"알 수 없는 유형: {', '.join(unknown)}")
+    for mbti_type, entry in raw.items():
+        if not isinstance(entry, dict):
+            problems.append(f"{mbti_type}: 객체(dict) 이어야 합니다")
+            continue
+        for field, kind in FIELDS.items():
+            if not isinstance(entry.get(field), kind):
+                problems.append(f"{mbti_type}.{field}: {kind.__name__} 이어야 합니다")
+        # 메인 페이지가 진로를 두 개로 풀어(c1, c2) 보여 주므로 정확히 두 개
+        careers = entry.get("careers")
+        if isinstance(careers, list) and len(careers) != 2:
+            problems.append(f"{mbti_type}.careers: 2개 이어야 합니다 (지금 {len(careers)}개)")
+        for i, rec in enumerate(entry.get("recommendations") or []):
+            if not isinstance(rec, dict):
+                problems.append(f"{mbti_type}.recommendations[{i}]: 객체(dict) 이어야 합니다")
+                continue
+            absent = [f for f in RECOMMENDATION_FIELDS if not isinstance(rec.get(f), str)]
+            if absent:
+                problems.append(f"{mbti_type}.recommendations[{i}]: {', '.join(absent)} 없음")
+    if problems:
+        raise ValueError("MBTI 카탈로그가 올바르지 않습니다:\n- " + "\n- ".join(problems))
+    return raw
+
+
+def normalize(term):
+    """비교용 키: 공백·기호·이모지를 빼고 소문자로, '~학과'/'~과'는 떼어 냄."""
+    key = _NOT_WORD.sub("", term).lower()
+    if key.endswith("학과"):
+        key = key[:-1]
+    elif key.endswith("과") and len(key) > 2:
+        key = key[:-1]
+    return key
+
+
+def _parts(text, separators):
+    """'경영학(회계), 세무·경제 관련 학과' → ['경영학', '회계', '세무·경제 관련 학과'] 처럼 나눔."""
+    text = _PAREN.sub(lambda m: separators[0] + m.group(1), text)
+    return [p.strip() for p in re.split("|".join(map(re.escape, separators)), text) if p.strip()]
+
+
+def _titles(text):
+    """'《Inside Out》(인사이드 아웃)' → ['Inside Out', '인사이드 아웃'] (원제와 괄호 속 번역 제목)."""
+    found = _TITLE.findall(text)
+    found += [p for p in _PAREN.findall(_TITLE.sub("", text))]
+    return found or [text]
+
+
+class Catalog:
+    """검증된 카탈로그와 학과·진로·도서·영화 → 유형 역색인."""
+
+    def __init__(self, raw):
+        self.types = validate(raw)
+        # 종류별: 정규화된 키 → (보여 줄 이름, 유형 집합)
+        self._index = {kind: {} for kind in KINDS}
+        for mbti_type, entry in self.types.items():
+            majors = _parts(entry["majors"], [",", "/"])
+            careers = [p for c in entry["careers"] for p in _parts(c, ["/"])]
+            for rec in entry["recommendations"]:
+                majors += _parts(rec["major"], ["/", ","])
+                careers += _parts(rec["career"], ["/"])
+            for kind, terms in [
+                ("major", majors),
+                ("career", careers),
+                ("book", [t for b in entry["books"] for t in _titles(b)]),
+                ("movie", [t for m in entry["movies"] for t in _titles(m)]),
+            ]:
+                for term in terms:
+                    key = normalize(term)
+                    if key:
+                        # 보여 줄 이름은 앞쪽 이모지만 떼어 낸 원래 표기
+                        label = re.sub(r"^[\W_]+", "", term).strip()
+                        label, found = self._index[kind].setdefault(key, (label, set()))
+                        found.add(mbti_type)
+        self._keys = {kind: sorted(index) for kind, index in self._index.items()}
+
+    @classmethod
+    def from_file(cls, path=CATALOG_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def terms(self, kind):
+        """역색인에 있는 이름 목록 (가나다순)."""
+        return sorted(label for label, _ in self._index[kind].values())
+
+    def types_for(self, kind, query):
+        """`query`(학과·진로·도서·영화 이름)에 어울리는 유형 → 근거가 된 이름 목록.
+
+        정확히 같은 키가 없으면 그 키로 시작하는 이름들을 모두 모은다 ('컴퓨터' → '컴퓨터공학').
+        """
+        key = normalize(query)
+        if not key:
+            return {}
+        index = self._index[kind]
+        if key in index:
+            keys = [key]
+        else:
+            keys = self._keys[kind]
+            start = bisect.bisect_left(keys, key)
+            stop = bisect.bisect_left(keys, key + "\uffff")
+            keys = keys[start:stop]
+        matches = {}
+        for k in keys:
+            label, found = index[k]
+            for mbti_type in found:
+                matches.setdefault(mbti_type, []).append(label)
+        return {t: matches[t] for t in MBTI_TYPES if t in matches}
@@ -0,0 +1,39 @@
+"""분포 벡터의 계층적 군집 (덴드로그램 + 원하는 군집 수로 자르기).
+
+연결(linkage)은 한 번만 계산해 두고, 군집 수를 바꾸는 것은 이미 만든 트리를
+다른 높이에서 자르는 것(fcluster)이라 다시 계산하지 않는다.
+"""
+import numpy as np
+from scipy.cluster.hierarchy import dendrogram, fcluster, linkage
+from scipy.spatial.distance import squareform
+
+METHODS = {
+    "average": "평균 연결",
+    "complete": "완전 연결",
+    "single": "단일 연결",
+}
+
+
+class Clustering:
+    def __init__(self, names, distances, method="average"):
+        """`distances`: 미리 계산한 n×n 거리 행렬 (예: SimilarityIndex.distances[지표])."""
+        self.names = np.asarray(names)
+        condensed = squareform(np.asarray(distances), checks=False)
+        self.linkage = linkage(condensed, method=method)
+        tree = dendrogram(self.linkage, no_plot=True)
+        self.icoord = tree["icoord"]
+        self.dcoord = tree["dcoord"]
+        self.leaves = np.asarray(tree["leaves"])
+
+    def cut(self, k):
+        """군집 수 `k`로 잘랐을 때 각 행의 군집 번호 (1부터)."""
+        return fcluster(self.linkage, t=k, criterion="maxclust")
+
+    def threshold(self, k):
+        """`k`개 군집이 되는 자르기 높이 (덴드로그램에 가로선으로 표시)."""
+        heights = self.linkage[:, 2]
+        if k <= 1:
+            return heights[-1]
+        if k > len(heights):
+            return 0.0
+        return (heights[-k] + heights[-k + 1]) / 2
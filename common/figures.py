@@ -0,0 +1,240 @@
+"""페이지와 캐시가 함께 쓰는 plotly 그림 생성 함수."""
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.colors import n_colors
+
+
+def subway_top_figure(top_df, date_label, line):
+    """역별 총승하차 Top N 막대그래프 (1등 빨강, 나머지는 파랑 그라데이션)."""
+    # 색상 생성: 1등은 빨간색, 나머지는 파란색-그라데이션
+    n_rest = max(len(top_df) - 1, 0)
+    if n_rest > 0:
+        # 연한 파랑 -> 진한 파랑 그라데이션 (n_colors 사용)
+        blues = n_colors('rgb(198,219,239)', 'rgb(8,48,107)', n_rest, colortype='rgb')
+    else:
+        blues = []
+
+    colors = ["red"] + blues  # 길이는 top_df 행수와 같아야 함
+
+    # 막대마다 색을 주되 trace는 하나로 (역마다 trace를 만들면 그림 만들기·전송이 느려짐)
+    fig = go.Figure(go.Bar(
+        x=top_df["역명"],
+        y=top_df["총승하차"],
+        marker_color=colors,
+        text=top_df["총승하차"],
+        texttemplate="%{text:,}",
+        textposition="outside",
+    ))
+    fig.update_layout(
+        title=f"📊 {date_label} · {line} - 총승하차 Top {len(top_df)}",
+        xaxis_title="역명",
+        yaxis_title="총승하차 수",
+        showlegend=False,
+        uniformtext_minsize=8,
+        uniformtext_mode="hide",
+    )
+    return fig
+
+
+def subway_trend_figure(table, target, window):
+    """한 역(또는 노선)의 일별 승하차와 이동평균 선그래프."""
+    fig = go.Figure()
+    for col, color in [("승차총승객수", "#1f77b4"), ("하차총승객수", "#ff7f0e")]:
+        name = col.replace("총승객수", "")
+        fig.add_trace(go.Scatter(x=table.index, y=table[col], name=name, mode="lines+markers",
+                                 line=dict(color=color, width=1), opacity=0.5))
+        fig.add_trace(go.Scatter(x=table.index, y=table[f"{col}_{window}일평균"],
+                                 name=f"{name} {window}일 평균", line=dict(color=color, width=3)))
+    fig.update_layout(
+        title=f"📈 {target} 일별 승하차 추이",
+        xaxis_title="사용일자",
+        yaxis_title="승객 수",
+        hovermode="x unified",
+    )
+    return fig
+
+
+def anomaly_counts_figure(counts, selected=None):
+    """날짜별 이상치 수 막대그래프 (고른 날짜는 빨강)."""
+    colors = ["#d62728" if selected is not None and d == selected else "#60a5fa" for d in counts.index]
+    fig = go.Figure(go.Bar(x=counts.index, y=counts.to_numpy(), marker_color=colors,
+                           hovertemplate="%{x|%Y-%m-%d}: %{y}건<extra></extra>"))
+    fig.update_layout(title="🚨 날짜별 이상치 수", xaxis_title="사용일자", yaxis_title="이상치 (역·구분)",
+                      height=300, margin=dict(t=40))
+    return fig
+
+
+def anomaly_history_figure(table, target, threshold):
+    """한 역의 일별 승하차와 요일 기준선, 기준을 넘은 날(이상치)은 빨간 점."""
+    fig = go.Figure()
+    for col, color in [("승차총승객수", "#1f77b4"), ("하차총승객수", "#ff7f0e")]:
+        name = col.replace("총승객수", "")
+        fig.add_trace(go.Scatter(x=table.index, y=table[col], name=name, mode="lines+markers",
+                                 line=dict(color=color, width=2)))
+        fig.add_trace(go.Scatter(x=table.index, y=table[f"{col}_기준"], name=f"{name} 요일 기준",
+                                 line=dict(color=color, width=1, dash="dash")))
+        flagged = table[table[f"{col}_점수"].abs() >= threshold]
+        fig.add_trace(go.Scatter(
+            x=flagged.index, y=flagged[col], name=f"{name} 이상치", mode="markers",
+            marker=dict(color="#d62728", size=11, symbol="circle-open", line=dict(width=2)),
+            customdata=flagged[f"{col}_점수"], hovertemplate="%{x|%Y-%m-%d}: %{y:,}명 (점수 %{customdata:.1f})",
+        ))
+    fig.update_layout(title=f"📉 {target} 일별 승하차와 요일 기준선", xaxis_title="사용일자",
+                      yaxis_title="승객 수", hovermode="x unified")
+    return fig
+
+
+def _stepped_colorscale(colors):
+    """정수 코드 0..n-1을 각각 한 색으로 칠하는 계단형 colorscale."""
+    n = len(colors)
+    scale = []
+    for i, color in enumerate(colors):
+        scale += [(i / n, color), ((i + 1) / n, color)]
+    return scale
+
+
+def subway_network_figure(network, keep, lines, date_label, log_y=False):
+    """하루의 모든 노선·역을 순위 곡선으로 그린 WebGL 산점도 (trace 하나).
+
+    `network`는 총승하차 내림차순 표, `keep`은 그릴 행 위치(다운샘플 결과),
+    `lines`는 노선명 범주 전체 — 색은 노선 코드로 정해 날짜를 바꿔도 같다.
+    """
+    points = network.iloc[keep]
+    palette = px.colors.qualitative.Dark24 + px.colors.qualitative.Light24
+    colors = [palette[i % len(palette)] for i in range(len(lines))]
+    fig = go.Figure(go.Scattergl(
+        x=keep + 1,
+        y=points["총승하차"].to_numpy(),
+        mode="markers",
+        marker=dict(
+            color=points["노선명"].cat.codes.to_numpy(), colorscale=_stepped_colorscale(colors),
+            cmin=-0.5, cmax=len(lines) - 0.5, size=6,
+            colorbar=dict(title="노선", tickvals=list(range(len(lines))), ticktext=list(lines),
+                          tickfont=dict(size=9), len=1),
+        ),
+        hovertext=(points["역명"].astype(str) + " (" + points["노선명"].astype(str) + ")").to_numpy(),
+        hovertemplate="<b>%{hovertext}</b><br>%{x}위 · %{y:,}명<extra></extra>",
+    ))
+    shown = f"{len(keep)}/{len(network)}개 표시" if len(keep) < len(network) else f"{len(network)}개"
+    fig.update_layout(
+        title=f"🗺 {date_label} 전체 역 총승하차 순위 ({shown})",
+        xaxis_title="순위",
+        yaxis_title="총승하차 수",
+        yaxis_type="log" if log_y else "linear",
+        height=550,
+    )
+    return fig
+
+
+def subway_histogram_figure(left, right, counts, date_label):
+    """총승하차 구간(로그 간격)별 역 수 막대그래프 (구간은 서버에서 미리 셈)."""
+    labels = [f"{a:,.0f}~{b:,.0f}" for a, b in zip(left, right)]
+    fig = go.Figure(go.Bar(
+        x=labels, y=counts, marker_color="#60a5fa",
+        hovertemplate="%{x}명: %{y}개 역<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"📶 {date_label} 총승하차 분포",
+        xaxis=dict(title="총승하차 수 (로그 간격 구간)", tickangle=-45, tickfont=dict(size=9)),
+        yaxis_title="역 수",
+        bargap=0.05,
+    )
+    return fig
+
+
+def mbti_country_figure(df, country):
+    """한 국가의 MBTI 분포 막대그래프와 가장 많은 유형."""
+    # 해당 국가 데이터 정리
+    country_data = df[df["Country"] == country].drop(columns=["Country"]).T
+    country_data.columns = ["비율"]
+    country_data = country_data.sort_values("비율", ascending=False)
+    top_type = country_data.index[0]
+
+    # --- 색상 (파란색 그라데이션 반대 방향 + 1등 초록색) ---
+    num = len(country_data)
+    gradient = [f"rgba({50 + i*2}, {180 + i}, 255, 0.9)" for i in range(num)][::-1]  # 반대 그라데이션
+    colors = gradient.copy()
+    colors[country_data.index.get_loc(top_type)] = "#00c853"  # 1등 초록색
+
+    # --- 그래프 ---
+    fig = go.Figure(go.Bar(x=country_data.index, y=country_data["비율"], marker_color=colors))
+
+    fig.update_layout(
+        title=f"🇨🇮 {country}의 MBTI 분포",
+        showlegend=False,
+        xaxis_title="MBTI 유형",
+        yaxis_title="비율",
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        title_x=0.5,
+        font=dict(size=15),
+    )
+    fig.update_traces(hovertemplate="<b>%{x}</b><br>비율: %{y:.2%}<extra></extra>")
+    return fig, top_type
+
+
+def mbti_type_figure(top, mbti_type, highlight="South Korea"):
+    """유형별 상위 국가 막대그래프 (`highlight` 국가는 청록색)."""
+    # 색상 설정
+    colors = ["#60a5fa"] * len(top)  # 기본 파란색 계열
+    if highlight in top["Country"].values:
+        idx = top[top["Country"] == highlight].index[0]
+        colors[idx] = "#00bfa5"  # 청록색
+
+    # 그래프 생성
+    fig = go.Figure(go.Bar(x=top["Country"], y=top[mbti_type], marker_color=colors))
+
+    fig.update_layout(
+        title=f"🌍 {mbti_type} 유형이 많은 상위 국가",
+        showlegend=False,
+        xaxis_title="국가",
+        yaxis_title="비율",
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        title_x=0.5,
+        font=dict(size=15),
+    )
+    fig.update_traces(hovertemplate="<b>%{x}</b><br>비율: %{y:.2%}<extra></extra>")
+    return fig
+
+
+def dendrogram_figure(clustering, k):
+    """덴드로그램 (한 개의 선 trace) + `k`개 군집으로 자르는 높이의 가로선."""
+    xs, ys = [], []
+    for x, y in zip(clustering.icoord, clustering.dcoord):
+        xs += [*x, None]
+        ys += [*y, None]
+    labels = clustering.names[clustering.leaves]
+    fig = go.Figure(go.Scatter(x=xs, y=ys, mode="lines", line=dict(color="#60a5fa", width=1.5),
+                               hoverinfo="skip"))
+    fig.add_hline(y=clustering.threshold(k), line_dash="dash", line_color="#00c853",
+                  annotation_text=f"{k}개 군집")
+    fig.update_layout(
+        title="🌳 MBTI 분포 기준 국가 덴드로그램",
+        xaxis=dict(tickmode="array", tickvals=[5 + 10 * i for i in range(len(labels))],
+                   ticktext=list(labels), tickangle=-90, tickfont=dict(size=9)),
+        yaxis_title="거리",
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        title_x=0.5,
+        height=550,
+        showlegend=False,
+    )
+    return fig
+
+
+def cluster_heatmap_figure(clustering, values, types, labels):
+    """덴드로그램 잎 순서로 정렬한 국가 × MBTI 유형 히트맵 (행 이름에 군집 번호)."""
+    order = clustering.leaves
+    rows = [f"[{labels[i]}] {clustering.names[i]}" for i in order]
+    fig = go.Figure(go.Heatmap(
+        z=values[order], x=types, y=rows, colorscale="Blues",
+        hovertemplate="<b>%{y}</b><br>%{x}: %{z:.2%}<extra></extra>",
+    ))
+    fig.update_layout(
+        title="🧊 군집 순서로 정렬한 MBTI 분포",
+        yaxis=dict(autorange="reversed", tickfont=dict(size=9)),
+        title_x=0.5,
+        height=max(500, 12 * len(rows)),
+    )
+    return fig
@@ -0,0 +1,212 @@
+"""페이지들이 함께 쓰는 파생 색인(순위 행렬, 거리 행렬, 역색인 ...) 레지스트리.
+
+색인은 프로세스당 한 번만 만들고(여러 세션이 동시에 요청해도 계산은 한 번),
+.cache/objects/ 에 피클로 남겨 재시작하거나 새 워커가 떠도 다시 만들지 않는다.
+원본 파일이나 common/ 코드가 바뀌면 지문이 달라져 새로 만든다.
+서버가 떠 있는 동안 원본이 바뀌면 감시 스레드가 refresh()로 다시 만들어 바꿔 끼운다.
+"""
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from common.cache import cached_object, file_fingerprint
+from common.catalog import CATALOG_PATH, Catalog
+from common.loader import DATASETS, get_frame
+
+# 색인 클래스 모듈(scipy, pyarrow 등)은 만들 때만 불러와서,
+# 카탈로그만 쓰는 가벼운 페이지가 무거운 라이브러리를 import하지 않게 한다.
+
+
+@dataclass
+class Index:
+    sources: object  # (색인 인자) → 지문을 잴 원본 파일 목록
+    build: object  # (색인 인자) → 색인 객체
+    update: object = None  # (예전 색인, 색인 인자) → 새 색인. 있으면 refresh 때 처음부터 만들지 않음
+
+
+def _dataset_files(name):
+    return lambda *args: [DATASETS[name].path]
+
+
+def _subway_partitions(month):
+    from common.ingest import RidershipStore
+
+    return RidershipStore().partitions(month)
+
+
+def _subway_all_partitions():
+    from common.ingest import RidershipStore
+
+    store = RidershipStore()
+    return [part for month in store.months() for part in store.partitions(month)]
+
+
+def _subway_stations():
+    import pandas as pd
+
+    from common.cache import read_mapped
+    from common.stations import StationIndex
+
+    # 모든 달의 (역명, 노선명) 쌍만 읽어 역명 변형 → 역 ID 표를 만듦
+    parts = _subway_all_partitions()
+    columns = lambda table: table.select(["역명", "노선명"])
+    pairs = [read_mapped(part, columns).drop_duplicates() for part in parts]
+    return StationIndex(pd.concat(pairs) if pairs else pd.DataFrame(columns=["역명", "노선명"]))
+
+
+def _subway_base_partitions():
+    # 꼬리 조각(<원본>~<오프셋>)을 뺀, 원본 전체를 수집한 조각들
+    return [part for part in _subway_all_partitions() if "~" not in part.name]
+
+
+def _subway_anomalies():
+    from common.anomalies import AnomalyDetector
+    from common.ingest import RidershipStore
+
+    detector = AnomalyDetector(RidershipStore().load_all())
+    detector.sources = file_fingerprint(_subway_base_partitions())
+    return detector
+
+
+def _subway_anomalies_update(old):
+    from common.ingest import RidershipStore
+
+    # 꼬리 조각만 늘었으면 새 날짜만 덧붙이고, 원본을 다시 수집했으면 처음부터 만듦
+    if old.last_day is None or old.sources != file_fingerprint(_subway_base_partitions()):
+        return _subway_anomalies()
+    return old.extend(RidershipStore().load_all(since=old.last_day + pd.Timedelta(days=1)))
+
+
+def _subway_ranking(month):
+    from common.ingest import RidershipStore
+    from common.subway import StationRanking
+
+    ranking = StationRanking(RidershipStore().load_month(month), get_index("subway_stations"))
+    ranking.sources = file_fingerprint(_subway_partitions(month))
+    return ranking
+
+
+def _subway_ranking_sources(month):
+    # 역 ID는 모든 달의 역 색인 기준이라, 다른 달에 새 역이 생겨도 ID가 밀림 → 모든 조각을 지켜봄
+    return _subway_all_partitions()
+
+
+def _subway_ranking_update(old, month):
+    # 이 달의 조각도 역 색인도 그대로면(다른 달에 꼬리만 붙음) 예전 순위를 그대로 씀
+    stations = get_index("subway_stations")
+    if old.sources == file_fingerprint(_subway_partitions(month)) and old.station_version == stations.version:
+        return old
+    return _subway_ranking(month)
+
+
+def _mbti_ranks():
+    from common.mbti import MBTIRanks
+
+    return MBTIRanks(get_frame("mbti"))
+
+
+def _mbti_similarity():
+    from common.similarity import SimilarityIndex
+
+    data = get_frame("mbti")
+    return SimilarityIndex(data["Country"], data[[c for c in data.columns if c != "Country"]])
+
+
+def _mbti_clustering(metric, method):
+    from common.clustering import Clustering
+
+    # 연결(linkage)은 지표·방법마다 한 번만 계산 — 군집 수를 바꿀 때는 트리를 다시 자르기만 함
+    similarity = get_index("mbti_similarity")
+    return Clustering(similarity.names, similarity.distances[metric], method=method)
+
+
+def _brands():
+    from common.brands import BrandSnapshot
+
+    # 표·진출국가 색인·필터를 같은 표 하나로 만들어 묶음 (페이지가 셋을 따로 가져오면 버전이 어긋날 수 있음)
+    return BrandSnapshot(get_frame("brands"))
+
+
+def _recipes():
+    from common.recipes import RecipeIndex
+
+    return RecipeIndex(get_frame("tea"))
+
+
+def _places():
+    from common.itinerary import ItineraryPlanner
+
+    return ItineraryPlanner(get_frame("places"))
+
+
+INDEXES = {
+    # 순위 색인이 역 색인을 쓰므로 역 색인을 먼저 둠 (refresh 순서)
+    "subway_stations": Index(_subway_all_partitions, _subway_stations),
+    "subway_ranking": Index(_subway_ranking_sources, _subway_ranking, _subway_ranking_update),
+    "subway_anomalies": Index(_subway_all_partitions, _subway_anomalies, _subway_anomalies_update),
+    "mbti_ranks": Index(_dataset_files("mbti"), _mbti_ranks),
+    "mbti_similarity": Index(_dataset_files("mbti"), _mbti_similarity),
+    "mbti_clustering": Index(_dataset_files("mbti"), _mbti_clustering),
+    "brands": Index(_dataset_files("brands"), _brands),
+    "recipes": Index(_dataset_files("tea"), _recipes),
+    "places": Index(_dataset_files("places"), _places),
+    "catalog": Index(lambda: [CATALOG_PATH], Catalog.from_file),
+}
+
+_objects = {}
+_locks = {}
+_guard = threading.Lock()
+
+
+def get_index(name, *args):
+    """이름(과 인자)으로 색인을 가져온다. 프로세스에서 처음 부를 때만 디스크에서 읽거나 만든다."""
+    key = (name, *args)
+    if key not in _objects:
+        with _guard:
+            lock = _locks.setdefault(key, threading.Lock())
+        with lock:
+            # 동시에 들어온 다른 세션이 이미 만들었으면 그대로 사용
+            if key not in _objects:
+                _objects[key] = _build(key)
+    return _objects[key]
+
+
+def _build(key, old=None):
+    name, *args = key
+    index = INDEXES[name]
+    if old is not None and index.update is not None:
+        build = lambda: index.update(old, *args)
+    else:
+        build = lambda: index.build(*args)
+    return cached_object("-".join(map(str, key)), index.sources(*args), build)
+
+
+def refresh(paths):
+    """`paths` 중 하나라도 원본으로 쓰는, 이미 만든 색인을 새로 만들어 바꿔 끼운다.
+
+    만드는 동안 세션은 예전 색인을 그대로 쓴다. 다른 색인에 기대는 색인(군집 ← 거리 행렬)이
+    새 것을 보도록 INDEXES에 적힌 순서대로 만든다. 바꾼 키 목록을 돌려준다.
+    """
+    paths = {str(p) for p in paths}
+    order = list(INDEXES)
+    refreshed = []
+    for key in sorted(list(_objects), key=lambda k: order.index(k[0])):
+        name, *args = key
+        if paths.isdisjoint(str(p) for p in INDEXES[name].sources(*args)):
+            continue
+        _objects[key] = _build(key, _objects[key])
+        refreshed.append(key)
+    return refreshed
+
+
+def forget(name=None):
+    """레지스트리에서 색인을 지운다 (다음 요청 때 디스크 캐시를 다시 확인함)."""
+    for key in list(_objects):
+        if name is None or key[0] == name:
+            _objects.pop(key, None)
+
+
+def built():
+    """지금 레지스트리에 올라 있는 색인 {키: 객체} (메모리 보고용 사본)."""
+    return dict(_objects)
@@ -0,0 +1,255 @@
+"""월별 지하철 승하차 CSV를 월 단위 파티션으로 모아 두는 수집(ingest) 계층.
+
+루트의 damn.csv와 ridership/ 폴더의 월별 CSV를 청크 단위로 흘려 읽어
+.cache/ridership/month=YYYYMM/<원본이름>.arrow 로 나눠 저장한다.
+조각은 날짜순으로 정렬한 압축 없는 Arrow IPC(레코드 배치 하나)라서, 페이지·순위 색인·
+이상 탐지가 모두 같은 파일을 메모리 맵으로 열고 기간만큼 잘라 쓴다 (워커마다 사본을 풀지 않음).
+
+원본 뒤에 새 날짜가 덧붙기만 했으면 늘어난 꼬리만 읽어
+<원본이름>~<오프셋>.arrow 조각으로 더한다 (앞부분은 다시 읽지 않음).
+읽은 청크는 파티션에 쓰기 전에 검사하고(common/validation.py), 걸린 행은 격리한다.
+"""
+import io
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from common.cache import (
+    CACHE_DIR, ROOT, atomic_write, hash_bytes, read_json, read_mapped, sniff_encoding, write_mapped,
+)
+from common.memory import track
+from common.subway import COUNT_COLS, DEFAULT_PATH, normalize, read_checked
+from common.subway import SCHEMA as CSV_SCHEMA
+from common.validation import record, validate
+
+RAW_DIR = ROOT / "ridership"
+STORE_DIR = CACHE_DIR / "ridership"
+CHUNK_ROWS = 100_000
+EDGE_BYTES = 4096  # 덧붙기만 했는지 확인할 때 비교하는, 이미 읽은 부분의 마지막 바이트 수
+INGEST_VERSION = 4  # 검사·타입 규칙이나 저장 형식이 바뀌면 올림 → 예전 규칙으로 수집한 원본은 다시 수집
+
+# 청크마다 범주가 달라져도 같은 스키마로 이어 쓰도록 임시 파일에는 일반 문자열로 저장
+SCHEMA = pa.schema(
+    [("사용일자", pa.timestamp("us")), ("노선명", pa.string()), ("역명", pa.string())]
+    + [(col, pa.int32()) for col in COUNT_COLS]
+)
+
+
+def source_files(raw_dir=RAW_DIR):
+    """수집 대상 CSV 목록 (루트의 damn.csv + ridership/*.csv)."""
+    files = [DEFAULT_PATH] if DEFAULT_PATH.exists() else []
+    if raw_dir.is_dir():
+        files += sorted(raw_dir.glob("*.csv"))
+    return files
+
+
+def month_key(date):
+    return f"{date.year:04d}{date.month:02d}"
+
+
+def _edge(path, size):
+    """`size` 바이트까지 읽은 부분의 마지막 EDGE_BYTES 바이트 해시 (줄 끝에서 끝났을 때만)."""
+    with open(path, "rb") as f:
+        f.seek(max(size - EDGE_BYTES, 0))
+        edge = f.read(size - max(size - EDGE_BYTES, 0))
+    # 줄 중간에서 끝났으면 꼬리만 이어 읽을 수 없으므로 다음 번엔 전체를 다시 읽게 함
+    return hash_bytes(edge) if edge.endswith(b"\n") else None
+
+
+def _between(start, end):
+    """날짜순으로 정렬된 조각에서 [start, end] 행만 잘라 내는 `read_mapped` 선택 함수."""
+    def select(table):
+        dates = table.column("사용일자").to_numpy()
+        lo = np.searchsorted(dates, start.to_datetime64(), side="left")
+        hi = np.searchsorted(dates, end.to_datetime64(), side="right")
+        return table.slice(lo, hi - lo)
+    return select
+
+
+class RidershipStore:
+    """월(YYYYMM)로 파티션된 승하차 저장소.
+
+    원본 CSV마다 크기·수정시각을 manifest.json에 기록해 두고, 바뀐 원본만
+    다시 흘려 읽어 그 원본이 만든 파티션 조각을 교체한다. 뒤에 덧붙기만 한
+    원본은 늘어난 부분만 읽어 꼬리 조각으로 더한다.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self.manifest_path = store_dir / "manifest.json"
+        self.manifest = read_json(self.manifest_path) or {}
+
+    @property
+    def version(self):
+        # 원본 지문이 바뀌면 달라지는 짧은 값 — 페이지 캐시 키로 사용
+        return hash_bytes(json.dumps(self.manifest, sort_keys=True).encode())
+
+    def ingest(self, sources=None):
+        """바뀐 원본만 다시 수집하고, 새로 쓰인 월 목록을 돌려준다.
+
+        manifest는 새 사본을 만들어 다 쓴 뒤 한 번에 바꿔 끼우므로, 수집 중에도
+        다른 스레드는 예전 version·월 목록을 그대로 본다.
+        """
+        sources = source_files() if sources is None else sources
+        manifest = dict(self.manifest)
+        touched = set()
+        for path in sources:
+            stat = path.stat()
+            entry = manifest.get(path.stem)
+            if entry and entry.get("version") != INGEST_VERSION:
+                entry = {**entry, "edge": None}  # 꼬리만 읽지 않고 전체를 다시 수집
+            elif entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            if entry and self._appended(path, entry, stat.st_size):
+                new_entry, months = self._ingest_tail(path, entry)
+            else:
+                new_entry, months = self._ingest_file(path, entry["months"] if entry else [], stat.st_size)
+            manifest[path.stem] = {**new_entry, "mtime_ns": stat.st_mtime_ns, "version": INGEST_VERSION}
+            touched.update(months)
+
+        if manifest != self.manifest:
+            text = json.dumps(manifest, ensure_ascii=False, indent=1)
+            atomic_write(self.manifest_path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+            self.manifest = manifest
+        return sorted(touched)
+
+    def _appended(self, path, entry, size):
+        """이미 읽은 부분은 그대로고 뒤에 줄만 덧붙었는지 (마지막 EDGE_BYTES 바이트로 확인)."""
+        if not entry.get("edge") or size <= entry["size"]:
+            return False
+        return _edge(path, entry["size"]) == entry["edge"]
+
+    def _ingest_file(self, path, old_months, size):
+        """원본 전체를 다시 흘려 읽는다. 새 조각을 다 쓴 뒤에 예전 조각을 지움.
+
+        청크마다 검사해 걸린 행을 모아 두었다가 원본 하나의 격리 결과로 한 번에 남긴다
+        (키 중복은 검사에서는 청크 안에서만 보고, 청크 사이의 중복은 조각을 쓸 때,
+        원본·꼬리 조각 사이의 중복은 읽을 때 뒤 행을 남김).
+        """
+        name = path.stem
+        encoding = sniff_encoding(path)
+        rejected = []
+        rows = 0
+
+        def checked(chunk):
+            nonlocal rows
+            rows += len(chunk)
+            good, bad = validate(chunk, CSV_SCHEMA)
+            rejected.append(bad)
+            return good
+
+        raw = pd.read_csv(path, encoding=encoding, dtype=str, chunksize=CHUNK_ROWS)
+        months = self._write((checked(chunk) for chunk in raw), name)
+        record(name, pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame(columns=["사유"]), rows)
+        for month in old_months:
+            # 꼬리 조각, 이번에 안 쓴 달의 조각, 예전 형식(.parquet)으로 쓴 조각을 지움
+            keep = self._part_path(month, name) if month in months else None
+            for part in (self.store_dir / f"month={month}").glob(f"{name}*"):
+                if part != keep and part.stem.split("~")[0] == name:
+                    part.unlink(missing_ok=True)
+        return {"size": size, "edge": _edge(path, size), "encoding": encoding, "months": months}, months
+
+    def _ingest_tail(self, path, entry):
+        """덧붙은 꼬리(완성된 줄까지)만 읽어 오프셋 이름의 조각으로 더한다."""
+        offset = entry["size"]
+        with open(path, "rb") as f:
+            header = f.readline()
+            f.seek(offset)
+            tail = f.read()
+        # 아직 쓰는 중인 마지막 줄은 다음 번에 읽음
+        tail = tail[:tail.rfind(b"\n") + 1]
+        if not tail:
+            return entry, []
+        df = read_checked(io.BytesIO(header + tail), path.stem, append=True, encoding=entry["encoding"])
+        months = self._write([df], f"{path.stem}~{offset:012d}")
+        size = offset + len(tail)
+        new_entry = {**entry, "size": size, "edge": _edge(path, size),
+                     "months": sorted(set(entry["months"]) | set(months))}
+        return new_entry, months
+
+    def _write(self, chunks, name):
+        """정리된 청크들을 월별 파티션 조각(`name`.arrow)으로 쓰고, 쓴 월 목록을 돌려준다.
+
+        청크는 달마다 임시 파일에 이어 쓴 뒤, 한 달씩 날짜순으로 정렬해 레코드 배치 하나로
+        다시 쓴다 — 배치가 하나여야 읽을 때 맵한 버퍼를 그대로 잘라 쓸 수 있다. 청크 사이에
+        같은 (날짜, 노선, 역)이 있으면 이때 뒤 행만 남기므로, 조각 하나는 읽을 때 중복을 볼 필요가 없다.
+        """
+        writers = {}
+        try:
+            for chunk in chunks:
+                keys = chunk["사용일자"].dt.year * 100 + chunk["사용일자"].dt.month
+                for key, part in chunk.groupby(keys, sort=False):
+                    month = str(key)
+                    if month not in writers:
+                        tmp = self._part_path(month, name).with_suffix(".tmp")
+                        tmp.parent.mkdir(parents=True, exist_ok=True)
+                        sink = pa.OSFile(str(tmp), "wb")
+                        writers[month] = (tmp, sink, pa.ipc.new_file(sink, SCHEMA))
+                    table = pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False)
+                    writers[month][2].write_table(table)
+        finally:
+            for _, sink, writer in writers.values():
+                writer.close()
+                sink.close()
+        for month, (tmp, _, _) in writers.items():
+            df = normalize(read_mapped(tmp)).sort_values("사용일자", kind="stable", ignore_index=True)
+            # 안정 정렬이라 같은 날짜 안에서는 원본 순서 그대로 → keep="last"가 나중 행
+            df = df.drop_duplicates(["사용일자", "노선명", "역명"], keep="last", ignore_index=True)
+            atomic_write(self._part_path(month, name), lambda out: write_mapped(out, df))
+            tmp.unlink()
+        return sorted(writers)
+
+    def _part_path(self, month, name):
+        return self.store_dir / f"month={month}" / f"{name}.arrow"
+
+    def partitions(self, month):
+        """한 달 파티션의 조각 파일들 (원본 이름순, 같은 원본의 꼬리 조각은 오프셋순으로 뒤에)."""
+        return sorted((self.store_dir / f"month={month}").glob("*.arrow"))
+
+    def months(self):
+        """저장된 월 목록 (YYYYMM, 오름차순)."""
+        if not self.store_dir.is_dir():
+            return []
+        return sorted(
+            d.name.split("=", 1)[1]
+            for d in self.store_dir.glob("month=*")
+            if any(d.glob("*.arrow"))
+        )
+
+    def load(self, start, end):
+        """[start, end] 기간의 데이터를 걸치는 월 파티션에서만 읽어 온다.
+
+        조각이 하나면 날짜·승하차 열은 맵한 파일을 그대로 가리킨다 (여러 조각이면 이어 붙이며 복사).
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        wanted = {month_key(d) for d in pd.period_range(start, end, freq="M")}
+        parts = [part for month in self.months() if month in wanted for part in self.partitions(month)]
+        if not parts:
+            return normalize(SCHEMA.empty_table().to_pandas())
+
+        frames = [read_mapped(p, _between(start, end)) for p in parts]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        if len(parts) > 1:
+            # 같은 날짜가 여러 원본(또는 원본과 꼬리 조각)에 겹쳐 들어 있으면 뒤(나중) 조각을 남김
+            df = df.drop_duplicates(["사용일자", "노선명", "역명"], keep="last", ignore_index=True)
+        # 받아 간 쪽이 들고 있는 동안만 메모리 보고에 보임
+        return track(f"승하차 {start:%Y-%m-%d}~{end:%Y-%m-%d}", normalize(df))
+
+    def load_all(self, since=None):
+        """저장된 모든 월을 읽는다 (`since`를 주면 그날부터)."""
+        months = self.months()
+        if not months:
+            return normalize(SCHEMA.empty_table().to_pandas())
+        start = pd.Timestamp(since) if since is not None else pd.Timestamp(f"{months[0]}01")
+        return self.load(start, pd.Timestamp(f"{months[-1]}01") + pd.offsets.MonthEnd(0))
+
+    def load_month(self, month):
+        start = pd.Timestamp(f"{month}01")
+        return self.load(start, start + pd.offsets.MonthEnd(0))
+
+    def clear(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        self.manifest = {}
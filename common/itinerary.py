@@ -0,0 +1,172 @@
+"""관광지 좌표로 여행 일정을 짜는 엔진.
+
+1) 관광지 사이 거리(하버사인, km) 행렬을 한 번만 계산해 두고,
+2) 하루에 갈 곳들을 용량이 정해진 k-평균으로 묶은 뒤,
+3) 하루 동선은 최근접 이웃으로 시작해 2-opt로 다듬는다 (열린 경로, 출발점 모두 시도).
+관광지 100여 곳 × 7일도 몇십 ms 안에 끝난다.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+SLOTS = ["오전", "오후", "야간"]
+
+
+def haversine_matrix(lat, lon):
+    """위경도(도) 배열 → 모든 쌍의 대권 거리(km) 행렬 (벡터화)."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def balanced_kmeans(points, k, capacity, n_iter=20, n_init=8):
+    """한 묶음에 `capacity`개까지만 들어가는 k-평균. 묶음 번호 배열을 돌려준다.
+
+    초기값을 `n_init`번 바꿔 돌려 묶음 안 제곱거리 합이 가장 작은 결과를 고른다.
+    """
+    best, best_sse = None, np.inf
+    for seed in range(n_init):
+        labels = _balanced_kmeans_once(points, k, capacity, n_iter, seed)
+        sse = sum(((points[labels == c] - points[labels == c].mean(0)) ** 2).sum()
+                  for c in range(k) if (labels == c).any())
+        if sse < best_sse:
+            best, best_sse = labels, sse
+    return best
+
+
+def _balanced_kmeans_once(points, k, capacity, n_iter, seed):
+    # 배정은 (점, 대표점) 쌍을 거리순으로 훑으며 빈자리가 있는 묶음에 넣는 탐욕법
+    n = len(points)
+    rng = np.random.default_rng(seed)
+    # k-means++ 초기화: 이미 고른 대표점에서 먼 점일수록 잘 뽑힘
+    centroids = [points[rng.integers(n)]]
+    for _ in range(1, k):
+        d = ((points[:, None, :] - np.array(centroids)[None]) ** 2).sum(-1).min(1)
+        centroids.append(points[rng.choice(n, p=d / d.sum()) if d.sum() > 0 else rng.integers(n)])
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1)
+    for _ in range(n_iter):
+        dist = ((points[:, None, :] - centroids[None]) ** 2).sum(-1)
+        order = np.argsort(dist, axis=None, kind="stable")
+        new = np.full(n, -1)
+        room = np.full(k, capacity)
+        for flat in order:
+            i, c = divmod(int(flat), k)
+            if new[i] < 0 and room[c] > 0:
+                new[i] = c
+                room[c] -= 1
+        if np.array_equal(new, labels):
+            break
+        labels = new
+        for c in range(k):
+            if (labels == c).any():
+                centroids[c] = points[labels == c].mean(0)
+    return labels
+
+
+def _path_length(dist, path):
+    return dist[path[:-1], path[1:]].sum()
+
+
+def nearest_neighbor(dist, start):
+    n = len(dist)
+    path = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[path[-1]])
+        nxt = int(np.argmin(row))
+        path.append(nxt)
+        visited[nxt] = True
+    return np.array(path)
+
+
+def two_opt(dist, path):
+    """열린 경로에 2-opt를 개선이 없을 때까지 적용 (한 번에 가장 큰 개선을 벡터화로 찾음)."""
+    path = path.copy()
+    n = len(path)
+    if n < 4:
+        return path
+    i, j = np.triu_indices(n, k=1)  # 뒤집을 구간 path[i+1 .. j]
+    while True:
+        a, b, c = path[i], path[i + 1], path[j]
+        # 끝점이 마지막이면 뒤쪽 간선이 없음 (열린 경로)
+        d = path[np.minimum(j + 1, n - 1)]
+        has_next = j + 1 < n
+        before = dist[a, b] + np.where(has_next, dist[c, d], 0)
+        after = dist[a, c] + np.where(has_next, dist[b, d], 0)
+        gain = before - after
+        best = int(np.argmax(gain))
+        if gain[best] <= 1e-9:
+            return path
+        path[i[best] + 1:j[best] + 1] = path[i[best] + 1:j[best] + 1][::-1]
+
+
+def solve_route(dist):
+    """거리 행렬 `dist`의 모든 점을 한 번씩 도는 짧은 열린 경로 (출발점을 모두 시도)."""
+    n = len(dist)
+    if n <= 2:
+        return np.arange(n)
+    best, best_len = None, np.inf
+    for start in range(n):
+        path = two_opt(dist, nearest_neighbor(dist, start))
+        length = _path_length(dist, path)
+        if length < best_len:
+            best, best_len = path, length
+    return best
+
+
+class ItineraryPlanner:
+    """관광지 표(name, lat, lon, station, line, priority ...)와 거리 행렬을 들고 일정을 짠다."""
+
+    def __init__(self, places):
+        self.places = places.reset_index(drop=True)
+        lat = self.places["lat"].to_numpy(dtype=float)
+        lon = self.places["lon"].to_numpy(dtype=float)
+        self.distances = haversine_matrix(lat, lon)
+        # 군집용 평면 좌표(km): 위도에 따라 경도 간격이 줄어드는 것만 보정
+        lat0 = np.radians(lat.mean()) if len(lat) else 0.0
+        self._xy = np.column_stack([
+            np.radians(lat) * EARTH_RADIUS_KM,
+            np.radians(lon) * EARTH_RADIUS_KM * np.cos(lat0),
+        ])
+        self.categories = sorted(self.places["category"].unique())
+
+    def pick(self, n, categories=None):
+        """우선순위가 높은 관광지 `n`곳의 행 번호 (분류를 고르면 그 안에서만)."""
+        rows = self.places.index.to_numpy()
+        if categories:
+            rows = rows[self.places["category"].isin(categories).to_numpy()]
+        return rows[np.argsort(self.places["priority"].to_numpy()[rows], kind="stable")[:n]]
+
+    def plan(self, days, per_day, categories=None):
+        """`days`일 × 하루 `per_day`곳 일정표 (day, order, 이동거리 km 열이 붙은 관광지 표)."""
+        rows = self.pick(days * per_day, categories)
+        if len(rows) == 0:
+            return self.places.iloc[[]].assign(day=[], order=[], leg_km=[])
+        # 관광지가 모자라면 하루 `per_day`곳을 채우는 만큼만 일수를 씀
+        days = min(days, -(-len(rows) // per_day))
+        labels = balanced_kmeans(self._xy[rows], days, capacity=-(-len(rows) // days))
+
+        # 하루 묶음은 서쪽(경도)부터 Day 1, 2, ... 로 번호를 매김
+        west = [self._xy[rows[labels == c], 1].mean() for c in range(days)]
+        day_of = {c: d + 1 for d, c in enumerate(np.argsort(west))}
+
+        parts = []
+        for c in range(days):
+            members = rows[labels == c]
+            sub = self.distances[np.ix_(members, members)]
+            route = solve_route(sub)
+            ordered = members[route]
+            legs = np.concatenate([[0.0], sub[route[:-1], route[1:]]])
+            parts.append(self.places.iloc[ordered].assign(day=day_of[c], order=np.arange(1, len(ordered) + 1),
+                                                          leg_km=legs))
+        return pd.concat(parts).sort_values(["day", "order"]).reset_index(drop=True)
+
+
+def time_slots(n):
+    """하루 `n`곳을 오전·오후·야간에 고르게 나눈 이름 목록."""
+    return [SLOTS[min(len(SLOTS) - 1, i * len(SLOTS) // max(n, 1))] for i in range(n)]
@@ -0,0 +1,96 @@
+"""모든 페이지가 함께 쓰는 CSV 로더와 프로세스 전역 데이터셋 레지스트리.
+
+- CSV는 한 번만 파싱해 스키마 검사(common/validation.py)를 거친 행만 선언한 타입으로 바꾸고,
+  전처리까지 마친 표를 Arrow 캐시(.cache/*.arrow)에 남긴다. 걸린 행은 .cache/quarantine/ 으로.
+  원본이 그대로면 재시작하거나 새 워커가 떠도 CSV를 다시 파싱하지 않고,
+  여러 프로세스가 같은 파일을 메모리 맵으로 열어 한 벌의 메모리를 공유한다.
+- 읽은 표는 프로세스당 한 번만 만들어 레지스트리에 두고, 모든 페이지·세션이 공유한다.
+  돌려주는 표는 얕은 복사본이라 호출한 쪽에서 열을 바꿔도 원본은 그대로다 (Copy-on-Write).
+- 원본이 바뀌면 감시 스레드(common/watcher.py)가 refresh()로 새 표를 읽어 바꿔 끼운다.
+"""
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from common import brands, mbti, recipes
+from common.cache import ROOT, cached_frame
+from common.validation import Schema, check
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # pandas 3부터는 기본값. 공유 표를 얕은 복사로 나눠 줘도 안전하도록 켜 둔다.
+    pd.set_option("mode.copy_on_write", True)
+
+
+@dataclass
+class Dataset:
+    path: object
+    schema: object = None  # 열 타입·범위·키 검사 (validation.Schema) — 통과한 행만 선언한 타입으로
+    prepare: object = None  # 검사 직후 한 번만 실행할 전처리 (표 → 표)
+
+    def read(self):
+        return cached_frame(self.path, self.parse)
+
+    def parse(self, buffer):
+        # 글자 그대로 읽어야 숫자가 아닌 칸이 있어도 read_csv가 멈추지 않고 그 행만 격리됨
+        df = check(pd.read_csv(buffer, dtype=str), self.schema, self.path.stem)
+        return self.prepare(df) if self.prepare else df
+
+
+# 승하차(damn.csv, ridership/*.csv)는 여기 없음 — 월 파티션 저장소(common/ingest.py)에서만 읽는다
+DATASETS = {
+    "mbti": Dataset(ROOT / "countriesMBTI_16types.csv", schema=mbti.SCHEMA),
+    "brands": Dataset(ROOT / "altificial.csv", schema=brands.SCHEMA, prepare=brands.prepare),
+    "tea": Dataset(ROOT / "TEA.csv", schema=recipes.SCHEMA, prepare=recipes.prepare),
+    "places": Dataset(
+        ROOT / "places.csv",
+        # 반복되는 분류·역·노선은 범주형, 좌표는 float32(약 1m 정밀도)면 충분.
+        # 위도·경도가 비었거나 뒤바뀌었거나 한국 밖을 가리키는 행은 격리
+        schema=Schema(
+            dtype={"name": str, "category": "category", "lat": "float32", "lon": "float32",
+                   "station": "category", "line": "category", "priority": "int16"},
+            required=("name", "category", "station", "line"),
+            ranges={"lat": (33, 39), "lon": (124, 132), "priority": (1, None)},
+            key=("name",),
+        ),
+    ),
+}
+
+_frames = {}
+_locks = {name: threading.Lock() for name in DATASETS}
+_revisions = {name: 0 for name in DATASETS}
+
+
+def get_frame(name):
+    """이름으로 데이터셋을 가져온다. 프로세스에서 처음 부를 때만 파일을 읽는다."""
+    if name not in _frames:
+        with _locks[name]:
+            # 동시에 들어온 다른 세션이 이미 읽었으면 그대로 사용
+            if name not in _frames:
+                _frames[name] = DATASETS[name].read()
+    return _frames[name].copy(deep=False)
+
+
+def forget(name=None):
+    """레지스트리에서 데이터셋을 지운다 (다음 요청 때 다시 읽음)."""
+    if name is None:
+        _frames.clear()
+    else:
+        _frames.pop(name, None)
+
+
+def refresh(name):
+    """데이터셋을 새로 읽어 한 번에 바꿔 끼운다. 읽는 동안 세션은 예전 표를 그대로 쓴다."""
+    df = DATASETS[name].read()
+    with _locks[name]:
+        _frames[name] = df
+        _revisions[name] += 1
+
+
+def loaded(name):
+    return name in _frames
+
+
+def revision(name):
+    """데이터셋을 바꿔 끼울 때마다 1씩 느는 값 — 그림 캐시 키에 넣어 예전 결과를 쓰지 않게 함."""
+    return _revisions[name]
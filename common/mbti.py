@@ -0,0 +1,69 @@
+"""국가별 MBTI 16유형 분포(countriesMBTI_16types.csv) 색인."""
+import numpy as np
+import pandas as pd
+
+from common.validation import Schema
+
+# countriesMBTI_16types.csv의 열 순서
+MBTI_TYPES = [
+    "INFJ", "ISFJ", "INTP", "ISFP", "ENTP", "INFP", "ENTJ", "ISTP",
+    "INTJ", "ESFP", "ESTJ", "ENFP", "ESTP", "ISTJ", "ENFJ", "ESFJ",
+]
+
+# 비율은 소수 셋째 자리까지라 float32로 충분. 한 나라의 16개 비율은 합이 1에 가까워야 함
+# (원본은 반올림 때문에 0.97~1.03 정도까지 벌어짐)
+SCHEMA = Schema(
+    dtype={"Country": str, **{t: "float32" for t in MBTI_TYPES}},
+    required=("Country", *MBTI_TYPES),
+    ranges={t: (0, 1) for t in MBTI_TYPES},
+    key=("Country",),
+    row_sum=(MBTI_TYPES, 1.0, 0.05),
+)
+
+
+class MBTIRanks:
+    """유형별 국가 순위 행렬 (데이터를 읽을 때 한 번만 만든다).
+
+    - order[r, j]: j번째 유형 비율이 r+1등인 국가의 행 번호
+    - ranks[i, j]: i번째 국가의 j번째 유형 순위 (1등 = 0)
+
+    둘 다 int16 NumPy 배열이라 상위 N개는 열 하나를 자르는 것, 임의 국가의
+    순위는 원소 하나를 읽는 것으로 끝난다.
+    """
+
+    def __init__(self, df):
+        self.types = [c for c in df.columns if c != "Country"]
+        self.countries = df["Country"].to_numpy()
+        self.values = df[self.types].to_numpy()
+
+        dtype = np.int16 if len(df) <= np.iinfo(np.int16).max else np.int32
+        self.order = np.argsort(-self.values, axis=0, kind="stable").astype(dtype)
+        self.ranks = np.empty_like(self.order)
+        self.ranks[self.order, np.arange(len(self.types))] = np.arange(len(df), dtype=dtype)[:, None]
+
+        self._row = {country: i for i, country in enumerate(self.countries)}
+        self._col = {t: j for j, t in enumerate(self.types)}
+
+    def rank(self, country, mbti_type):
+        """`country`의 `mbti_type` 순위 (1부터)."""
+        return int(self.ranks[self._row[country], self._col[mbti_type]]) + 1
+
+    def top(self, mbti_type, n=10, include=None):
+        """해당 유형 비율 상위 `n`개 국가. `include` 국가가 빠져 있으면 마지막에 덧붙인다."""
+        j = self._col[mbti_type]
+        rows = self.order[:n, j]
+        if include in self._row and self.ranks[self._row[include], j] >= n:
+            rows = np.append(rows, self._row[include])
+        return pd.DataFrame({
+            "Country": self.countries[rows],
+            mbti_type: self.values[rows, j],
+            "순위": self.ranks[rows, j] + 1,
+        })
+
+    def country_ranks(self, country):
+        """한 국가의 16개 유형별 비율과 순위 (순위가 높은 유형부터)."""
+        i = self._row[country]
+        table = pd.DataFrame(
+            {"비율": self.values[i], "순위": self.ranks[i] + 1}, index=pd.Index(self.types, name="MBTI")
+        )
+        return table.sort_values("순위", kind="stable")
@@ -0,0 +1,156 @@
+"""프로세스가 들고 있는 데이터의 메모리 사용량 보고 (열 → 데이터셋 → 색인 → 프로세스).
+
+레지스트리(common/loader.py, common/indexes.py)와 공유 결과 캐시, 그리고 그 밖에서
+`track()`으로 알려 온 표(수집 저장소에서 읽은 승하차, 페이지 캐시의 시계열)를 재므로,
+모든 데이터셋과 색인을 데운 뒤(warmup.py)의 값이 워커 하나가 필요한 메모리의 기준이 된다.
+디버그 사이드바와 warmup.py가 이 보고를 쓴다.
+"""
+import os
+import sys
+import weakref
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 레지스트리 밖에서 들고 있는 표 — 약한 참조라 캐시에서 밀려나 버려지면 보고에서도 빠짐
+_tracked = weakref.WeakValueDictionary()
+
+
+def column_bytes(df):
+    """열마다 (타입, 바이트) 표 — 문자열·범주형은 실제 문자열 크기까지 센다."""
+    usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({"열": usage.index, "타입": df.dtypes.astype(str).to_numpy(), "바이트": usage.to_numpy()})
+
+
+def deep_size(obj, seen=None):
+    """색인 객체가 붙잡고 있는 배열·표·사전의 대략적인 바이트 수 (같은 객체는 한 번만)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        # 다른 배열의 뷰는 원본 쪽에서 셈 (피클에서 읽은 배열은 bytes 버퍼 위에 있음)
+        return 0 if isinstance(obj.base, np.ndarray) else obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+def track(name, obj):
+    """레지스트리 밖에서 오래 들고 있을 수 있는 표·객체를 메모리 보고에 올리고 그대로 돌려준다."""
+    _tracked[name] = obj
+    return obj
+
+
+def process_memory():
+    """(지금 RSS, 최대 RSS) 바이트. 알 수 없으면 None."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # 리눅스는 KB, macOS는 바이트
+    return rss, peak
+
+
+def dataset_report():
+    """레지스트리에 올라온 데이터셋마다 {행, 열, 바이트, 열별 표}."""
+    from common import loader
+
+    report = {}
+    for name in loader.DATASETS:
+        if not loader.loaded(name):
+            continue
+        df = loader.get_frame(name)
+        columns = column_bytes(df)
+        report[name] = {"rows": len(df), "columns": columns, "bytes": int(columns["바이트"].sum())}
+    return report
+
+
+def index_report():
+    """만들어 둔 색인마다 대략적인 바이트 (키는 '이름-인자')."""
+    from common import indexes
+
+    # 여러 색인이 같은 배열·표를 붙잡고 있으면 먼저 잰 색인 쪽에만 셈
+    seen = set()
+    objects = sorted(indexes.built().items(), key=lambda item: str(item[0]))
+    return {"-".join(map(str, key)): deep_size(obj, seen) for key, obj in objects}
+
+
+def tracked_report():
+    """`track()`으로 알려 온 것 중 아직 살아 있는 것마다 대략적인 바이트."""
+    seen = set()
+    objects = sorted(_tracked.items())
+    return {name: deep_size(obj, seen) for name, obj in objects}
+
+
+def summary():
+    """데이터셋·색인·그 밖의 표·결과 캐시·프로세스 메모리를 바이트로 모은 dict (JSON으로 바로 쓸 수 있음)."""
+    from common.result_cache import RESULTS
+
+    datasets = dataset_report()
+    rss, peak = process_memory()
+    return {
+        "datasets": {name: info["bytes"] for name, info in datasets.items()},
+        "indexes": index_report(),
+        "tracked": tracked_report(),
+        "results": RESULTS.stats()["bytes"],
+        "rss": rss,
+        "peak_rss": peak,
+    }
+
+
+def _mb(size):
+    return "-" if size is None else f"{size / (1 << 20):,.2f} MB"
+
+
+def render_memory():
+    """디버그 사이드바의 메모리 보고 (데이터셋 합계 → 열별 표, 색인, 프로세스)."""
+    import streamlit as st
+
+    from common.result_cache import RESULTS
+
+    datasets = dataset_report()
+    indexes_bytes = index_report()
+    tracked = tracked_report()
+    rss, peak = process_memory()
+    with st.sidebar.expander("🧠 디버그: 메모리", expanded=False):
+        st.caption(f"🖥 프로세스 RSS {_mb(rss)} (최대 {_mb(peak)})")
+        st.caption(
+            f"📚 데이터셋 {_mb(sum(info['bytes'] for info in datasets.values()))} · "
+            f"색인 {_mb(sum(indexes_bytes.values()))} · 그 밖의 표 {_mb(sum(tracked.values()))} · 결과 캐시 {_mb(RESULTS.stats()['bytes'])}"
+        )
+        if datasets:
+            st.dataframe(
+                pd.DataFrame([{"데이터셋": name, "행": info["rows"], "KB": info["bytes"] / 1024}
+                              for name, info in datasets.items()]).round(1),
+                hide_index=True, use_container_width=True,
+            )
+            name = st.selectbox("열별 크기", list(datasets), key="memory_dataset")
+            columns = datasets[name]["columns"].assign(KB=lambda t: (t["바이트"] / 1024).round(1))
+            st.dataframe(columns.drop(columns="바이트"), hide_index=True, use_container_width=True)
+        if indexes_bytes:
+            table = pd.DataFrame({"색인": list(indexes_bytes), "KB": np.array(list(indexes_bytes.values())) / 1024})
+            st.dataframe(table.sort_values("KB", ascending=False).round(1), hide_index=True,
+                         use_container_width=True)
+        if tracked:
+            # 수집 저장소에서 읽은 승하차 표, 지하철 페이지가 캐시해 둔 기간별 시계열
+            table = pd.DataFrame({"표": list(tracked), "KB": np.array(list(tracked.values())) / 1024})
+            st.dataframe(table.round(1), hide_index=True, use_container_width=True)
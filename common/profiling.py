@@ -0,0 +1,229 @@
+"""리런 단계별 시간 측정과 디버그 사이드바 (켜야만 동작).
+
+`APP_PROFILE=1` 환경 변수나 `?debug=1` 주소 파라미터로 켠다. 켜져 있으면
+페이지가 `with prof.stage("filter"):` 로 감싼 단계의 시간, 캐시 적중 여부,
+그림(JSON) 크기와 메모리 보고(common/memory.py)를 사이드바에 보여 준다. 단계별 최근
+p50/p95와 메모리 크기는 .cache/metrics/ 아래 Prometheus 텍스트 파일로, 리런 기록은
+JSON Lines 로그로 내보낸다.
+
+리런은 끝에서 `prof.finish()`로 마무리한다. 중간에 멈추는 곳은 st.stop() 대신 `prof.stop()`을,
+본문을 함수로 둔 페이지는 `with page_profiler(...) as prof:`를 써서 멈춘 리런의 측정값도 남긴다.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+from common.cache import CACHE_DIR, atomic_write
+from common.memory import render_memory, summary
+
+METRICS_DIR = CACHE_DIR / "metrics"
+PROM_PATH = METRICS_DIR / "app.prom"
+LOG_PATH = METRICS_DIR / "stages.jsonl"
+WINDOW = 500  # 단계별로 기억하는 최근 측정 개수
+LOG_MAX_BYTES = 5 << 20
+EXPORT_INTERVAL = 5.0  # 초 — Prometheus 파일은 이 간격보다 자주 다시 쓰지 않음
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))  # (페이지, 단계) -> 최근 소요 시간(초)
+_cache_counts = defaultdict(int)  # (페이지, 캐시, hit|miss) -> 횟수
+_figure_bytes = {}  # 페이지 -> 마지막 그림 크기
+_last_export = 0.0
+
+
+def enabled():
+    if os.environ.get("APP_PROFILE") == "1":
+        return True
+    try:
+        import streamlit as st
+
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+class Profiler:
+    """한 번의 리런 동안 단계별 시간과 캐시 적중을 모은다."""
+
+    def __init__(self, page):
+        self.page = page
+        self.stages = {}
+        self.cache = []
+        self.figure_bytes = 0
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            with _lock:
+                _samples[(self.page, name)].append(elapsed)
+
+    def cache_lookup(self, cache, hit):
+        self.cache.append((cache, hit))
+        with _lock:
+            _cache_counts[(self.page, cache, "hit" if hit else "miss")] += 1
+
+    def figure(self, payload):
+        """화면으로 보내는 그림(JSON 문자열 또는 plotly Figure)의 크기를 기록한다."""
+        if not isinstance(payload, str):
+            payload = payload.to_json()  # 켜져 있을 때만 한 번 더 직렬화함
+        self.figure_bytes += len(payload.encode("utf-8"))
+        with _lock:
+            _figure_bytes[self.page] = self.figure_bytes
+
+    def finish(self):
+        """측정값을 내보내고 사이드바에 이번 리런 결과를 보여 준다.
+
+        st.stop()으로 끝난 리런에서는 더 그릴 수 없어 사이드바 쪽이 StopException을
+        다시 던지므로, 내보내기를 먼저 해 그런 리런의 측정값도 남긴다.
+        """
+        export(self)
+        render_sidebar(self)
+
+    def stop(self):
+        """측정값을 남기고 사이드바를 그린 뒤 리런을 끝낸다 — 페이지의 st.stop() 대신 쓴다."""
+        import streamlit as st
+
+        self.finish()
+        st.stop()
+
+
+class _NullProfiler:
+    """꺼져 있을 때 쓰는 아무 일도 하지 않는 측정기."""
+
+    def stage(self, name):
+        return nullcontext()
+
+    def cache_lookup(self, cache, hit):
+        pass
+
+    def figure(self, payload):
+        pass
+
+    def finish(self):
+        pass
+
+    def stop(self):
+        import streamlit as st
+
+        st.stop()
+
+
+def profiler(page):
+    return Profiler(page) if enabled() else _NullProfiler()
+
+
+@contextmanager
+def page_profiler(page):
+    """본문을 함수로 둔 페이지용: `with page_profiler("brands") as prof: app(prof)`.
+
+    return·st.stop()·예외로 끝나도 finish()를 부른다 (멈춘 리런은 측정값만 남고 사이드바는 못 그림).
+    """
+    prof = profiler(page)
+    try:
+        yield prof
+    finally:
+        prof.finish()
+
+
+def percentiles():
+    """(페이지, 단계)별 최근 측정의 p50/p95(초)와 개수."""
+    with _lock:
+        snapshot = {key: np.array(values) for key, values in _samples.items() if values}
+    return {
+        key: {"p50": float(np.percentile(v, 50)), "p95": float(np.percentile(v, 95)), "n": len(v)}
+        for key, v in snapshot.items()
+    }
+
+
+def render_sidebar(prof):
+    import pandas as pd
+    import streamlit as st
+
+    from common.result_cache import RESULTS
+
+    stats = percentiles()
+    rows = [
+        {
+            "단계": name,
+            "이번(ms)": seconds * 1000,
+            "p50(ms)": stats.get((prof.page, name), {}).get("p50", 0) * 1000,
+            "p95(ms)": stats.get((prof.page, name), {}).get("p95", 0) * 1000,
+        }
+        for name, seconds in prof.stages.items()
+    ]
+    with st.sidebar.expander("🛠 디버그: 단계별 시간", expanded=True):
+        if rows:
+            st.dataframe(pd.DataFrame(rows).round(1), hide_index=True, use_container_width=True)
+        for cache, hit in prof.cache:
+            st.caption(f"{'✅ 적중' if hit else '❌ 미스'} — {cache}")
+        if prof.figure_bytes:
+            st.caption(f"📦 그림 크기: {prof.figure_bytes / 1024:,.1f} KB")
+        shared = RESULTS.stats()
+        st.caption(
+            f"🗄 공유 결과 캐시: {shared['entries']}개 · {shared['bytes'] / 1024:,.0f} KB · "
+            f"적중 {shared['hits']} / 미스 {shared['misses']} ({shared['hit_rate']:.0%})"
+        )
+    render_memory()
+
+
+def _label(**labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def export(prof):
+    """리런 한 번을 JSON Lines로 남기고, 간격마다 Prometheus 텍스트 파일을 다시 쓴다."""
+    global _last_export
+    record = {
+        "ts": time.time(),
+        "page": prof.page,
+        "stages": prof.stages,
+        "cache": [{"cache": c, "hit": h} for c, h in prof.cache],
+        "figure_bytes": prof.figure_bytes,
+    }
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        with _lock:
+            if LOG_PATH.exists() and LOG_PATH.stat().st_size > LOG_MAX_BYTES:
+                LOG_PATH.replace(LOG_PATH.with_suffix(".jsonl.1"))
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if time.time() - _last_export < EXPORT_INTERVAL:
+                return
+            _last_export = time.time()
+            counts = dict(_cache_counts)
+            figures = dict(_figure_bytes)
+        lines = ["# TYPE app_stage_seconds summary"]
+        for (page, stage), s in sorted(percentiles().items()):
+            for q in ("p50", "p95"):
+                quantile = "0.5" if q == "p50" else "0.95"
+                lines.append(f"app_stage_seconds{{{_label(page=page, stage=stage, quantile=quantile)}}} {s[q]:.6f}")
+            lines.append(f"app_stage_seconds_count{{{_label(page=page, stage=stage)}}} {s['n']}")
+        lines.append("# TYPE app_cache_lookups_total counter")
+        for (page, cache, result), n in sorted(counts.items()):
+            lines.append(f"app_cache_lookups_total{{{_label(page=page, cache=cache, result=result)}}} {n}")
+        lines.append("# TYPE app_figure_bytes gauge")
+        for page, size in sorted(figures.items()):
+            lines.append(f"app_figure_bytes{{{_label(page=page)}}} {size}")
+        # 레플리카 크기를 정할 때 볼 값: 레지스트리에 올라온 데이터셋·색인, 그 밖에 들고 있는 표와 프로세스 RSS
+        memory = summary()
+        lines.append("# TYPE app_memory_bytes gauge")
+        for kind in ("datasets", "indexes", "tracked"):
+            for name, size in sorted(memory[kind].items()):
+                lines.append(f"app_memory_bytes{{{_label(kind=kind, name=name)}}} {size}")
+        lines.append(f"app_memory_bytes{{{_label(kind='results', name='shared')}}} {memory['results']}")
+        if memory["rss"] is not None:
+            lines.append("# TYPE app_process_rss_bytes gauge")
+            lines.append(f"app_process_rss_bytes {memory['rss']}")
+        text = "\n".join(lines) + "\n"
+        atomic_write(PROM_PATH, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    except OSError:
+        pass
@@ -0,0 +1,170 @@
+"""녹차 레시피(TEA.csv)의 재료 색인.
+
+'계란 5개, 박력분 110g, ...' 같은 주재료/부재료 자유 서술을 한 번만 풀어서
+(레시피, 재료, 수량, 단위) 긴 표와 재료 → 레시피 역색인으로 만들어 둔다.
+질의는 레시피 번호 배열의 교집합·차집합과 bincount로 끝나므로 레시피가 늘어도
+전체 표를 다시 훑지 않는다.
+"""
+import numpy as np
+import pandas as pd
+
+from common.validation import Schema
+
+ROLES = ["주재료", "부재료"]
+
+# 쉼표·'+'(숫자 사이 '3+½' 같은 분수 표기는 제외)로 재료를 나눔
+SPLIT_PATTERN = r",|(?<![\d½⅓⅔¼¾])\+|\+(?![\d½⅓⅔¼¾])"
+# '[케익시트용]' 같은 묶음 제목과 '양념장:' 같은 앞머리
+LABEL_PATTERN = r"\[[^\]]*\]|^[^:]*:"
+# '다쿠아즈(흰자 132g, 설탕 54g)'처럼 괄호 안에 재료 목록이 있으면 괄호를 풀어 줌
+GROUP_PATTERN = r"[^,()]*\(([^()]*,[^()]*\d[^()]*)\)"
+# 그 밖의 괄호는 '(또는 꿀)', '(기호에맞게 가감)' 같은 설명이라 지움
+NOTE_PATTERN = r"\([^()]*\)?|\)"
+
+_NUMBER = r"\d[\d./~+½⅓⅔¼¾]*|[½⅓⅔¼¾]"
+ITEM_PATTERN = (
+    rf"^(?P<재료>.+?)\s*(?:(?P<수량>{_NUMBER})\s*(?P<단위>[^\s\d]*)"
+    r"|(?P<어림>약간|적당량|조금|살짝|몇방울|한꼬집))?$"
+)
+# '250ml 뜨거운물'처럼 수량이 앞에 오는 경우
+LEADING_PATTERN = rf"^(?P<수량>{_NUMBER})\s*(?P<단위>[^\s\d]*)\s+(?P<재료>\D.*)$"
+FRACTIONS = {"½": "0.5", "⅓": "0.333", "⅔": "0.667", "¼": "0.25", "¾": "0.75"}
+
+# 같은 재료의 다른 표기는 하나로 합침 (공백을 뺀 이름 기준)
+ALIASES = {
+    "달걀": "계란", "달걀흰자": "흰자", "계란흰자": "흰자", "달걀노른자": "노른자", "계란노른자": "노른자",
+    "녹차파우더": "녹차가루", "가루녹차": "녹차가루", "녹차분말": "녹차가루", "녹차분말가루": "녹차가루",
+    "말차가루": "녹차가루", "말차파우더": "녹차가루", "녹차가루(말차)": "녹차가루",
+    "슈가파우더": "슈거파우더", "아몬드분말": "아몬드가루", "무염버터": "버터", "박력밀가루": "박력분",
+}
+
+
+# TEA.csv 열 (헤더 공백은 검사 전에 뗌). 모든 행이 같은 기준일자는 범주형으로 한 벌만
+SCHEMA = Schema(
+    dtype={"요리명": str, "주재료": str, "부재료": str, "조리법": str, "상세설명": str,
+           "데이터기준일자": "category"},
+    required=("요리명", "주재료"),
+)
+
+
+def prepare(df):
+    """요리명·재료 문자열 공백 정리, 결측 재료는 빈 문자열로 — 로딩할 때 한 번만."""
+    df["요리명"] = df["요리명"].str.strip()
+    for role in ROLES:
+        df[role] = df[role].fillna("").str.strip()
+    return df
+
+
+def _quantity_value(text):
+    """'110', '1/4', '1.5' 같은 수량을 숫자로 ('4~5', '3+½'처럼 애매하면 NaN)."""
+    for symbol, value in FRACTIONS.items():
+        text = text.str.replace(symbol, value, regex=False)
+    value = pd.to_numeric(text, errors="coerce")
+    fraction = text.str.extract(r"^(\d+)/(\d+)$").astype(float)
+    return value.fillna(fraction[0] / fraction[1])
+
+
+def _parse_items(text):
+    """재료 하나씩의 문자열 → (재료, 수량, 수량값, 단위, 키) 표."""
+    found = text.str.extract(ITEM_PATTERN)
+    leading = text.str.extract(LEADING_PATTERN)
+    front = found["수량"].isna() & found["어림"].isna() & leading["재료"].notna()
+    found.loc[front, ["재료", "수량", "단위"]] = leading.loc[front, ["재료", "수량", "단위"]]
+    found["단위"] = found["단위"].where(found["수량"].notna(), found["어림"])
+    parsed = pd.DataFrame({
+        "재료": found["재료"].str.strip(),
+        "수량": found["수량"],
+        "수량값": _quantity_value(found["수량"].fillna("")),
+        "단위": found["단위"].fillna(""),
+    })
+    key = parsed["재료"].str.replace(r"\s+", "", regex=True)
+    parsed["키"] = key.map(ALIASES).fillna(key)
+    return parsed
+
+
+def parse_ingredients(df):
+    """주재료/부재료 문자열을 (레시피, 구분, 재료, 수량, 단위, 키) 긴 표로 푼다 (벡터화).
+
+    같은 재료 문자열('설탕 50g' 등)은 레시피마다 반복되므로 서로 다른 문자열만 한 번씩 해석한다.
+    """
+    parts = []
+    for role in ROLES:
+        text = (
+            df[role]
+            .str.replace(GROUP_PATTERN, r",\1,", regex=True)
+            .str.replace(NOTE_PATTERN, "", regex=True)
+            .str.split(SPLIT_PATTERN, regex=True)
+            .explode()
+            .str.replace(LABEL_PATTERN, "", regex=True)
+            .str.strip()
+        )
+        text = text[text.fillna("").str.len() > 0]
+        parts.append(pd.DataFrame({"레시피": text.index, "구분": role, "원문": text.to_numpy()}))
+    items = pd.concat(parts, ignore_index=True)
+
+    codes, uniques = pd.factorize(items["원문"])
+    parsed = _parse_items(pd.Series(uniques)).iloc[codes].reset_index(drop=True)
+    long = pd.concat([
+        pd.DataFrame({"레시피": df.index.get_indexer(items["레시피"]), "구분": items["구분"]}),
+        parsed,
+    ], axis=1)
+    long = long[long["키"].str.len() > 0]
+    # 레시피 순서로 모아 두어 한 레시피의 재료를 구간 하나로 꺼낼 수 있게 함
+    return long.sort_values("레시피", kind="stable").reset_index(drop=True)
+
+
+class RecipeIndex:
+    """재료 → 레시피 번호 역색인과 그 위의 집합 질의."""
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.names = df["요리명"].to_numpy()
+        self.long = parse_ingredients(df)
+        self._starts = np.searchsorted(self.long["레시피"].to_numpy(), np.arange(self.n + 1))
+        # 구분별(전체/주재료) 재료 → 레시피 번호 (중복 없는 오름차순 배열)와 레시피별 재료 수
+        self.postings = {}
+        self.sizes = {}
+        for scope, rows in [("전체", self.long), ("주재료", self.long[self.long["구분"] == "주재료"])]:
+            pairs = rows[["키", "레시피"]].drop_duplicates()
+            self.postings[scope] = {
+                key: np.sort(group.to_numpy()) for key, group in pairs.groupby("키")["레시피"]
+            }
+            self.sizes[scope] = np.bincount(pairs["레시피"].to_numpy(), minlength=self.n)
+        counts = self.long.drop_duplicates(["키", "레시피"])["키"].value_counts()
+        # 많이 쓰이는 재료부터 (같은 빈도는 이름순)
+        self.ingredients = sorted(counts.index, key=lambda key: (-counts[key], key))
+
+    def _rows(self, key, scope="전체"):
+        return self.postings[scope].get(key, np.array([], dtype=np.int64))
+
+    def containing(self, include=(), exclude=()):
+        """`include` 재료를 모두 쓰고 `exclude` 재료는 하나도 안 쓰는 레시피 번호."""
+        if include:
+            # 짧은 목록부터 교집합을 구하면 중간 결과가 빨리 줄어듦
+            lists = sorted((self._rows(key) for key in include), key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                rows = np.intersect1d(rows, other, assume_unique=True)
+        else:
+            rows = np.arange(self.n)
+        if exclude:
+            banned = np.unique(np.concatenate([self._rows(key) for key in exclude]))
+            rows = np.setdiff1d(rows, banned, assume_unique=True)
+        return rows
+
+    def makeable(self, available, scope="전체", missing=0):
+        """가진 재료(`available`)만으로 만들 수 있는 레시피 번호와 부족한 재료 수.
+
+        `scope`가 '주재료'면 주재료만 갖춰도 되고, `missing`개까지는 없어도 허용한다.
+        """
+        lists = [self._rows(key, scope) for key in set(available)]
+        hits = np.bincount(np.concatenate(lists), minlength=self.n) if lists else np.zeros(self.n, dtype=np.int64)
+        lacking = self.sizes[scope] - hits
+        rows = np.flatnonzero((lacking <= missing) & (self.sizes[scope] > 0) & (hits > 0))
+        rows = rows[np.argsort(lacking[rows], kind="stable")]
+        return rows, lacking[rows]
+
+    def ingredients_of(self, row):
+        """한 레시피의 재료 표 (구분, 재료, 수량, 단위)."""
+        table = self.long.iloc[self._starts[row]:self._starts[row + 1]]
+        return table[["구분", "재료", "수량", "단위"]].fillna("").reset_index(drop=True)
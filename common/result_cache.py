@@ -0,0 +1,100 @@
+"""세션끼리 공유하는 프로세스 전역 결과 캐시 (크기 제한 LRU).
+
+st.cache_data는 호출마다 결과를 복사(pickle)해 돌려주므로, 수업처럼 여러 명이
+같은 날짜·호선을 동시에 누르는 경우를 위해 완성된 그림 JSON과 표를 그대로
+공유한다. 같은 키를 동시에 요청하면 한 번만 계산하고 나머지는 그 결과를 기다린다.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기(바이트)."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 64
+
+
+class ResultCache:
+    def __init__(self, max_entries=512, max_bytes=64 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # key -> (value, size)
+        self._inflight = {}  # key -> threading.Event (계산 중인 키)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """`key`의 결과와 적중 여부 `(값, hit)`를 돌려주고, 없으면 `compute()`로 한 번만 계산해 넣는다.
+
+        다른 세션이 계산하던 것을 기다려 받은 경우도 적중으로 본다 (이 세션은 계산하지 않음).
+        """
+        while True:
+            with self._lock:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return self._items[key][0], True
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # 다른 세션이 같은 키를 계산 중 → 끝나면 다시 조회
+            event.wait()
+
+        try:
+            value = compute()
+        except BaseException:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+            raise
+
+        size = estimate_size(value)
+        with self._lock:
+            if size <= self.max_bytes:
+                self._items[key] = (value, size)
+                self.bytes += size
+                self._evict()
+            del self._inflight[key]
+        event.set()
+        return value, False
+
+    def _evict(self):
+        while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, size) = self._items.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 모듈은 프로세스당 한 번만 import되므로 모든 세션이 이 인스턴스를 함께 쓴다
+RESULTS = ResultCache()
@@ -0,0 +1,125 @@
+"""분포 벡터(예: 국가별 MBTI 16유형 비율) 사이의 최근접 이웃 검색.
+
+행 수가 적으면(국가 단위) 거리 행렬을 지표별로 한 번에 계산해 두고, 질의는
+행 하나에서 k개를 고르는 것으로 끝낸다. 지역·도시처럼 수만 행이 되면 n×n
+행렬 대신 근사 색인(IVF: 대표점으로 나눈 칸 몇 개만 뒤지기)을 쓴다.
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = {
+    "cosine": "코사인",
+    "jensenshannon": "젠슨-섀넌",
+    "euclidean": "유클리드",
+}
+EXACT_LIMIT = 5000
+_BLOCK_ELEMS = 1 << 22  # 젠슨-섀넌 블록 계산 시 한 번에 만드는 원소 수 상한
+
+
+def _normalize_rows(X):
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.where(norms == 0, 1, norms)
+
+
+def _as_distribution(X):
+    sums = X.sum(axis=1, keepdims=True)
+    return X / np.where(sums == 0, 1, sums)
+
+
+def _js(P, Q):
+    """P(a×d)의 각 행과 Q(b×d)의 각 행 사이 젠슨-섀넌 거리 (a×b, 자연로그)."""
+    M = (P[:, None, :] + Q[None, :, :]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kl_p = np.where(P[:, None, :] > 0, P[:, None, :] * np.log(P[:, None, :] / M), 0).sum(-1)
+        kl_q = np.where(Q[None, :, :] > 0, Q[None, :, :] * np.log(Q[None, :, :] / M), 0).sum(-1)
+    return np.sqrt(np.maximum((kl_p + kl_q) / 2, 0))
+
+
+def cross_distances(A, B, metric):
+    """A의 각 행과 B의 각 행 사이 거리 행렬 (벡터화, 큰 입력은 행 블록 단위)."""
+    if metric == "euclidean":
+        sq = (A ** 2).sum(1)[:, None] + (B ** 2).sum(1)[None, :] - 2 * A @ B.T
+        return np.sqrt(np.maximum(sq, 0))
+    if metric == "cosine":
+        return np.maximum(1 - _normalize_rows(A) @ _normalize_rows(B).T, 0)
+    if metric == "jensenshannon":
+        P, Q = _as_distribution(A), _as_distribution(B)
+        block = max(1, _BLOCK_ELEMS // max(1, Q.shape[0] * Q.shape[1]))
+        return np.vstack([_js(P[i:i + block], Q) for i in range(0, len(P), block)])
+    raise ValueError(f"알 수 없는 거리 지표입니다: {metric}")
+
+
+def _embed(X, metric):
+    # 근사 색인용 유클리드 공간: 코사인은 정규화, 젠슨-섀넌은 sqrt(p)(헬링거)로 근사
+    if metric == "cosine":
+        return _normalize_rows(X)
+    if metric == "jensenshannon":
+        return np.sqrt(_as_distribution(X))
+    return X
+
+
+class IVFIndex:
+    """k-평균 대표점으로 공간을 칸으로 나누고, 질의 근처 `nprobe`개 칸만 정확히 비교한다."""
+
+    def __init__(self, X, metric, n_lists=None, n_iter=10, nprobe=16, seed=0):
+        self.X = X
+        self.metric = metric
+        self.nprobe = nprobe
+        Z = _embed(X, metric)
+        n_lists = n_lists or max(1, int(np.sqrt(len(X))))
+        rng = np.random.default_rng(seed)
+        # 대표점 학습은 표본으로만 하고, 전체 행은 마지막에 한 번만 배정
+        sample = Z[rng.choice(len(Z), min(len(Z), 64 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(n_iter):
+            assign = cross_distances(sample, centroids, "euclidean").argmin(1)
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = np.column_stack(
+                [np.bincount(assign, weights=sample[:, j], minlength=n_lists) for j in range(Z.shape[1])]
+            )
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        assign = cross_distances(Z, centroids, "euclidean").argmin(1)
+        self.centroids = centroids
+        self.members = [np.flatnonzero(assign == c) for c in range(n_lists)]
+        self._Z = Z
+
+    def query(self, i, k):
+        near = cross_distances(self._Z[i:i + 1], self.centroids, "euclidean")[0]
+        probe = np.argsort(near)[:self.nprobe]
+        candidates = np.concatenate([self.members[c] for c in probe])
+        candidates = candidates[candidates != i]
+        dist = cross_distances(self.X[i:i + 1], self.X[candidates], self.metric)[0]
+        best = np.argsort(dist, kind="stable")[:k]
+        return candidates[best], dist[best]
+
+
+class SimilarityIndex:
+    """이름이 붙은 분포 벡터들의 k-최근접 이웃 검색기.
+
+    `approximate`가 None이면 행 수가 EXACT_LIMIT를 넘을 때만 근사 색인을 쓴다.
+    """
+
+    def __init__(self, names, X, approximate=None):
+        self.names = np.asarray(names)
+        self.X = np.asarray(X, dtype=float)
+        self._row = {name: i for i, name in enumerate(self.names)}
+        self.approximate = len(self.X) > EXACT_LIMIT if approximate is None else approximate
+        if self.approximate:
+            self._ivf = {metric: IVFIndex(self.X, metric) for metric in METRICS}
+        else:
+            self.distances = {metric: cross_distances(self.X, self.X, metric) for metric in METRICS}
+
+    def nearest(self, name, k=5, metric="cosine"):
+        """`name`과 가장 가까운 `k`개 (자기 자신 제외), 거리 오름차순."""
+        i = self._row[name]
+        if self.approximate:
+            rows, dist = self._ivf[metric].query(i, k)
+        else:
+            row = self.distances[metric][i].copy()
+            row[i] = np.inf
+            k = min(k, len(row) - 1)
+            rows = np.argpartition(row, k - 1)[:k] if k > 0 else np.array([], dtype=int)
+            rows = rows[np.argsort(row[rows], kind="stable")]
+            dist = row[rows]
+        return pd.DataFrame({"이름": self.names[rows], "거리": dist})
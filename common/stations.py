@@ -0,0 +1,138 @@
+"""역명 정규화와 노선을 가로지르는 역 단위 색인.
+
+damn.csv의 역명은 노선마다 따로 적혀 있고('총신대입구(이수)' / '이수'), 환승역은
+노선 수만큼 행이 나뉜다. 역명 변형을 역 ID 하나로 모으는 표를 한 번 만들어 두면,
+역 단위 합계는 정수 코드로 모아 더하기만 하면 된다. 역 검색은 미리 만든 정렬 키
+(접두어 이분 탐색)와 글자 n-gram 역색인으로 처리해 입력마다 모든 이름을 훑지 않는다.
+"""
+import bisect
+import re
+from collections import Counter
+
+import numpy as np
+
+from common.cache import hash_bytes
+
+# 같은 역인데 노선마다 다르게 적힌 이름 (괄호를 뗀 이름 → 대표 이름)
+ALIASES = {"총신대입구": "이수"}
+# 이름은 같지만 서로 다른 역 ((괄호를 뗀 이름, 노선) → 따로 쓸 이름)
+HOMONYMS = {("양평", "중앙선"): "양평(중앙선)", ("신촌", "경의선"): "신촌(경의선)"}
+
+_PAREN = re.compile(r"\(([^()]*)\)")
+_NOT_WORD = re.compile(r"[\W_]+")
+
+
+def base_name(name):
+    """'총신대입구(이수)' → '총신대입구' (괄호 속 부역명을 뗀 이름)."""
+    return _PAREN.sub("", name).strip()
+
+
+def search_key(text):
+    """검색용 키: 공백·기호를 빼고 소문자로, 끝의 '역'은 뗌 ('서울역' → '서울')."""
+    key = _NOT_WORD.sub("", text).lower()
+    return key[:-1] if key.endswith("역") and len(key) > 2 else key
+
+
+def _grams(key):
+    return {key[i:i + 2] for i in range(len(key) - 1)} | set(key)
+
+
+class StationIndex:
+    """역명 변형 → 역 ID 표와 역 검색 색인.
+
+    `pairs`는 (역명, 노선명) 쌍을 담은 표. 역 ID는 대표 이름의 가나다순 위치다.
+    """
+
+    def __init__(self, pairs):
+        pairs = pairs[["역명", "노선명"]].astype(str).drop_duplicates()
+        keys = [self.station_key(name, line) for name, line in zip(pairs["역명"], pairs["노선명"])]
+        self.keys = sorted(set(keys))
+        self._ids = {key: i for i, key in enumerate(self.keys)}
+
+        # 역마다 보여 줄 이름(가장 긴 변형 = 부역명까지 적힌 이름), 노선 목록, 검색어 후보
+        self.labels = list(self.keys)
+        self.lines = [[] for _ in self.keys]
+        terms = [set() for _ in self.keys]
+        for (name, line), key in zip(zip(pairs["역명"], pairs["노선명"]), keys):
+            i = self._ids[key]
+            if len(name) > len(self.labels[i]):
+                self.labels[i] = name
+            self.lines[i].append(line)
+            terms[i].update([name, key, *_PAREN.findall(name)])
+        self.lines = [sorted(set(lines)) for lines in self.lines]
+        # 보여 줄 이름이 겹치면(드묾) 대표 이름으로 구분
+        counts = Counter(self.labels)
+        self.labels = [label if counts[label] == 1 else key for label, key in zip(self.labels, self.keys)]
+        # 역 ID·이름·노선 목록이 그대로인지 알아보는 지문 (이 ID로 만든 순위 색인이 다시 만들지 판단)
+        rows = ("\t".join([key, label, *lines]) for key, label, lines in zip(self.keys, self.labels, self.lines))
+        self.version = hash_bytes("\n".join(rows).encode())
+
+        # 접두어 검색: (검색 키, 역 ID)를 정렬해 두고 이분 탐색
+        self._prefix = sorted({(search_key(t), i) for i, ts in enumerate(terms) for t in ts if search_key(t)})
+        self._prefix_keys = [k for k, _ in self._prefix]
+        # 부분 일치·오타 검색: 글자 1·2-gram → 역 ID 목록
+        self._terms = [{search_key(t) for t in ts} for ts in terms]
+        self._grams = {}
+        for i, ts in enumerate(self._terms):
+            for gram in set().union(*(_grams(t) for t in ts)):
+                self._grams.setdefault(gram, []).append(i)
+
+    @staticmethod
+    def station_key(name, line):
+        base = base_name(name)
+        return HOMONYMS.get((base, line)) or ALIASES.get(base, base)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def station_ids(self, names, lines):
+        """범주형 역명·노선명 열 → 행마다 역 ID (모르는 역은 -1).
+
+        범주 수만큼만 사전을 조회하고, 동음이역만 노선까지 보고 고친다.
+        """
+        by_name = np.array([self._ids.get(self.station_key(c, None), -1) for c in names.cat.categories])
+        ids = by_name[names.cat.codes.to_numpy()] if len(by_name) else np.full(len(names), -1)
+        for (base, line), key in HOMONYMS.items():
+            codes = [c for c, name in enumerate(names.cat.categories) if base_name(name) == base]
+            if codes:
+                mask = np.isin(names.cat.codes.to_numpy(), codes) & (lines.to_numpy() == line)
+                ids = np.where(mask, self._ids.get(key, -1), ids)
+        return ids
+
+    def search(self, query, limit=10):
+        """역 ID 목록: 접두어 일치 → 부분 일치 → (둘 다 없으면) 비슷한 이름 순.
+
+        끝에 '역'을 붙인 검색어('서울역')는 이름이 정확히 같은 역이 있으면 그 역만 돌려준다.
+
+        부분 일치와 비슷한 이름은 n-gram 역색인에서 후보만 모아 확인한다.
+        """
+        key = search_key(query)
+        if not key:
+            return []
+        found = []
+        start = bisect.bisect_left(self._prefix_keys, key)
+        stop = bisect.bisect_left(self._prefix_keys, key + "\uffff")
+        if key != _NOT_WORD.sub("", query).lower():
+            # '서울역'처럼 끝에 '역'을 붙여 찾았으면 이름이 정확히 같은 역만 ('서울대입구' 같은 접두어 일치는 뺌)
+            exact = [i for k, i in self._prefix[start:stop] if k == key]
+            if exact:
+                return exact[:limit]
+        for _, i in self._prefix[start:stop]:
+            if i not in found:
+                found.append(i)
+
+        grams = _grams(key)
+        postings = [self._grams.get(g, []) for g in grams]
+        if all(postings):
+            candidates = set.intersection(*map(set, postings))
+            found += sorted(i for i in candidates if i not in found and any(key in t for t in self._terms[i]))
+        if not found:
+            # 오타: n-gram이 많이 겹치는 후보 50개만 이름마다 Dice 계수로 비교 (0.5 이상)
+            overlap = Counter(i for posting in postings for i in posting)
+            scored = []
+            for i, _ in overlap.most_common(50):
+                score = max(2 * len(grams & _grams(t)) / (len(grams) + len(_grams(t))) for t in self._terms[i])
+                if score >= 0.5:
+                    scored.append((-score, self.keys[i], i))
+            found = [i for _, _, i in sorted(scored)]
+        return found[:limit]
@@ -0,0 +1,196 @@
+"""서울 지하철 역별 승하차(damn.csv) 검사 규칙과 순위 색인 (읽기는 common/ingest.py의 월 파티션 저장소)."""
+import numpy as np
+import pandas as pd
+
+from common.cache import ROOT
+from common.validation import Schema, check
+
+DEFAULT_PATH = ROOT / "damn.csv"
+COUNT_COLS = ["승차총승객수", "하차총승객수"]
+
+# 원본 CSV 검사: 날짜 형식, 음수·숫자 아닌 승하차 수, 같은 (날짜, 노선, 역)이 두 번 나온 행을 격리
+SCHEMA = Schema(
+    dtype={"사용일자": "datetime64[us]", "노선명": "category", "역명": "category",
+           **{col: "int32" for col in COUNT_COLS}},
+    dates={"사용일자": "%Y%m%d"},
+    required=("노선명", "역명"),
+    ranges={col: (0, None) for col in COUNT_COLS},
+    key=("사용일자", "노선명", "역명"),
+)
+
+
+def read_checked(source, name, append=False, **kwargs):
+    """원본 CSV(또는 그 일부)를 글자 그대로 읽어 검사하고 통과한 행만 돌려준다."""
+    return check(pd.read_csv(source, dtype=str, **kwargs), SCHEMA, name, append)
+
+
+def normalize(df):
+    """수집해 둔(이미 검사한) 표의 노선명/역명을 이름순 범주형으로 — 형 변환·결측 처리는 수집할 때 끝남."""
+    for col in ["노선명", "역명"]:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # 맵한 파티션 하나를 잘라 읽은 경우: 범주는 이미 이름순이고, 이 기간에 안 나온 값만 뺌
+            df[col] = df[col].cat.remove_unused_categories()
+        else:
+            df[col] = df[col].astype("category")
+    return df
+
+
+class StationRanking:
+    """(사용일자, 노선명)별로 역을 총승하차 순으로 미리 정렬해 둔 색인.
+
+    로딩할 때 한 번만 정렬해 두면, 날짜·호선을 바꿀 때마다 전체를 거르고
+    정렬할 필요 없이 해당 구간을 잘라 오기만 하면 된다 (O(k)).
+    역 색인(`stations`)을 주면 환승역을 노선 구분 없이 합친 날짜별 역 순위도 만든다.
+
+    날짜는 첫날(`start`)부터의 일수(int16)로 들고 있다가 잘라 돌려줄 때만 날짜로 되돌린다.
+    """
+
+    def __init__(self, df, stations=None):
+        ranked = df.assign(총승하차=df["승차총승객수"] + df["하차총승객수"])
+        ranked = ranked.sort_values(
+            ["사용일자", "노선명", "총승하차"], ascending=[True, True, False], kind="stable"
+        ).reset_index(drop=True)
+        self.start = ranked["사용일자"].min() if len(ranked) else pd.Timestamp(0)
+        ranked["사용일자"] = ((ranked["사용일자"] - self.start) // pd.Timedelta(days=1)).astype("int16")
+
+        # (날짜, 노선)이 바뀌는 지점이 각 그룹의 시작 위치
+        dates = ranked["사용일자"].to_numpy()
+        codes = ranked["노선명"].cat.codes.to_numpy()
+        changed = (dates[1:] != dates[:-1]) | (codes[1:] != codes[:-1])
+        starts = np.flatnonzero(np.r_[True, changed]) if len(ranked) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(ranked)]
+
+        # 전체 역 보기용: 날짜별로 노선 구분 없이 총승하차 내림차순인 행 순서 (lexsort는 마지막 키가 우선)
+        totals = ranked["총승하차"].to_numpy()
+        self._network = np.lexsort((-totals, dates))
+        network_dates = dates[self._network]
+        day_starts = np.flatnonzero(np.r_[True, network_dates[1:] != network_dates[:-1]]) if len(ranked) else starts
+        day_stops = np.r_[day_starts[1:], len(ranked)]
+        self._days = {
+            int(day): (int(start), int(stop))
+            for day, start, stop in zip(network_dates[day_starts], day_starts, day_stops)
+        }
+
+        self.frame = ranked
+        self._spans = {}
+        self._lines = {}
+        keys = zip(ranked["사용일자"].iloc[starts], ranked["노선명"].iloc[starts].astype(str))
+        for (day, line), start, stop in zip(keys, starts, stops):
+            self._spans[(int(day), line)] = (int(start), int(stop))
+            # 노선명 범주는 이름순이므로 날짜별 노선 목록도 이미 정렬되어 있음
+            self._lines.setdefault(int(day), []).append(line)
+
+        self.stations = None
+        self._station_days = {}
+        self.station_version = None  # 역 ID를 매길 때 쓴 역 색인의 지문
+        if stations is not None:
+            self._roll_up(ranked, stations)
+
+    def _roll_up(self, ranked, stations):
+        """(날짜, 역 ID)별로 모든 노선의 승하차를 더하고 날짜마다 총승하차 순으로 정렬해 둔다."""
+        ids = stations.station_ids(ranked["역명"], ranked["노선명"])
+        known = ids >= 0
+        day_codes, days = pd.factorize(ranked["사용일자"])
+        n = len(stations)
+        flat = day_codes[known] * n + ids[known]
+        size = len(days) * n
+        # 역 하나의 하루 승하차는 노선을 다 더해도 int32에 넉넉히 들어감
+        sums = {
+            col: np.bincount(flat, weights=ranked[col].to_numpy()[known], minlength=size).astype("int32")
+            for col in COUNT_COLS
+        }
+        cells = np.flatnonzero(np.bincount(flat, minlength=size))
+        station_ids = cells % n
+        table = pd.DataFrame({
+            "사용일자": days[cells // n].astype("int16"),
+            "역ID": station_ids.astype("int16" if n <= np.iinfo(np.int16).max else "int32"),
+            "역명": pd.Categorical.from_codes(station_ids, categories=stations.labels),
+            # 역이 지나는 노선들 ('2호선·3호선') — 역 색인에 모은 모든 달 기준
+            "노선": pd.Categorical(np.array(["·".join(lines) for lines in stations.lines], dtype=object)[station_ids]),
+            **{col: sums[col][cells] for col in COUNT_COLS},
+        })
+        table["총승하차"] = table["승차총승객수"] + table["하차총승객수"]
+        table = table.sort_values(["사용일자", "총승하차"], ascending=[True, False], kind="stable")
+        table = table.reset_index(drop=True)
+        table["순위"] = (table.groupby("사용일자").cumcount() + 1).astype("int16")
+
+        dates = table["사용일자"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(table) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(table)]
+        self.stations = table
+        self.station_version = stations.version
+        self._station_days = {
+            int(day): (int(start), int(stop)) for day, start, stop in zip(dates[starts], starts, stops)
+        }
+
+    def _day(self, date):
+        return (pd.Timestamp(date) - self.start).days
+
+    def _with_dates(self, rows):
+        """잘라 낸 행의 일수를 다시 날짜로 (돌려주는 몇 행만 바꿈)."""
+        rows = rows.reset_index(drop=True)
+        rows["사용일자"] = self.start + pd.to_timedelta(rows["사용일자"].to_numpy(), unit="D")
+        return rows
+
+    def dates(self):
+        return [self.start + pd.Timedelta(days=day) for day in self._lines]
+
+    def lines(self, date):
+        return self._lines.get(self._day(date), [])
+
+    def top(self, date, line, n=10):
+        """해당 날짜·노선의 총승하차 상위 `n`개 역 (이미 정렬된 구간을 잘라 옴)."""
+        span = self._spans.get((self._day(date), line))
+        if span is None:
+            return self._with_dates(self.frame.iloc[0:0])
+        start, stop = span
+        return self._with_dates(self.frame.iloc[start:min(stop, start + n)])
+
+    def network(self, date):
+        """해당 날짜의 모든 노선·역을 총승하차 내림차순으로 (노선 구분 없이 미리 정렬된 순서)."""
+        span = self._days.get(self._day(date))
+        if span is None:
+            return self._with_dates(self.frame.iloc[0:0])
+        start, stop = span
+        return self._with_dates(self.frame.iloc[self._network[start:stop]])
+
+    def top_stations(self, date, n=10):
+        """해당 날짜의 환승역 합산 총승하차 상위 `n`개 역 (노선 구분 없이)."""
+        span = self._station_days.get(self._day(date))
+        if span is None:
+            return self._with_dates(self.stations.iloc[0:0])
+        start, stop = span
+        return self._with_dates(self.stations.iloc[start:min(stop, start + n)])
+
+    def station_rows(self, date, station_ids):
+        """해당 날짜에서 고른 역들의 합산 승하차와 전체 순위 (`station_ids` 순서대로)."""
+        span = self._station_days.get(self._day(date))
+        if span is None or not len(station_ids):
+            return self._with_dates(self.stations.iloc[0:0])
+        day = self.stations.iloc[span[0]:span[1]]
+        rows = day[day["역ID"].isin(station_ids)]
+        order = rows["역ID"].map({sid: i for i, sid in enumerate(station_ids)}).to_numpy()
+        return self._with_dates(rows.iloc[np.argsort(order, kind="stable")])
+
+
+def downsample(values, max_points):
+    """내림차순으로 정렬된 `values`에서 곡선 모양을 유지하며 남길 위치를 고른다.
+
+    구간을 max_points/2개로 나눠 각 구간의 첫 점(최댓값)과 끝 점(최솟값)만 남긴다.
+    정렬된 곡선이므로 빠지는 점은 모두 남은 두 점 사이에 놓인다.
+    """
+    n = len(values)
+    if not max_points or n <= max_points:
+        return np.arange(n)
+    edges = np.linspace(0, n, max(max_points // 2, 1) + 1).astype(int)
+    return np.unique(np.r_[edges[:-1], edges[1:] - 1])
+
+
+def histogram(values, bins=30):
+    """총승하차 분포를 로그 간격 구간으로 센다 → (구간 왼쪽 끝, 오른쪽 끝, 역 수)."""
+    values = np.clip(np.asarray(values), 1, None)
+    if len(values) == 0:
+        return np.array([]), np.array([]), np.array([], dtype=int)
+    edges = np.geomspace(values.min(), max(values.max(), values.min() + 1), bins + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    return edges[:-1], edges[1:], counts
@@ -0,0 +1,55 @@
+"""역·노선별 승하차 시계열 집계 (7일 이동평균, 평일/주말, 전일 대비).
+
+날짜 × 대상(역 또는 노선) 행렬을 한 번에 만들고 rolling/diff도 행렬 전체에
+벡터 연산으로 적용한다. 특정 역·노선을 고르는 것은 열 하나를 꺼내는 일이다.
+"""
+import pandas as pd
+
+from common.subway import COUNT_COLS
+
+WINDOW = 7
+
+
+def daily_matrix(df, by):
+    """(날짜 × `by`) 합계 행렬. 열은 (승하차 컬럼, 대상) MultiIndex.
+
+    기록이 없는 칸(빠진 날, 그 기간에 없던 역)은 0이 아니라 NaN으로 둔다. 0으로 채우면
+    이동평균이 끌려 내려가고 빈 날 앞뒤로 ±100% 같은 가짜 전일 대비가 생긴다.
+    """
+    grouped = df.groupby(["사용일자", by], observed=True)[COUNT_COLS].sum()
+    wide = grouped.unstack(by).astype("float64")
+    if wide.empty:
+        return wide
+    days = pd.date_range(wide.index.min(), wide.index.max(), freq="D", name="사용일자")
+    return wide.reindex(days)
+
+
+class RidershipSeries:
+    """모든 역(또는 노선)의 일별 승하차와 파생 지표를 미리 계산해 둔 묶음."""
+
+    def __init__(self, df, by="역명", window=WINDOW):
+        self.by = by
+        self.counts = daily_matrix(df, by)
+        # rolling은 창 안의 NaN을 빼고 평균, diff는 앞뒤 중 하나라도 빈 날이면 NaN
+        self.rolling = self.counts.rolling(window, min_periods=1).mean()
+        self.delta = self.counts.diff()
+
+    def names(self):
+        if self.counts.empty:
+            return []
+        return sorted(self.counts.columns.get_level_values(1).unique())
+
+    def series(self, name, start=None, end=None):
+        """한 대상의 일별 표 (승차·하차, 7일 평균, 전일 대비, 주말 여부)."""
+        cols = [(col, name) for col in COUNT_COLS]
+        out = self.counts[cols].droplevel(1, axis=1)
+        out = out.join(self.rolling[cols].droplevel(1, axis=1).add_suffix("_7일평균"))
+        out = out.join(self.delta[cols].droplevel(1, axis=1).add_suffix("_전일대비"))
+        out["주말"] = out.index.dayofweek >= 5
+        return out.loc[start:end]
+
+    def weekday_split(self, name, start=None, end=None):
+        """평일/주말 평균 승하차 (기록이 있는 날만 평균)."""
+        table = self.series(name, start, end)
+        split = table.groupby("주말")[COUNT_COLS].mean()
+        return split.rename(index={False: "평일", True: "주말"})
@@ -0,0 +1,166 @@
+"""CSV를 읽을 때 한 번만 도는 스키마·데이터 품질 검사와 격리(quarantine).
+
+열 이름·타입, 값 범위, 키 중복, 행 합계(MBTI 비율의 합 ≈ 1)를 열 단위 벡터 연산으로
+한꺼번에 확인한다. 걸린 행은 표에서 빼서 원본 글자 그대로 사유와 함께
+.cache/quarantine/<원본이름>.csv 에 남기고, 원본별 요약은 report.json 에 모은다.
+통과한 행만 선언한 타입으로 바꿔 돌려주므로 페이지는 형 변환·결측 처리 없이 쓴다.
+필요한 열이 아예 없는 것처럼 파일 전체가 잘못된 경우는 ValueError로 알린다.
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from common.cache import CACHE_DIR, atomic_write, read_json
+
+QUARANTINE_DIR = CACHE_DIR / "quarantine"
+REPORT_PATH = QUARANTINE_DIR / "report.json"
+SEPARATOR = "; "  # 한 행이 여러 검사에 걸리면 사유를 이어 붙임
+
+_lock = threading.Lock()
+
+
+@dataclass
+class Schema:
+    dtype: dict  # 열 → 통과한 행에 적용할 타입 (이 열들은 파일에 꼭 있어야 함)
+    dates: dict = field(default_factory=dict)  # 날짜 열 → 원본 형식 (예: '%Y%m%d')
+    required: tuple = ()  # 비어 있으면 안 되는 문자열·범주형 열 (숫자·날짜 열은 적지 않아도 필요)
+    nullable: tuple = ()  # 비어 있어도 되는 숫자 열 (빈 칸은 NaN으로 남김)
+    ranges: dict = field(default_factory=dict)  # 열 → (최솟값, 최댓값), None이면 그쪽은 제한 없음
+    key: tuple = None  # 겹치면 안 되는 열 묶음 (None이면 모든 열이 같은 행만 중복)
+    row_sum: tuple = None  # (열 목록, 목표, 허용 오차): 행마다 합이 목표 ± 오차 안이어야 함
+
+
+def _numeric_kind(dtype):
+    """선언한 타입이 정수면 'i'/'u', 실수면 'f', 그 밖(문자열·범주형·날짜)은 None."""
+    try:
+        kind = np.dtype(dtype).kind
+    except TypeError:
+        return None
+    return kind if kind in "iuf" else None
+
+
+def _blank(raw):
+    if pd.api.types.is_string_dtype(raw):
+        return raw.isna() | (raw.str.strip() == "")
+    return raw.isna()
+
+
+def validate(df, schema):
+    """원본 글자 그대로 읽은 표를 검사한다 → (통과한 행을 타입에 맞춘 표, 걸린 행 + '사유' 열).
+
+    중복 키는 다른 검사를 통과한 행끼리만 비교하고, 같은 키면 뒤(나중) 행을 남긴다.
+    """
+    df = df.rename(columns=str.strip)
+    missing = [col for col in schema.dtype if col not in df.columns]
+    if missing:
+        raise ValueError(f"필요한 열이 없습니다: {', '.join(missing)} (있는 열: {', '.join(df.columns)})")
+
+    checks = {}  # 사유 → 걸린 행 (불리언 Series)
+    values = {}
+    for col, dtype in schema.dtype.items():
+        raw = df[col]
+        blank = _blank(raw)
+        kind = _numeric_kind(dtype)
+        if col in schema.dates:
+            values[col] = pd.to_datetime(raw.astype(str), format=schema.dates[col], errors="coerce")
+            checks[f"{col}: 날짜 형식 아님"] = values[col].isna() & ~blank
+        elif kind:
+            values[col] = pd.to_numeric(raw, errors="coerce")
+            checks[f"{col}: 숫자 아님"] = values[col].isna() & ~blank
+            if kind in "iu":
+                checks[f"{col}: 정수 아님"] = values[col].notna() & (values[col] % 1 != 0)
+        else:
+            values[col] = raw
+        # 숫자·날짜 열의 빈 칸은 NaN이 되어 범위 검사도 그냥 지나가므로, nullable로 적지 않았으면 걸러 냄
+        if col in schema.required or col in schema.dates or (kind and col not in schema.nullable):
+            checks[f"{col}: 값 없음"] = blank
+        lo, hi = schema.ranges.get(col, (None, None))
+        if lo is not None:
+            checks[f"{col}: {lo} 미만"] = values[col] < lo
+        if hi is not None:
+            checks[f"{col}: {hi} 초과"] = values[col] > hi
+    if schema.row_sum is not None:
+        cols, target, tolerance = schema.row_sum
+        total = pd.concat([values[col] for col in cols], axis=1).sum(axis=1, min_count=len(cols))
+        # 비었거나 숫자가 아닌 칸이 있는 행은 위에서 이미 걸림
+        checks[f"행 합계가 {target} ± {tolerance} 밖"] = total.notna() & ((total - target).abs() > tolerance)
+
+    bad = np.zeros(len(df), dtype=bool)
+    for mask in checks.values():
+        bad |= mask.to_numpy()
+    keys = pd.DataFrame({col: values.get(col, df[col]) for col in (schema.key or df.columns)})
+    duplicated = np.zeros(len(df), dtype=bool)
+    duplicated[~bad] = keys[~bad].duplicated(keep="last").to_numpy()
+    checks["키 중복 (뒤 행을 남김)"] = pd.Series(duplicated, index=df.index)
+    bad |= duplicated
+
+    # 사유 문자열도 행마다 돌지 않고 검사 단위로 이어 붙임
+    reasons = np.full(len(df), "", dtype=object)
+    for name, mask in checks.items():
+        mask = mask.to_numpy()
+        if mask.any():
+            reasons[mask] = reasons[mask] + name + SEPARATOR
+    rejected = df[bad].assign(사유=[reason[:-len(SEPARATOR)] for reason in reasons[bad]])
+
+    good = df[~bad]
+    typed = {col: values[col][~bad].astype(dtype) for col, dtype in schema.dtype.items()}
+    return good.assign(**typed).reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+def record(name, rejected, rows, append=False):
+    """걸린 행을 <이름>.csv에, 요약(검사한 행, 격리한 행, 사유별 수)을 report.json에 남긴다.
+
+    `append`면 같은 원본에 덧붙은 꼬리의 결과로 보고 앞선 결과에 더한다.
+    """
+    reasons = rejected["사유"].str.split(SEPARATOR).explode().value_counts() if len(rejected) else {}
+    path = QUARANTINE_DIR / f"{name}.csv"
+    try:
+        QUARANTINE_DIR.mkdir(parents=True, exist_ok=True)
+        with _lock:
+            report = read_json(REPORT_PATH) or {}
+            entry = report.get(name) if append else None
+            entry = entry or {"rows": 0, "quarantined": 0, "reasons": {}}
+            entry["rows"] += int(rows)
+            entry["quarantined"] += len(rejected)
+            for reason, count in reasons.items():
+                entry["reasons"][reason] = entry["reasons"].get(reason, 0) + int(count)
+            entry["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            report[name] = entry
+
+            if len(rejected) and append and path.exists():
+                rejected.to_csv(path, mode="a", header=False, index=False)
+            elif len(rejected):
+                atomic_write(path, lambda tmp: rejected.to_csv(tmp, index=False, encoding="utf-8-sig"))
+            elif not append:
+                path.unlink(missing_ok=True)
+            text = json.dumps(report, ensure_ascii=False, indent=1)
+            atomic_write(REPORT_PATH, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    except OSError:
+        pass  # 읽기 전용 배포 환경이면 보고서 없이 진행
+
+
+def check(df, schema, name, append=False):
+    """검사하고 걸린 행을 격리한 뒤 통과한 행만 돌려준다 (`name`은 원본 파일 이름)."""
+    good, rejected = validate(df, schema)
+    record(name, rejected, len(df), append)
+    return good
+
+
+def summary():
+    """원본 이름 → {rows, quarantined, reasons, checked_at} (아직 검사한 적 없으면 빈 dict)."""
+    return read_json(REPORT_PATH) or {}
+
+
+def render_notice(*names):
+    """격리된 행이 있으면 페이지 위에 몇 행을 뺐는지 알린다."""
+    import streamlit as st
+
+    report = summary()
+    count = sum(report.get(name, {}).get("quarantined", 0) for name in names)
+    if count:
+        files = ", ".join(f"{name}.csv" for name in names if report.get(name, {}).get("quarantined"))
+        st.warning(f"⚠️ 형식이 맞지 않는 {count:,}개 행은 빼고 보여 줘요 (.cache/quarantine/ 의 {files} 참고)")
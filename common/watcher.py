@@ -0,0 +1,116 @@
+"""데이터 파일을 지켜보다가 바뀌면 백그라운드에서 캐시를 다시 만드는 감시 스레드.
+
+- 승하차 CSV(damn.csv, ridership/*.csv)는 뒤에 날짜가 덧붙는 파일이라, 늘어난 꼬리만
+  읽어 월 파티션에 조각으로 더하고 그 달의 순위 색인만 다시 만든다.
+- 그 밖의 데이터 파일(altificial.csv, TEA.csv ...)은 통째로 바뀌는 파일이라, 스레드에서
+  새로 읽고 색인까지 만든 뒤 레지스트리에 한 번에 바꿔 끼운다.
+
+세션은 교체가 끝날 때까지 예전 스냅샷을 그대로 쓰므로 다시 읽기를 기다리지 않는다.
+감시 주기는 APP_WATCH_SECONDS(기본 5초, 0이면 스레드를 띄우지 않음)로 정한다.
+"""
+import os
+import threading
+import time
+
+from common import indexes, loader
+from common.catalog import CATALOG_PATH
+from common.ingest import RidershipStore, source_files
+from common.loader import DATASETS
+
+POLL_SECONDS = 5.0
+
+
+def watched_files():
+    """지켜볼 파일 목록: 승하차 수집 대상 + 데이터셋 원본 + 카탈로그 (중복 없이)."""
+    files = dict.fromkeys(source_files())
+    files.update(dict.fromkeys(dataset.path for dataset in DATASETS.values()))
+    files[CATALOG_PATH] = None
+    return list(files)
+
+
+def _stat(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DataWatcher:
+    """파일 크기·수정시각을 주기적으로 비교해(폴링) 바뀐 파일만 다시 읽는다."""
+
+    def __init__(self, store, interval=POLL_SECONDS):
+        self.store = store
+        self.interval = interval
+        self.changes = 0
+        self.last_change = None  # (시각, 바뀐 파일 이름 목록)
+        self.last_error = None
+        self._seen = self._snapshot()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _snapshot(self):
+        return {path: _stat(path) for path in watched_files()}
+
+    def check(self):
+        """한 번 비교해 바뀐 파일을 처리하고, 바뀐 파일 목록을 돌려준다.
+
+        처리 중 오류가 나면 이번 비교 결과를 버려 다음 주기에 다시 시도한다.
+        파일이 사라진 경우는 지금 쓰는 스냅샷을 그대로 둔다.
+        """
+        seen = self._snapshot()
+        changed = [path for path, stat in seen.items() if stat is not None and stat != self._seen.get(path)]
+        if changed:
+            paths = set(changed)
+            if paths & set(source_files()):
+                # 덧붙은 꼬리만 조각으로 더해짐 → 그 달 조각 파일을 원본으로 쓰는 순위 색인만 다시 만듦
+                touched = self.store.ingest()
+                paths.update(part for month in touched for part in self.store.partitions(month))
+            for name, dataset in DATASETS.items():
+                # 아직 아무도 읽지 않은 데이터셋은 처음 읽을 때 새 파일을 보게 되므로 건너뜀
+                if dataset.path in paths and loader.loaded(name):
+                    loader.refresh(name)
+            indexes.refresh(paths)
+            self.changes += 1
+            self.last_change = (time.time(), sorted(path.name for path in changed))
+        self._seen = seen
+        return changed
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+                self.last_error = None
+            except Exception as e:  # 한 번 실패해도 감시는 계속
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="data-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_watcher = None
+_guard = threading.Lock()
+
+
+def start_watcher(interval=None):
+    """프로세스에 하나뿐인 감시기를 (처음 부를 때만) 만들어 돌려준다.
+
+    승하차 수집도 이때 한 번 해 두므로, 페이지는 `start_watcher().store`를 그대로 쓴다.
+    """
+    global _watcher
+    if _watcher is None:
+        with _guard:
+            if _watcher is None:
+                if interval is None:
+                    interval = float(os.environ.get("APP_WATCH_SECONDS", POLL_SECONDS))
+                # 수집 전에 지문을 찍어 두어, 수집 중에 바뀐 파일은 첫 주기에 다시 처리함
+                watcher = DataWatcher(RidershipStore(), interval)
+                watcher.store.ingest()
+                if interval > 0:
+                    watcher.start()
+                _watcher = watcher
+    return _watcher
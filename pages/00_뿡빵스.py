@@ -1,6 +1,11 @@
 import streamlit as st
 
+from common.indexes import get_index
+from common.profiling import profiler
+from common.watcher import start_watcher
+
 st.title("🌈 MBTI 기반 진로 추천 서비스")
+prof = profiler("career_basic")
 st.write("너의 MBTI를 선택하면, 잘 맞는 진로를 추천해줄게! ✨")
 
 mbti_list = [
@@ -13,79 +18,28 @@ mbti_list = [
 # MBTI 선택
 selected = st.selectbox("너의 MBTI 유형을 골라줘 💬", mbti_list)
 
-# MBTI별 추천 데이터
-career_data = {
-    "ENFP": [
-        ("🎨 크리에이티브 디자이너", "시각디자인학과 / 미디어학과", "열정 있고 아이디어가 넘치며 자유로운 분위기를 좋아하는 친구에게 딱!"),
-        ("🧑‍🏫 교육 콘텐츠 기획자", "교육공학 / 심리학과", "사람에게 영감을 주고 소통 좋아하는 스타일에게 잘 맞음!")
-    ],
-    "ENFJ": [
-        ("💡 상담 심리사", "심리학과 / 교육학과", "사람 이야기를 잘 들어주고 공감 능력 높은 친구에게 추천!"),
-        ("🌍 사회공헌 프로젝트 기획자", "사회학 / 국제학", "세상을 더 따뜻하게 만들고 싶어하는 유형에게 찰떡!")
-    ],
-    "ENTP": [
-        ("🚀 스타트업 기획자", "경영학과 / 융합학과", "새로운 걸 만드는 걸 좋아하고 토론 좋아하는 친구라면 완전 잘 맞아!"),
-        ("🎙 크리에이티브 마케터", "광고홍보학과", "아이디어 폭발 + 사람들 주목받는 걸 즐기는 스타일에게 굿!")
-    ],
-    "ENTJ": [
-        ("📊 비즈니스 전략가", "경영학과 / 경제학과", "리더십 강하고 계획 세우는 거 좋아하는 친구에게 딱"),
-        ("⚖️ 공무원 / 행정 직렬", "행정학과", "체계적인 사고 + 현실적인 판단에 강한 스타일!")
-    ],
-    "ESFP": [
-        ("🎤 연예 관련 방송/공연 분야", "연극영화과 / 예술학부", "무대 위에서 빛나는 에너지 넘치는 친구에게 추천!"),
-        ("🧡 유튜브/콘텐츠 크리에이터", "미디어커뮤니케이션학과", "사람들과 소통하고 재밌는 거 좋아하면 찰떡 ✨")
-    ],
-    "ESFJ": [
-        ("👩‍🏫 교사 / 교육자", "교육학과", "사람 돌보는 걸 잘하고 친절한 친구에게 잘 맞아!"),
-        ("🏥 의료 보건 행정", "보건행정학과", "책임감 있고 꼼꼼한 ESFJ의 장점이 빛나 ✨")
-    ],
-    "ESTP": [
-        ("🚓 경찰 / 소방 공무원", "경찰학과 / 소방학과", "액션 + 빠른 판단! 활동적 성격에게 딱"),
-        ("💼 영업 / 마케팅 분야", "경영학과", "사람 만나는 거 좋아하고 에너지 넘치면 최고!")
-    ],
-    "ESTJ": [
-        ("🏢 공기업 / 행정직", "행정학과", "원칙, 계획, 체계적이면 완전 찰떡!"),
-        ("📦 생산/운영 관리", "산업공학과", "조직 관리 잘하고 책임감 강한 ESTJ에게 굿!")
-    ],
-    "INFP": [
-        ("🌿 작가 / 시나리오 작가", "문예창작과", "감성 풍부하고 상상력 있는 INFP에게 딱"),
-        ("💞 상담/치유 관련 직업", "심리학과", "사람 마음 살피는 데 따뜻함이 필요한 직업!")
-    ],
-    "INFJ": [
-        ("🎨 아트 테라피스트", "미술치료학과", "예술 + 치유 감성 combo✨"),
-        ("📚 기획자 / 편집자", "국어국문학과 / 출판학과", "섬세하고 의미 찾는 걸 좋아하는 INFJ에게 최고")
-    ],
-    "INTP": [
-        ("💻 프로그래머 / 개발자", "컴퓨터공학과", "논리 좋아하고 깊게 파고들기 좋아하면 굿!"),
-        ("🔬 연구원 / 분석가", "자연과학계열", "호기심 + 탐구력 MAX 인 친구에게 최적!")
-    ],
-    "INTJ": [
-        ("📐 데이터 전략 기획자", "통계학과 / 산업공학과", "분석 잘하고 장기 계획 잘 세우는 INTJ에게 추천!"),
-        ("🧠 뇌과학/인지과학 연구자", "인지과학 / 생명과학과", "깊이 있게 파는 성향이 강한 너에게 찰떡!")
-    ],
-    "ISFP": [
-        ("🎶 음악 / 미술 예술가", "음악학과 / 미술학과", "감각적이고 섬세한 성격에게 잘 맞아 🎨"),
-        ("🐾 동물 관련 직업", "수의학 / 동물관리학", "따뜻하고 생명 존중 감성이 높은 ISFP에게 추천")
-    ],
-    "ISFJ": [
-        ("🏫 학교 행정 / 교육 보조", "교육행정학과", "조용하지만 책임감 강한 ISFJ에게 딱"),
-        ("💗 간호사 / 요양 관련", "간호학과", "배려심 깊고 안정적인 사람에게 잘 맞아")
-    ],
-    "ISTP": [
-        ("🔧 기계/자동차 엔지니어", "기계공학과", "손으로 직접 만들고 다루는 거 좋아하면 최고!"),
-        ("🎮 게임 개발/UX디자인", "컴퓨터공학/디자인학과", "논리 + 감각 둘 다 있는 ISTP에게 굿")
-    ],
-    "ISTJ": [
-        ("📚 회계 / 재무 관련 직무", "회계학과 / 경영학과", "정확함 + 신중함이 빛나는 분야"),
-        ("🏛 공무원 / 기록 관리", "행정학과 / 기록학", "꾸준하고 체계적인 ISTJ에게 딱!")
-    ]
-}
+# MBTI별 추천 데이터 (mbti_catalog.json — 프로세스당 한 번 읽고 검증, 역색인 포함)
+start_watcher()  # mbti_catalog.json을 고치면 재시작 없이 반영
+with prof.stage("load"):
+    catalog = get_index("catalog")
 
 # 결과 출력
 if selected:
     st.subheader(f"✨ {selected} 유형에게 잘 맞는 진로는...")
-    for career, major, trait in career_data[selected]:
-        st.write(f"**{career}**")
-        st.write(f"- 📘 추천 학과: {major}")
-        st.write(f"- 💡 이런 성격에게 잘 맞아: {trait}")
+    for rec in catalog.types[selected]["recommendations"]:
+        st.write(f"**{rec['career']}**")
+        st.write(f"- 📘 추천 학과: {rec['major']}")
+        st.write(f"- 💡 이런 성격에게 잘 맞아: {rec['trait']}")
         st.write("---")
+
+# 학과로 거꾸로 찾기
+major = st.text_input("🎓 관심 있는 학과로 어울리는 유형 찾기 (예: 컴퓨터공학)")
+if major:
+    with prof.stage("filter"):
+        matches = catalog.types_for("major", major)
+    if matches:
+        st.write(" · ".join(f"**{t}** ({', '.join(labels)})" for t, labels in matches.items()))
+    else:
+        st.info("아직 그 학과는 목록에 없어요 🥲")
+
+prof.finish()
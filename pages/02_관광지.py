@@ -1,48 +1,100 @@
+import streamlit as st
+import plotly.express as px
+import plotly.io as pio
+
+from common.indexes import get_index
+from common.itinerary import time_slots
+from common.loader import revision
+from common.profiling import profiler
+from common.result_cache import RESULTS
+from common.validation import render_notice
+from common.watcher import start_watcher
+
 st.markdown("### 📅 여행 일정 추천 (시간대별)")
+prof = profiler("places")
+
+def load_planner():
+    # 관광지(places.csv) 사이 거리 행렬 — 한 번만 계산해 공용 레지스트리에서 모든 세션이 공유
+    return get_index("places")
+
+start_watcher()  # places.csv가 바뀌면 거리 행렬을 백그라운드에서 다시 계산
 
-days = st.selectbox("여행 일수를 선택하세요:", [1, 2, 3])
+try:
+    with prof.stage("load"):
+        planner = load_planner()
+except FileNotFoundError:
+    st.error("🚨 'places.csv' 파일을 찾을 수 없어요. 루트 폴더에 넣어 주세요!")
+    prof.stop()  # st.stop() 대신 — 멈춘 리런도 측정값을 남김
+except ValueError as e:
+    st.error(f"🚨 'places.csv' 형식이 맞지 않아요: {e}")
+    prof.stop()
+render_notice("places")  # 좌표가 한국 밖이거나 빈 칸이 있는 관광지는 읽을 때 빠짐
 
-# 지역별 묶음 (이동 최소화)
-clusters = [
-    ["Gyeongbokgung Palace (경복궁)", "Bukchon Hanok Village (북촌한옥마을)", "Changdeokgung (창덕궁)", "Insadong (인사동)", "Cheonggyecheon (청계천)"],
-    ["Myeongdong (명동)", "N Seoul Tower (남산 N타워)"],
-    ["DDP (동대문디자인플라자)"],
-    ["Hongdae (홍대)"],
-    ["Lotte World Tower (롯데월드타워)"]
-]
+col1, col2 = st.columns(2)
+with col1:
+    days = st.selectbox("여행 일수를 선택하세요:", [1, 2, 3, 4, 5, 6, 7])
+with col2:
+    per_day = st.slider("하루에 몇 곳을 둘러볼까요?", min_value=2, max_value=6, value=3)
+categories = st.multiselect("가고 싶은 종류 (비우면 전체)", planner.categories)
 
-# 관광지 이름 → 데이터 매핑
-place_map = {p["name"]: p for p in places}
+# 인기 순으로 days × per_day 곳을 골라 가까운 곳끼리 하루씩 묶고, 하루 동선은 이동거리가 짧게 정렬
+# 일정표와 동선 지도(JSON)는 같은 조건을 고른 다른 세션과 공유 (places.csv가 바뀌면 revision이 올라감)
+def build_plan():
+    with prof.stage("filter"):
+        plan = planner.plan(days, per_day, categories)
+    if plan.empty:
+        return {"plan": plan, "figure": None}
+    with prof.stage("figure"):
+        fig = px.line_map(
+            plan.assign(Day=plan["day"].map(lambda d: f"Day {d}")),
+            lat="lat", lon="lon", color="Day", hover_name="name",
+            hover_data={"station": True, "line": True, "lat": False, "lon": False},
+            zoom=10.5, height=500,
+        )
+        fig.update_traces(mode="lines+markers", marker=dict(size=10))
+    with prof.stage("serialize"):
+        payload = fig.to_json()
+    return {"plan": plan, "figure": payload}
 
-# 여행 일수만큼 cluster 채택
-selected_clusters = clusters[:days]
+key = ("places", revision("places"), days, per_day, tuple(sorted(categories)))
+result, hit = RESULTS.get_or_compute(key, build_plan)
+prof.cache_lookup("일정·동선 지도", hit)
+plan = result["plan"]
+if plan.empty:
+    st.warning("조건에 맞는 관광지가 없어요. 종류를 바꿔 보세요!")
+    prof.stop()
 
 def format_plan(title, place, meal=None):
     if meal:
         return f"**{title}** 🍽 — *{meal}*\n"
-    return f"**{title}** — {place['name']} (🚇 {place['station']} / {place['line']})\n"
+    move = f" · 이전 장소에서 {place['leg_km']:.1f}km" if place["order"] > 1 else ""
+    return f"**{title}** — {place['name']} (🚇 {place['station']} / {place['line']}){move}\n"
 
-for day, cluster in enumerate(selected_clusters, 1):
-    spot_data = [place_map[name] for name in cluster]
+# 지역별 일반적인 식사 추천 (심플 버전)
+lunch = "현지 맛집 추천 (점심)"
+dinner = "가성비 + 분위기 좋은 저녁 식사 추천"
 
-    st.markdown(f"#### 🌿 Day {day}")
+for day, spots in plan.groupby("day"):
+    st.markdown(f"#### 🌿 Day {day} — 이동 {spots['leg_km'].sum():.1f}km")
 
-    # 시간대별 배치
+    # 시간대별 배치: 오전 → 점심 → 오후 → 저녁 → 야간
     schedule_plan = []
-    if len(spot_data) >= 1:
-        schedule_plan.append(format_plan("오전", spot_data[0]))
-    if len(spot_data) >= 2:
-        schedule_plan.append(format_plan("오후", spot_data[1]))
-    if len(spot_data) >= 3:
-        schedule_plan.append(format_plan("야간", spot_data[2]))
-
-    # 지역별 일반적인 식사 추천 (심플 버전)
-    lunch = "현지 맛집 추천 (점심)"
-    dinner = "가성비 + 분위기 좋은 저녁 식사 추천"
-
-    schedule_plan.insert(1, format_plan("점심", None, meal=lunch))
-    schedule_plan.insert(-1, format_plan("저녁", None, meal=dinner))
+    previous = None
+    for slot, (_, place) in zip(time_slots(len(spots)), spots.iterrows()):
+        if previous == "오전" and slot != "오전":
+            schedule_plan.append(format_plan("점심", None, meal=lunch))
+        if previous in ("오전", "오후") and slot == "야간":
+            schedule_plan.append(format_plan("저녁", None, meal=dinner))
+        schedule_plan.append(format_plan(slot, place))
+        previous = slot
 
     # 출력
     for line in schedule_plan:
         st.markdown(line)
+
+st.markdown("### 🗺 동선 지도")
+prof.figure(result["figure"])
+with prof.stage("serialize"):
+    st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
+
+prof.finish()
@@ -1,31 +1,67 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.io as pio
 import numpy as np
 
+from common.clustering import METHODS
+from common.figures import cluster_heatmap_figure, dendrogram_figure, mbti_country_figure, mbti_type_figure
+from common.indexes import get_index
+from common.loader import get_frame, revision
+from common.profiling import profiler
+from common.result_cache import RESULTS
+from common.similarity import METRICS
+from common.validation import render_notice
+from common.watcher import start_watcher
+
 # --- 페이지 설정 ---
 st.set_page_config(
     page_title="🌍 MBTI by Country",
     page_icon="🌱",
     layout="wide"
 )
+prof = profiler("mbti")
 
 # --- 데이터 불러오기 ---
-@st.cache_data
 def load_data():
-    df = pd.read_csv("countriesMBTI_16types.csv")
-    return df
-
-df = load_data()
+    # 공용 로더: 프로세스당 한 번만 파싱하고 모든 세션이 같은 표를 공유
+    return get_frame("mbti")
+
+# 파생 색인은 공용 레지스트리에서: 프로세스당 한 번만 만들고(디스크에도 보관) 모든 세션이 공유
+def load_ranks():
+    # 유형별 국가 순위 행렬
+    return get_index("mbti_ranks")
+
+def load_similarity():
+    # 국가 간 거리 행렬(코사인·젠슨-섀넌·유클리드)
+    return get_index("mbti_similarity")
+
+def load_clustering(metric, method):
+    # 지표·방법별 연결(linkage) — 군집 수를 바꿀 때는 트리를 다시 자르기만 함
+    return get_index("mbti_clustering", metric, method)
+
+# 감시 스레드가 새 CSV로 바꿔 끼우면 revision이 올라가 공유 그림 캐시도 새로 만듦
+start_watcher()
+mbti_revision = revision("mbti")
+try:
+    with prof.stage("load"):
+        df = load_data()
+        ranks = load_ranks()
+except ValueError as e:
+    st.error(f"🚨 'countriesMBTI_16types.csv' 형식이 맞지 않아요: {e}")
+    prof.stop()  # st.stop() 대신 — 멈춘 리런도 측정값을 남김
 countries = df["Country"].unique()
-mbti_types = [c for c in df.columns if c != "Country"]
+mbti_types = ranks.types
 
 # --- 제목 ---
 st.title("🌍 국가별 MBTI 데이터 시각화 대시보드")
 st.markdown("Plotly로 인터랙티브하게 MBTI 데이터를 살펴보세요 💫")
+render_notice("countriesMBTI_16types")  # 비율이 숫자가 아니거나 합이 1에서 크게 벗어난 나라는 빠짐
 
 # --- 탭 구성 ---
-tab1, tab2 = st.tabs(["📊 국가별 MBTI 비율", "🌐 MBTI 유형별 상위 국가"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    ["📊 국가별 MBTI 비율", "🌐 MBTI 유형별 상위 국가", "🏅 국가별 유형 순위", "🤝 비슷한 국가 찾기", "🌳 국가 군집"]
+)
 
 # ---------------------------------------------------------------------
 # ✅ 탭 1: 국가별 MBTI 비율
@@ -34,39 +70,21 @@ with tab1:
     st.subheader("📍 국가별 MBTI 분포 보기")
     selected_country = st.selectbox("국가를 선택하세요:", sorted(countries))
 
-    # 해당 국가 데이터 정리
-    country_data = df[df["Country"] == selected_country].drop(columns=["Country"]).T
-    country_data.columns = ["비율"]
-    country_data = country_data.sort_values("비율", ascending=False)
-    top_type = country_data.index[0]
-
-    # --- 색상 (파란색 그라데이션 반대 방향 + 1등 초록색) ---
-    num = len(country_data)
-    gradient = [f"rgba({50 + i*2}, {180 + i}, 255, 0.9)" for i in range(num)][::-1]  # 반대 그라데이션
-    colors = gradient.copy()
-    colors[country_data.index.get_loc(top_type)] = "#00c853"  # 1등 초록색
-
-    # --- 그래프 ---
-    fig1 = px.bar(
-        country_data,
-        x=country_data.index,
-        y="비율",
-        color=country_data.index,
-        color_discrete_sequence=colors,
-        title=f"🇨🇮 {selected_country}의 MBTI 분포",
-    )
-
-    fig1.update_layout(
-        showlegend=False,
-        xaxis_title="MBTI 유형",
-        yaxis_title="비율",
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        title_x=0.5,
-        font=dict(size=15),
-    )
-    fig1.update_traces(hovertemplate="<b>%{x}</b><br>비율: %{y:.2%}<extra></extra>")
-    st.plotly_chart(fig1, use_container_width=True)
+    # 같은 국가를 고른 다른 세션과 그림(JSON)을 공유
+    def build_country():
+        with prof.stage("figure"):
+            fig, top_type = mbti_country_figure(df, selected_country)
+        with prof.stage("serialize"):
+            payload = fig.to_json()
+        return {"figure": payload, "top_type": top_type}
+
+    key = ("mbti", mbti_revision, "country", selected_country)
+    result, hit = RESULTS.get_or_compute(key, build_country)
+    prof.cache_lookup("국가별 비율 그림", hit)
+    top_type = result["top_type"]
+    prof.figure(result["figure"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
     st.write(f"이 나라에서 가장 많은 유형은 **{top_type}** 입니다 💫")
 
 # ---------------------------------------------------------------------
@@ -76,39 +94,108 @@ with tab2:
     st.subheader("🌐 MBTI 유형별 상위 국가 보기")
     selected_type = st.selectbox("MBTI 유형을 선택하세요:", mbti_types)
 
-    # 해당 유형 상위 10개 국가
-    sorted_df = df.sort_values(by=selected_type, ascending=False).reset_index(drop=True)
-    top10 = sorted_df.head(10)
-
-    # 한국이 포함되어 있지 않으면 마지막에 추가
-    if "South Korea" not in top10["Country"].values and "South Korea" in df["Country"].values:
-        korea_row = df[df["Country"] == "South Korea"]
-        top10 = pd.concat([top10, korea_row], ignore_index=True)
-
-    # 색상 설정
-    colors = ["#60a5fa"] * len(top10)  # 기본 파란색 계열
-    if "South Korea" in top10["Country"].values:
-        idx = top10[top10["Country"] == "South Korea"].index[0]
-        colors[idx] = "#00bfa5"  # 청록색
-
-    # 그래프 생성
-    fig2 = px.bar(
-        top10,
-        x="Country",
-        y=selected_type,
-        color="Country",
-        color_discrete_sequence=colors,
-        title=f"🌍 {selected_type} 유형이 많은 상위 국가",
+    # 해당 유형 상위 10개 국가 (한국이 없으면 마지막에 추가) — 세션 간 공유 캐시
+    def build_type():
+        with prof.stage("filter"):
+            top10 = ranks.top(selected_type, n=10, include="South Korea")
+        with prof.stage("figure"):
+            fig = mbti_type_figure(top10, selected_type)
+        with prof.stage("serialize"):
+            payload = fig.to_json()
+        return {"figure": payload, "top": top10}
+
+    result, hit = RESULTS.get_or_compute(("mbti", mbti_revision, "type", selected_type), build_type)
+    prof.cache_lookup("유형별 상위 국가 그림", hit)
+    prof.figure(result["figure"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
+
+# ---------------------------------------------------------------------
+# ✅ 탭 3: 아무 국가의 유형별 순위 (순위 행렬에서 바로 읽음)
+# ---------------------------------------------------------------------
+with tab3:
+    st.subheader("🏅 국가별 MBTI 유형 순위 보기")
+    col1, col2 = st.columns(2)
+    with col1:
+        rank_country = st.selectbox("국가를 선택하세요:", sorted(countries), key="rank_country")
+    with col2:
+        rank_type = st.selectbox("MBTI 유형을 선택하세요:", mbti_types, key="rank_type")
+
+    st.metric(
+        f"{rank_country}의 {rank_type} 순위",
+        f"{ranks.rank(rank_country, rank_type)}위 / {len(countries)}개국",
     )
+    with prof.stage("filter"):
+        table = ranks.country_ranks(rank_country)
+    st.dataframe(table.style.format({"비율": "{:.2%}"}), use_container_width=True)
+
+# ---------------------------------------------------------------------
+# ✅ 탭 4: MBTI 분포가 비슷한 국가 (미리 계산한 거리 행렬에서 k개 선택)
+# ---------------------------------------------------------------------
+with tab4:
+    st.subheader("🤝 MBTI 분포가 비슷한 국가 찾기")
+    with prof.stage("load"):
+        similarity = load_similarity()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        base_country = st.selectbox("기준 국가를 선택하세요:", sorted(countries), key="similar_country")
+    with col2:
+        metric = st.radio("거리 계산 방식", list(METRICS), format_func=METRICS.get, horizontal=True)
+    with col3:
+        k = st.slider("몇 개국을 볼까요?", min_value=3, max_value=15, value=5)
+
+    with prof.stage("filter"):
+        neighbours = similarity.nearest(base_country, k=k, metric=metric)
+    st.dataframe(neighbours.rename(columns={"이름": "국가"}), use_container_width=True)
+
+    # 기준 국가와 가장 비슷한 국가들의 분포를 겹쳐 비교
+    with prof.stage("filter"):
+        compare = df[df["Country"].isin([base_country, *neighbours["이름"].head(3)])]
+        compare = compare.melt(id_vars="Country", var_name="MBTI 유형", value_name="비율")
+    with prof.stage("figure"):
+        fig4 = px.line(
+            compare, x="MBTI 유형", y="비율", color="Country", markers=True,
+            title=f"🤝 {base_country}와 비슷한 국가들의 MBTI 분포",
+        )
+        fig4.update_layout(plot_bgcolor="white", paper_bgcolor="white", title_x=0.5, font=dict(size=15))
+        fig4.update_traces(hovertemplate="<b>%{x}</b><br>비율: %{y:.2%}<extra></extra>")
+    prof.figure(fig4)
+    with prof.stage("serialize"):
+        st.plotly_chart(fig4, use_container_width=True)
 
-    fig2.update_layout(
-        showlegend=False,
-        xaxis_title="국가",
-        yaxis_title="비율",
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        title_x=0.5,
-        font=dict(size=15),
+# ---------------------------------------------------------------------
+# ✅ 탭 5: MBTI 분포로 국가 계층적 군집 (덴드로그램 + 군집 순서 히트맵)
+# ---------------------------------------------------------------------
+with tab5:
+    st.subheader("🌳 MBTI 분포가 닮은 국가끼리 묶어 보기")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        cluster_metric = st.selectbox("거리 계산 방식", list(METRICS), format_func=METRICS.get,
+                                      key="cluster_metric")
+    with col2:
+        cluster_method = st.selectbox("묶는 방식", list(METHODS), format_func=METHODS.get)
+    with col3:
+        n_clusters = st.slider("군집 수", min_value=2, max_value=12, value=5)
+
+    with prof.stage("load"):
+        clustering = load_clustering(cluster_metric, cluster_method)
+    with prof.stage("filter"):
+        labels = clustering.cut(n_clusters)
+
+    with prof.stage("figure"):
+        fig_tree = dendrogram_figure(clustering, n_clusters)
+        fig_heat = cluster_heatmap_figure(clustering, ranks.values, mbti_types, labels)
+    prof.figure(fig_tree)
+    prof.figure(fig_heat)
+    with prof.stage("serialize"):
+        st.plotly_chart(fig_tree, use_container_width=True)
+        st.plotly_chart(fig_heat, use_container_width=True)
+
+    members = (
+        pd.DataFrame({"군집": labels, "국가": clustering.names})
+        .groupby("군집")["국가"]
+        .agg(국가수="size", 국가=lambda names: ", ".join(sorted(names)))
     )
-    fig2.update_traces(hovertemplate="<b>%{x}</b><br>비율: %{y:.2%}<extra></extra>")
-    st.plotly_chart(fig2, use_container_width=True)
+    st.dataframe(members, use_container_width=True)
+
+prof.finish()
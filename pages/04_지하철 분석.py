@@ -1,107 +1,379 @@
 # pages/01_역별_승하차_분석.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from plotly.colors import n_colors
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from common.anomalies import THRESHOLD
+from common.figures import (
+    anomaly_counts_figure, anomaly_history_figure, subway_histogram_figure, subway_network_figure,
+    subway_top_figure, subway_trend_figure,
+)
+from common.indexes import get_index
+from common.ingest import source_files
+from common.memory import track
+from common.profiling import profiler
+from common.result_cache import RESULTS
+from common.subway import downsample, histogram
+from common.timeseries import WINDOW, RidershipSeries
+from common.validation import render_notice
+from common.watcher import start_watcher
 
 st.set_page_config(page_title="서울 지하철 역별 승하차 분석", layout="wide")
 
-st.title("🚇 서울 지하철 승하차 분석 (2025년 10월)")
+st.title("🚇 서울 지하철 승하차 분석")
+
+# 단계별 시간 측정 (APP_PROFILE=1 또는 주소에 ?debug=1 일 때만 켜짐)
+prof = profiler("subway")
+
+def open_store():
+    # damn.csv와 ridership/*.csv를 월별 파티션(.cache/ridership/)으로 수집 — 바뀐 원본만 다시 읽음
+    # 서버가 떠 있는 동안 덧붙은 날짜는 감시 스레드가 꼬리만 읽어 더해 둠
+    return start_watcher().store
+
+def load_stations():
+    # 역명 변형('총신대입구(이수)'/'이수') → 역 ID 표와 역 검색 색인 — 모든 달에서 한 번만 만듦
+    open_store()
+    return get_index("subway_stations")
 
-@st.cache_data
-def load_data(path="damn.csv"):
-    # 인코딩 여러가지 시도 (utf-8 실패하면 cp949로)
-    try:
-        df = pd.read_csv(path, encoding="utf-8")
-    except Exception:
-        df = pd.read_csv(path, encoding="cp949")
-    return df
+def load_anomalies():
+    # 전체 기간 (노선, 역)별 요일 기준선과 모든 날의 점수 — 새 날짜가 들어오면 그 요일만 다시 계산
+    open_store()
+    return get_index("subway_anomalies")
+
+def load_ranking(month):
+    # 선택한 월의 파티션만 읽어 만든 (날짜, 노선)별 역 순위 색인 — 공용 레지스트리에서 모든 세션이 공유함
+    open_store()
+    return get_index("subway_ranking", month)
+
+@st.cache_resource(max_entries=8)
+def load_series(start, end, by, version):
+    # 기간 안의 모든 역(또는 노선) 시계열을 한 번에 계산 — 이동평균이 기간 첫날부터 맞도록 며칠 앞서 읽음
+    # (version이 바뀌면, 즉 새 날짜가 수집되면 다시 계산)
+    df = open_store().load(start - pd.Timedelta(days=WINDOW - 1), end)
+    # st.cache_resource가 들고 있는 동안 디버그 메모리 보고에 보이도록 알려 둠
+    return track(f"시계열 {start:%Y-%m-%d}~{end:%Y-%m-%d} ({by})", RidershipSeries(df, by=by))
 
 # --- 로드 ---
 try:
-    df = load_data("damn.csv")
-except FileNotFoundError:
-    st.error("파일을 찾을 수 없습니다: 루트 폴더에 `damn.csv`가 있는지 확인하세요.")
-    st.stop()
+    with prof.stage("load"):
+        store = open_store()
+        # 이번 리런 동안 쓸 스냅샷 버전 (도중에 감시 스레드가 새 날짜를 더해도 키가 섞이지 않게)
+        version = store.version
+        months = store.months()
 except Exception as e:
     st.error(f"데이터를 불러오는 중 오류가 발생했습니다: {e}")
     st.stop()
 
-# 컬럼명 정리 (혹시 공백/유니코드 문제가 있으면 안전하게)
-df.columns = df.columns.str.strip()
+if not months:
+    st.error("승하차 데이터가 없습니다: 루트 폴더의 `damn.csv`나 `ridership/` 폴더에 월별 CSV를 넣어 주세요.")
+    st.stop()
+# 수집할 때 검사에서 걸린 행(숫자가 아닌 승하차 수, 중복 행 ...)은 파티션에 들어가지 않음
+render_notice(*(path.stem for path in source_files()))
 
-# 사용일자 문자열로 바꾸기
-df["사용일자"] = df["사용일자"].astype(str)
+def month_label(month):
+    return f"{month[:4]}년 {int(month[4:])}월"
 
-# 2025년 10월(202510**) 데이터만 선택 가능한 옵션으로 제공
-oct_2025 = sorted([d for d in df["사용일자"].unique() if d.startswith("202510")])
-if not oct_2025:
-    st.error("데이터에 2025년 10월(예: 20251001) 기록이 없습니다. CSV를 확인해 주세요.")
-    st.stop()
+# ---------------------------------------------------------------------
+# 📊 하루 Top 10: 선택한 날짜·호선의 역별 총승하차 순위
+# ---------------------------------------------------------------------
+def show_daily_top():
+    selected_month = st.selectbox(
+        "🗓 월을 선택하세요", months, index=len(months) - 1, format_func=month_label
+    )
+    with prof.stage("load"):
+        ranking = load_ranking(selected_month)
 
-selected_date = st.selectbox("📅 2025년 10월 중 하루를 선택하세요", oct_2025)
+    # (컬럼명 정리·타입 변환은 수집 단계에서 끝남: 사용일자는 날짜, 노선명/역명은 범주형)
+    with prof.stage("filter"):
+        dates = ranking.dates()
+    if not dates:
+        st.error("선택한 월에 기록이 없습니다. CSV를 확인해 주세요.")
+        st.stop()
 
-# 선택한 날짜로 필터
-filtered = df[df["사용일자"] == selected_date].copy()
+    selected_date = st.selectbox("📅 하루를 선택하세요", dates, format_func=lambda d: d.strftime("%Y%m%d"))
+    date_label = selected_date.strftime("%Y%m%d")
 
-# 노선 선택
-lines = sorted(filtered["노선명"].unique())
-if not lines:
-    st.error("선택한 날짜에 해당하는 노선 데이터가 없습니다.")
-    st.stop()
+    # 노선 선택 (선택한 날짜에 기록이 있는 노선만)
+    with prof.stage("filter"):
+        lines = ranking.lines(selected_date)
+    if not lines:
+        st.error("선택한 날짜에 해당하는 노선 데이터가 없습니다.")
+        st.stop()
 
-selected_line = st.selectbox("🚏 호선을 선택하세요", lines)
+    selected_line = st.selectbox("🚏 호선을 선택하세요", lines)
 
-# 선택한 노선으로 필터
-line_df = filtered[filtered["노선명"] == selected_line].copy()
+    # 상위 10개만 (요구대로 10개) — 총승하차는 색인에서 미리 계산·정렬되어 있음
+    # 그림(JSON)과 표는 같은 날짜·호선을 고른 다른 세션과 공유함
+    top_n = 10
 
-# 숫자형으로 안전하게 변환
-for col in ["승차총승객수", "하차총승객수"]:
-    line_df[col] = pd.to_numeric(line_df[col], errors="coerce").fillna(0).astype(int)
+    def build_top():
+        with prof.stage("aggregate"):
+            top_df = ranking.top(selected_date, selected_line, top_n).copy()
+            top_df["역명"] = top_df["역명"].astype(str)  # 범주형 그대로면 plotly가 안 쓰는 역까지 색을 배정함
+        if top_df.empty:
+            return {"figure": None, "top": top_df}
+        with prof.stage("figure"):
+            fig = subway_top_figure(top_df, date_label, selected_line)
+        with prof.stage("serialize"):
+            payload = fig.to_json()
+        return {"figure": payload, "top": top_df}
 
-# 총승하차 계산 및 정렬
-line_df["총승하차"] = line_df["승차총승객수"] + line_df["하차총승객수"]
-line_df = line_df.sort_values("총승하차", ascending=False).reset_index(drop=True)
+    key = ("subway", version, selected_date, selected_line, top_n)
+    result, hit = RESULTS.get_or_compute(key, build_top)
+    prof.cache_lookup("Top 10 그림", hit)
+    top_df = result["top"]
 
-if line_df.empty:
-    st.warning("해당 노선/날짜에 데이터가 없습니다.")
-    st.stop()
+    if top_df.empty:
+        st.warning("해당 노선/날짜에 데이터가 없습니다.")
+        st.stop()
 
-# 상위 10개만 (요구대로 10개)
-top_n = 10
-top_df = line_df.head(top_n).copy()
-
-# 색상 생성: 1등은 빨간색, 나머지는 파란색-그라데이션
-n_rest = max(len(top_df) - 1, 0)
-if n_rest > 0:
-    # 연한 파랑 -> 진한 파랑 그라데이션 (n_colors 사용)
-    blues = n_colors('rgb(198,219,239)', 'rgb(8,48,107)', n_rest, colortype='rgb')
-else:
-    blues = []
-
-colors = ["red"] + blues  # 길이는 top_df 행수와 같아야 함
-
-# plotly: 각 막대에 색 할당하려면 color에 '역명'을 사용하고 color_discrete_sequence 전달
-fig = px.bar(
-    top_df,
-    x="역명",
-    y="총승하차",
-    title=f"📊 {selected_date} · {selected_line} - 총승하차 Top {len(top_df)}",
-    color="역명",
-    color_discrete_sequence=colors,
-    text="총승하차",
-)
+    prof.figure(result["figure"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
 
-fig.update_traces(texttemplate="%{text:,}", textposition="outside")
-fig.update_layout(
-    xaxis_title="역명",
-    yaxis_title="총승하차 수",
-    showlegend=False,
-    uniformtext_minsize=8,
-    uniformtext_mode="hide",
-)
+    st.subheader("📄 데이터 (상위 항목)")
+    st.dataframe(top_df.reset_index(drop=True))
+
+# ---------------------------------------------------------------------
+# 📈 기간 추이: 한 역(또는 노선)의 일별 승하차, 7일 이동평균, 평일/주말, 전일 대비
+# ---------------------------------------------------------------------
+def show_trend():
+    first_day = pd.Timestamp(f"{months[0]}01").date()
+    last_day = (pd.Timestamp(f"{months[-1]}01") + pd.offsets.MonthEnd(0)).date()
+    default_start = pd.Timestamp(f"{months[-1]}01").date()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        period = st.date_input(
+            "📅 기간을 선택하세요", value=(default_start, last_day),
+            min_value=first_day, max_value=last_day,
+        )
+    with col2:
+        by = st.radio("🎯 무엇을 볼까요?", ["역명", "노선명"], horizontal=True,
+                      format_func=lambda c: "역" if c == "역명" else "호선")
+
+    if len(period) != 2:
+        st.info("기간의 시작일과 종료일을 모두 골라 주세요.")
+        st.stop()
+    start, end = pd.Timestamp(period[0]), pd.Timestamp(period[1])
+
+    with prof.stage("load"):
+        series = load_series(start, end, by, version)
+    names = series.names()
+    if not names:
+        st.warning("선택한 기간에 데이터가 없습니다.")
+        st.stop()
+    target = st.selectbox("🔎 대상을 선택하세요", names)
+
+    with prof.stage("filter"):
+        table = series.series(target, start, end)
+    if table.empty:
+        st.warning("선택한 기간에 데이터가 없습니다.")
+        st.stop()
+
+    with prof.stage("figure"):
+        fig = subway_trend_figure(table, target, WINDOW)
+    prof.figure(fig)
+    with prof.stage("serialize"):
+        st.plotly_chart(fig, use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🗓 평일 vs 주말 (일평균)")
+        with prof.stage("aggregate"):
+            # 기간에 주말(또는 평일) 기록이 없으면 빈 칸으로 보여 줌
+            split = series.weekday_split(target, start, end).round(0).astype("Int64")
+        st.dataframe(split)
+    with col2:
+        st.subheader("↕️ 전일 대비 변화")
+        with prof.stage("aggregate"):
+            delta = table["승차총승객수_전일대비"] + table["하차총승객수_전일대비"]
+        with prof.stage("figure"):
+            fig_delta = go.Figure(go.Bar(
+                x=delta.index, y=delta,
+                marker_color=["#2ca02c" if v >= 0 else "#d62728" for v in delta.fillna(0)],
+            ))
+            fig_delta.update_layout(yaxis_title="총승하차 증감", margin=dict(t=10))
+        prof.figure(fig_delta)
+        with prof.stage("serialize"):
+            st.plotly_chart(fig_delta, use_container_width=True)
 
-st.subheader("📄 데이터 (상위 항목)")
-st.dataframe(top_df.reset_index(drop=True))
+# ---------------------------------------------------------------------
+# 🗺 전체 역: 선택한 날짜의 모든 노선·역을 한 그림에 (WebGL 산점도 하나 + 분포)
+# ---------------------------------------------------------------------
+def show_network():
+    selected_month = st.selectbox(
+        "🗓 월을 선택하세요", months, index=len(months) - 1, format_func=month_label, key="network_month"
+    )
+    with prof.stage("load"):
+        ranking = load_ranking(selected_month)
+    dates = ranking.dates()
+    if not dates:
+        st.error("선택한 월에 기록이 없습니다. CSV를 확인해 주세요.")
+        st.stop()
+
+    # 한 달(약 30일)을 슬라이더로 넘겨 봐도 날짜마다 정렬·구간 계산은 서버에서 한 번만 함
+    selected_date = st.select_slider("📅 하루를 선택하세요", dates, value=dates[-1],
+                                     format_func=lambda d: d.strftime("%Y%m%d"))
+    date_label = selected_date.strftime("%Y%m%d")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        thin = st.checkbox("🪶 점 줄이기 (다운샘플)", value=False)
+    with col2:
+        max_points = st.slider("최대 점 수", min_value=50, max_value=600, value=200, step=50, disabled=not thin)
+    with col3:
+        log_y = st.checkbox("📐 로그 눈금", value=True)
+    max_points = max_points if thin else None
+
+    def build_network():
+        with prof.stage("aggregate"):
+            network = ranking.network(selected_date)
+            keep = downsample(network["총승하차"].to_numpy(), max_points)
+            left, right, counts = histogram(network["총승하차"].to_numpy())
+        if network.empty:
+            return {"figure": None, "histogram": None, "stations": 0}
+        with prof.stage("figure"):
+            lines = ranking.frame["노선명"].cat.categories
+            fig = subway_network_figure(network, keep, lines, date_label, log_y=log_y)
+            fig_hist = subway_histogram_figure(left, right, counts, date_label)
+        with prof.stage("serialize"):
+            return {"figure": fig.to_json(), "histogram": fig_hist.to_json(), "stations": len(network)}
+
+    key = ("subway_network", version, selected_date, max_points, log_y)
+    result, hit = RESULTS.get_or_compute(key, build_network)
+    prof.cache_lookup("전체 역 그림", hit)
+    if result["figure"] is None:
+        st.warning("선택한 날짜에 데이터가 없습니다.")
+        st.stop()
+
+    st.caption(f"노선·역 {result['stations']:,}곳 — 점에 마우스를 올리면 역 이름과 순위가 보여요.")
+    prof.figure(result["figure"])
+    prof.figure(result["histogram"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
+        st.plotly_chart(pio.from_json(result["histogram"]), use_container_width=True)
+
+
+# ---------------------------------------------------------------------
+# 🏙 역별 Top N: 환승역을 노선 구분 없이 합친 전체 역 순위 + 역 검색
+# ---------------------------------------------------------------------
+def show_station_top():
+    selected_month = st.selectbox(
+        "🗓 월을 선택하세요", months, index=len(months) - 1, format_func=month_label, key="station_month"
+    )
+    with prof.stage("load"):
+        ranking = load_ranking(selected_month)
+        stations = load_stations()
+    dates = ranking.dates()
+    if not dates:
+        st.error("선택한 월에 기록이 없습니다. CSV를 확인해 주세요.")
+        st.stop()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_date = st.selectbox("📅 하루를 선택하세요", dates, index=len(dates) - 1,
+                                     format_func=lambda d: d.strftime("%Y%m%d"), key="station_date")
+    with col2:
+        top_n = st.slider("🏅 몇 위까지 볼까요?", min_value=5, max_value=30, value=10, step=5)
+    date_label = selected_date.strftime("%Y%m%d")
+
+    def build_station_top():
+        with prof.stage("aggregate"):
+            top_df = ranking.top_stations(selected_date, top_n).copy()
+            top_df["역명"] = top_df["역명"].astype(str)
+        if top_df.empty:
+            return {"figure": None, "top": top_df}
+        with prof.stage("figure"):
+            fig = subway_top_figure(top_df, date_label, "전체 노선 (환승역 합산)")
+            fig.update_traces(customdata=top_df[["노선"]].astype(str),
+                              hovertemplate="<b>%{x}</b><br>%{customdata[0]}<br>%{y:,}명<extra></extra>")
+        with prof.stage("serialize"):
+            payload = fig.to_json()
+        return {"figure": payload, "top": top_df}
+
+    key = ("subway_stations", version, selected_date, top_n)
+    result, hit = RESULTS.get_or_compute(key, build_station_top)
+    prof.cache_lookup("역별 Top N 그림", hit)
+    if result["figure"] is None:
+        st.warning("선택한 날짜에 데이터가 없습니다.")
+        st.stop()
+
+    prof.figure(result["figure"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
+
+    # 역 검색: 미리 만든 접두어·n-gram 색인에서 찾으므로 이름 전체를 훑지 않음
+    query = st.text_input("🔎 역 검색 (예: 이수, 고속, DDP)", placeholder="역 이름 일부나 부역명을 입력하세요")
+    if query:
+        with prof.stage("filter"):
+            found = stations.search(query)
+            rows = ranking.station_rows(selected_date, found)
+        if rows.empty:
+            st.info("검색한 역을 찾지 못했어요. 다른 이름으로 찾아보세요!")
+        else:
+            st.dataframe(rows[["순위", "역명", "노선", "승차총승객수", "하차총승객수", "총승하차"]], hide_index=True)
+
+# ---------------------------------------------------------------------
+# 🚨 이상치: 요일별 평소(중앙값/MAD)와 크게 다른 날의 역 (행사·휴업·데이터 오류)
+# ---------------------------------------------------------------------
+def show_anomalies():
+    with prof.stage("load"):
+        detector = load_anomalies()
+    if detector.last_day is None:
+        st.warning("이상치를 찾을 데이터가 없습니다.")
+        st.stop()
+
+    threshold = st.slider("🎚 얼마나 벗어나야 이상치일까요? (강건 z-점수)", min_value=2.0, max_value=8.0,
+                          value=THRESHOLD, step=0.5)
+    dates = list(detector.days)
+    selected_date = st.selectbox("📅 하루를 선택하세요", dates, index=len(dates) - 1,
+                                 format_func=lambda d: d.strftime("%Y%m%d (") + "월화수목금토일"[d.dayofweek] + ")",
+                                 key="anomaly_date")
+
+    with prof.stage("aggregate"):
+        counts = detector.daily_counts(threshold)
+    with prof.stage("figure"):
+        fig = anomaly_counts_figure(counts, selected_date)
+    prof.figure(fig)
+    with prof.stage("serialize"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    # 점수는 미리 계산되어 있어 날짜를 바꾸면 그 열에서 고르기만 함
+    with prof.stage("filter"):
+        table = detector.anomalies(selected_date, threshold)
+    if table.empty:
+        st.success("이 날은 평소와 크게 다른 역이 없어요.")
+        return
+    st.subheader(f"🚨 {selected_date.strftime('%Y%m%d')} 이상치 {len(table)}건")
+    st.caption("점수는 같은 요일의 중앙값에서 벗어난 정도를 MAD로 나눈 값이에요 (+는 급증, −는 급감).")
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+    targets = table[["노선명", "역명"]].drop_duplicates()
+    labels = [f"{line} {station}" for line, station in targets.itertuples(index=False)]
+    picked = st.selectbox("🔎 추이를 볼 역", range(len(labels)), format_func=lambda i: labels[i])
+    line, station = targets.iloc[picked]
+    with prof.stage("figure"):
+        fig_history = anomaly_history_figure(detector.history(line, station), labels[picked], threshold)
+    prof.figure(fig_history)
+    with prof.stage("serialize"):
+        st.plotly_chart(fig_history, use_container_width=True)
+
+
+mode = st.radio("🔀 보기 방식", ["📊 하루 Top 10", "🏙 역별 Top N", "📈 기간 추이", "🗺 전체 역", "🚨 이상치"],
+                horizontal=True)
+try:
+    if mode == "📊 하루 Top 10":
+        show_daily_top()
+    elif mode == "🏙 역별 Top N":
+        show_station_top()
+    elif mode == "📈 기간 추이":
+        show_trend()
+    elif mode == "🗺 전체 역":
+        show_network()
+    else:
+        show_anomalies()
+finally:
+    # st.stop()으로 중간에 끝난 리런도 측정값은 남김
+    prof.finish()
@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+
+from common.indexes import get_index
+from common.loader import get_frame
+from common.profiling import profiler
+from common.validation import render_notice
+from common.watcher import start_watcher
+
+st.set_page_config(page_title="녹차 레시피 검색", layout="wide")
+
+st.title("🍵 녹차 레시피 검색")
+st.markdown("냉장고에 있는 재료로 만들 수 있는 녹차 요리를 찾아보세요!")
+
+prof = profiler("tea")
+start_watcher()  # TEA.csv가 교체되면 역색인을 백그라운드에서 다시 만듦
+
+# 처음 보여 줄 재료 — 감시 스레드가 바꿔 끼운 TEA.csv에 없는 재료는 빼고 씀 (없는 기본값은 multiselect 오류)
+AVAILABLE_DEFAULT = ["녹차가루", "우유", "설탕", "얼음"]
+INCLUDE_DEFAULT = ["녹차가루"]
+EXCLUDE_DEFAULT = ["계란"]
+
+def defaults(names):
+    return [name for name in names if name in index.ingredients]
+
+def load_index():
+    # 주재료/부재료 문자열을 한 번만 풀어 만든 (레시피, 재료, 수량, 단위) 표와 재료 → 레시피 역색인
+    return get_index("recipes")
+
+# --- 로드 ---
+try:
+    with prof.stage("load"):
+        df = get_frame("tea")
+        index = load_index()
+except FileNotFoundError:
+    st.error("🚨 'TEA.csv' 파일을 찾을 수 없어요. 루트 폴더에 넣어 주세요!")
+    prof.stop()  # st.stop() 대신 — 멈춘 리런도 측정값을 남김
+except ValueError as e:
+    st.error(f"🚨 'TEA.csv' 형식이 맞지 않아요: {e}")
+    prof.stop()
+render_notice("TEA")
+
+def show_recipes(rows, lacking=None, limit=30):
+    """검색 결과 레시피를 펼쳐 보기로 보여 줌 (부족한 재료 수가 있으면 함께 표시)."""
+    if len(rows) == 0:
+        st.info("조건에 맞는 레시피가 없어요. 재료를 바꿔 보세요!")
+        return
+    st.success(f"🍽 {len(rows)}개의 레시피를 찾았어요!" + (f" (앞에서 {limit}개만 보여 줄게요)" if len(rows) > limit else ""))
+    for i, row in enumerate(rows[:limit]):
+        title = f"{index.names[row]}"
+        if lacking is not None and lacking[i] > 0:
+            title += f" — 재료 {lacking[i]}개 부족"
+        with st.expander(title):
+            st.dataframe(index.ingredients_of(row), hide_index=True, use_container_width=True)
+            st.markdown("**👩‍🍳 조리법**")
+            st.write(df.iloc[row]["조리법"])
+            if pd.notna(df.iloc[row]["상세설명"]):
+                st.caption(df.iloc[row]["상세설명"])
+
+tab1, tab2 = st.tabs(["🧺 가진 재료로 만들기", "🔍 재료 포함/제외 검색"])
+
+# ---------------------------------------------------------------------
+# 🧺 가진 재료로 만들기: 레시피의 재료가 모두(또는 거의) 가진 재료 안에 있는지
+# ---------------------------------------------------------------------
+with tab1:
+    available = st.multiselect(
+        "🧺 가지고 있는 재료를 골라 주세요", index.ingredients,
+        default=defaults(AVAILABLE_DEFAULT),
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        scope = st.radio("📋 어떤 재료까지 갖춰야 할까요?", ["주재료", "전체"], horizontal=True,
+                         format_func=lambda s: "주재료만" if s == "주재료" else "부재료까지")
+    with col2:
+        missing = st.slider("🤏 부족해도 괜찮은 재료 수", min_value=0, max_value=5, value=0)
+
+    with prof.stage("filter"):
+        rows, lacking = index.makeable(available, scope=scope, missing=missing)
+    with prof.stage("serialize"):
+        show_recipes(rows, lacking)
+
+# ---------------------------------------------------------------------
+# 🔍 재료 포함/제외 검색: X는 꼭 들어가고 Y는 빠진 레시피
+# ---------------------------------------------------------------------
+with tab2:
+    col1, col2 = st.columns(2)
+    with col1:
+        include = st.multiselect("✅ 꼭 들어갈 재료", index.ingredients, default=defaults(INCLUDE_DEFAULT))
+    with col2:
+        exclude = st.multiselect("🚫 빼고 싶은 재료", index.ingredients, default=defaults(EXCLUDE_DEFAULT))
+
+    with prof.stage("filter"):
+        rows = index.containing(include, exclude)
+    with prof.stage("serialize"):
+        show_recipes(rows)
+
+prof.finish()
@@ -1,58 +1,54 @@
 import streamlit as st
 import pandas as pd
-import io
+import plotly.express as px
+import plotly.io as pio
 
-# 1. 데이터를 불러오는 함수 (Streamlit Cloud 환경에서는 직접 업로드된 파일을 읽습니다.)
-@st.cache_data
+from common.indexes import get_index
+from common.profiling import page_profiler
+from common.result_cache import RESULTS
+from common.validation import render_notice
+from common.watcher import start_watcher
+
+# 1. 데이터를 불러오는 함수 (공용 로더가 인코딩 판별·파싱·전처리를 프로세스당 한 번만 합니다.)
 def load_data():
-    # 사용자가 업로드한 'altificial.csv' 파일을 직접 읽습니다.
-    # Streamlit 환경에서 'altificial.csv' 파일이 접근 가능하다고 가정합니다.
+    # 'altificial.csv'는 프로젝트 폴더에 있어야 합니다.
+    # 공백 정리, '체명' 결측치 채우기, '국가수' 같은 파생 열 계산도 로딩할 때 한 번만 합니다.
+    # '총점포수'가 숫자가 아닌 행처럼 검사에 걸린 행은 이때 빠지므로 아래에서는 형 변환이 필요 없습니다.
+    # 표와 함께 '진출국가'를 풀어 만든 국가 → 브랜드 역색인, 구분별 마스크·점포수 정렬 순서도
+    # 한 묶음(스냅샷)으로 받습니다 — 감시 스레드가 새 CSV로 바꿔 끼우는 중에도 서로 어긋나지 않습니다.
     try:
-        # 데이터가 CSV 형태의 문자열로 처리될 수 있으므로 io.StringIO를 사용합니다.
-        # 실제 Streamlit Cloud 배포 시에는 'altificial.csv' 파일을 프로젝트 폴더에 넣어두거나
-        # 파일 업로드 위젯을 사용하여 데이터를 받도록 코드를 수정해야 합니다.
-        # 여기서는 파일 접근이 가능한 환경임을 가정하고 코드를 작성합니다.
-        df = pd.read_csv('altificial.csv', encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv('altificial.csv', encoding='cp949')
-        except:
-            df = pd.read_csv('altificial.csv', encoding='euc-kr')
+        data = get_index("brands")
     except FileNotFoundError:
         st.error("🚨 'altificial.csv' 파일을 찾을 수 없어요. 파일을 Streamlit 프로젝트 폴더에 넣어주세요!")
-        return pd.DataFrame() # 빈 DataFrame 반환
-
-    # 데이터 전처리: '구분', '총점포수' 등 필요한 열의 타입을 정리합니다.
-    df['구분'] = df['구분'].str.strip()
-    df['주요메뉴'] = df['주요메뉴'].str.strip()
-    
-    # NaN 값 처리: '체명'의 결측치는 '정보없음'으로 채워줍니다.
-    df['체명'] = df['체명'].fillna('정보없음')
-    
-    return df
+        return None
+    except ValueError as e:
+        st.error(f"🚨 'altificial.csv' 형식이 맞지 않아요: {e}")
+        return None
+    render_notice("altificial")
+    return data
 
-# 2. 메인 Streamlit 앱 함수
-def app():
+# 2. 메인 Streamlit 앱 함수 (prof: 단계별 시간 측정기 — 꺼져 있으면 아무 일도 안 함)
+def app(prof):
     st.set_page_config(layout="wide")
     st.title("🌎 K-브랜드 해외 진출 현황 분석 대시보드")
     st.markdown("---")
     
-    # 2. 데이터 불러오기
-    df = load_data()
-    if df.empty:
-        return
+    # 2. 데이터 불러오기 (altificial.csv가 교체되면 감시 스레드가 새 표로 바꿔 끼움)
+    start_watcher()
+    with prof.stage("load"):
+        data = load_data()
+        if data is None:
+            return
+        df, country_index, filters = data.frame, data.countries, data.filters
 
     # 3. 사이드바 (사용자가 선택할 수 있는 필터) - MBTI 선택 형식 이용
     with st.sidebar:
         st.header("🔍 분석 필터 설정")
         
         # '구분' (한식/비한식)을 선택하는 위젯
-        all_categories = df['구분'].unique().tolist()
-        all_categories.insert(0, '전체') # '전체' 옵션 추가
-        
         selected_category = st.selectbox(
             "어떤 브랜드 타입을 볼까?",
-            options=all_categories, # 16개 MBTI 선택 대신, '구분' 선택
+            options=filters.categories, # 16개 MBTI 선택 대신, '구분' 선택 ('전체' 포함)
             index=0
         )
         
@@ -60,7 +56,7 @@ def app():
         min_stores = st.slider(
             "최소 해외 점포수 기준은?",
             min_value=1, 
-            max_value=int(df['총점포수'].max()), 
+            max_value=int(filters.stores.max()), 
             value=10, # 기본값 10개 이상
             step=1
         )
@@ -68,13 +64,10 @@ def app():
         st.markdown("---")
         st.info("💡 **팁:** 데이터를 필터링해서 자세히 살펴보자!")
 
-    # 4. 필터링된 데이터 준비
-    filtered_df = df.copy()
-    
-    if selected_category != '전체':
-        filtered_df = filtered_df[filtered_df['구분'] == selected_category]
-        
-    filtered_df = filtered_df[filtered_df['총점포수'] >= min_stores]
+    # 4. 필터링된 데이터 준비 (미리 만든 마스크를 조합 — 복사·재필터링 없음)
+    with prof.stage("filter"):
+        in_filter = filters.mask(selected_category, min_stores)
+        filtered_df = df[in_filter]
     
     # 5. 핵심 통계 카드 출력
     col1, col2, col3 = st.columns(3)
@@ -102,7 +95,7 @@ def app():
 
     # **첫 번째 추천 (가장 점포수가 많은 브랜드)**
     # 2. mbti를 16개 중에서 하나 고르면 그 유형에 해당하는 진로를 2가지 추천해줘.
-    top_brand = filtered_df.sort_values(by='총점포수', ascending=False).iloc[0]
+    top_brand = df.iloc[filters.top_by_stores(in_filter)]
     
     st.subheader(f"🥇 No.1 해외 진출 왕: **{top_brand['브랜드']}**") # 첫 번째 진로 추천
     st.markdown(f"> **총 점포수:** **{top_brand['총점포수']:,}개**")
@@ -115,9 +108,8 @@ def app():
     st.markdown("---")
 
     # **두 번째 추천 (가장 많은 국가에 진출한 브랜드)**
-    # '진출국가' 문자열에서 국가 개수를 카운트합니다.
-    filtered_df['국가수'] = filtered_df['진출국가'].apply(lambda x: len(str(x).split(',')) if pd.notna(x) else 0)
-    top_global_brand = filtered_df.sort_values(by='국가수', ascending=False).iloc[0]
+    # '국가수'는 로딩할 때 미리 계산되어 있으므로 정렬 없이 최댓값만 찾습니다.
+    top_global_brand = df.iloc[filters.top_by_countries(in_filter)]
     
     st.subheader(f"🥈 No.2 글로벌 개척자: **{top_global_brand['브랜드']}**") # 두 번째 진로 추천
     st.markdown(f"> **진출 국가:** **{top_global_brand['국가수']}개국**")
@@ -127,15 +119,55 @@ def app():
     st.markdown(f"**적합한 학과:** 🗺️ **국제통상학과, 외국어(중국어/영어) 계열** (다양한 나라와 계약하고 소통하려면 국제 감각이 중요!)")
     st.markdown(f"**적합한 성격:** 🤝 **개방적이고 적응력이 뛰어난 사람** (나라마다 문화가 다르니까 유연하게 대처할 수 있어야 해!)")
 
+    st.markdown("---")
+
+    # 7. 진출 국가 지도와 국가별 브랜드 찾기 (진출국가 색인 사용)
+    st.header("🗺️ 어느 나라에 얼마나 진출했을까?")
+    # 국가별 합계와 지도(JSON)는 같은 필터를 고른 다른 세션과 공유 (원본이 바뀌면 스냅샷 version이 달라짐)
+    def build_map():
+        with prof.stage("filter"):
+            totals = country_index.totals(within=in_filter)
+        with prof.stage("figure"):
+            fig_map = px.choropleth(
+                totals.dropna(subset=["ISO3"]),
+                locations="ISO3",
+                color="점포수",
+                hover_name="국가",
+                hover_data={"ISO3": False, "점포수": ":,", "브랜드수": True},
+                color_continuous_scale="Tealgrn",
+            )
+            fig_map.update_layout(margin=dict(l=0, r=0, t=10, b=0), geo=dict(showframe=False))
+        with prof.stage("serialize"):
+            payload = fig_map.to_json()
+        return {"totals": totals, "figure": payload}
+
+    key = ("brands", data.version, selected_category, min_stores)
+    result, hit = RESULTS.get_or_compute(key, build_map)
+    prof.cache_lookup("진출 국가 지도", hit)
+    totals = result["totals"]
+    prof.figure(result["figure"])
+    with prof.stage("serialize"):
+        st.plotly_chart(pio.from_json(result["figure"]), use_container_width=True)
+
+    selected_country = st.selectbox("🔎 나라를 고르면 진출한 브랜드를 보여줄게!", totals["국가"])
+    with prof.stage("filter"):
+        rows = country_index.rows_in(selected_country, within=in_filter)
+        long = country_index.long
+        stores_here = long[long["국가"] == selected_country].groupby("행")["점포수"].sum().reindex(rows)
+        brands_here = df.iloc[rows][['브랜드', '체명', '구분']].assign(**{"현지 점포수": stores_here.to_numpy()})
+    st.dataframe(brands_here.sort_values("현지 점포수", ascending=False), use_container_width=True, hide_index=True)
+
     st.markdown("---")
     
-    # 7. 전체 데이터 테이블 표시 (자세히 보기)
+    # 8. 전체 데이터 테이블 표시 (자세히 보기)
     st.header("📊 상세 데이터 테이블")
     # '진출국가'를 깔끔하게 표시하기 위해 DataFrame을 복사해서 보여줍니다.
     display_df = filtered_df.drop(columns=['No', '국가수'], errors='ignore')
     
     st.dataframe(display_df, use_container_width=True)
 
-# 8. 앱 실행
+# 9. 앱 실행
 if __name__ == '__main__':
-    app()
+    # 중간에 return해도(데이터 없음, 필터 결과 없음) 측정값을 남기도록 측정기 안에서 실행
+    with page_profiler("brands") as prof:
+        app(prof)
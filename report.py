@@ -0,0 +1,199 @@
+"""주간 보고용: 지하철(날짜 × 호선)·MBTI(국가, 유형) 그림을 모두 정적 HTML로 만드는 CLI.
+
+페이지와 같은 색인·그림 함수(common/indexes.py, common/figures.py)를 쓰고,
+그림 만들기와 파일 쓰기는 프로세스 풀에 나눠 맡긴다. 조합마다 그림에 들어가는
+데이터(와 그림 코드)의 해시를 manifest.json에 적어 두어, 다음 실행에서는
+입력이 바뀐 조합만 다시 그린다. 결과는 index.html 한 장에서 모두 열 수 있다.
+
+    python report.py                        # reports/ 에 전체 생성 (바뀐 것만)
+    python report.py --only subway          # 지하철만
+    python report.py --force --workers 4    # 모두 다시, 프로세스 4개
+    python report.py --png                  # PNG도 함께 (kaleido 필요)
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import plotly
+
+from common.cache import CODE_DIR, ROOT, atomic_write, read_json
+from common.indexes import get_index
+from common.loader import get_frame
+from common.watcher import start_watcher
+
+OUTPUT_DIR = ROOT / "reports"
+TOP_N = 10  # 지하철 페이지와 같은 Top 10
+
+# 그림 코드가 바뀌면 모든 조합을 다시 그리도록 해시에 함께 넣음
+CODE_VERSION = hashlib.blake2b(
+    (CODE_DIR / "figures.py").read_bytes() + plotly.__version__.encode(), digest_size=8
+).hexdigest()
+
+
+def _slug(text):
+    return re.sub(r"[^\w]+", "_", str(text)).strip("_")
+
+
+def _digest(frame):
+    """그림에 들어가는 표의 내용 해시 (행 순서까지 포함)."""
+    values = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    return hashlib.blake2b(values.tobytes() + CODE_VERSION.encode(), digest_size=16).hexdigest()
+
+
+# ---------------------------------------------------------------------
+# 조합 만들기: (분류, 파일 이름, 제목, 그림 종류, 그림에 넘길 작은 표, 인자)
+# 데이터 준비(색인 조회·자르기)는 여기서 하고, 풀에는 그릴 표만 넘긴다
+# ---------------------------------------------------------------------
+def subway_jobs():
+    store = start_watcher(interval=0).store
+    for month in store.months():
+        ranking = get_index("subway_ranking", month)
+        for date in ranking.dates():
+            date_label = date.strftime("%Y%m%d")
+            for line in ranking.lines(date):
+                top_df = ranking.top(date, line, TOP_N).copy()
+                top_df["역명"] = top_df["역명"].astype(str)  # 페이지와 같게: 안 쓰는 범주에 색을 배정하지 않도록
+                yield ("subway", f"{date_label}_{_slug(line)}", f"{date_label} · {line}",
+                       "subway_top", top_df, (date_label, line))
+
+
+def mbti_jobs():
+    df = get_frame("mbti")
+    ranks = get_index("mbti_ranks")
+    for country in sorted(df["Country"].unique()):
+        row = df[df["Country"] == country].reset_index(drop=True)
+        yield ("mbti_country", _slug(country), country, "mbti_country", row, (country,))
+    for mbti_type in ranks.types:
+        top10 = ranks.top(mbti_type, n=10, include="South Korea")
+        yield ("mbti_type", mbti_type, mbti_type, "mbti_type", top10, (mbti_type,))
+
+
+SECTIONS = {
+    "subway": ("🚇 지하철 하루 Top 10 (날짜 × 호선)", subway_jobs),
+    "mbti": ("🌍 MBTI (국가별 분포, 유형별 상위 국가)", mbti_jobs),
+}
+
+
+# ---------------------------------------------------------------------
+# 풀에서 실행: 그림 만들기 + 파일 쓰기
+# ---------------------------------------------------------------------
+def _figure(kind, frame, args):
+    from common import figures
+
+    if kind == "subway_top":
+        return figures.subway_top_figure(frame, *args)
+    if kind == "mbti_country":
+        return figures.mbti_country_figure(frame, *args)[0]
+    return figures.mbti_type_figure(frame, *args)
+
+
+def render(job):
+    """그림 하나를 HTML(과 PNG)로 쓰고 걸린 시간을 돌려준다."""
+    kind, frame, args, path, png = job
+    start = time.perf_counter()
+    fig = _figure(kind, frame, args)
+    # plotly.js는 폴더마다 한 번만 (plotly.min.js) 두고 각 HTML은 그 파일을 참조
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.html")
+    fig.write_html(tmp, include_plotlyjs="directory", full_html=True)
+    os.replace(tmp, path)
+    if png:
+        fig.write_image(path.with_suffix(".png"))
+    else:
+        path.with_suffix(".png").unlink(missing_ok=True)  # 다시 그린 HTML과 어긋난 예전 PNG는 남기지 않음
+    return time.perf_counter() - start
+
+
+def write_index(output, manifest):
+    """모든 그림 링크를 분류별로 모은 index.html."""
+    parts = ["<!doctype html><meta charset='utf-8'><title>주간 보고서</title>",
+             "<style>body{font-family:sans-serif;margin:2em}li{display:inline-block;width:16em}</style>",
+             f"<h1>📑 주간 보고서</h1><p>{time.strftime('%Y-%m-%d %H:%M')} 생성</p>"]
+    for section, (title, _) in SECTIONS.items():
+        entries = sorted((key, entry) for key, entry in manifest.items() if entry["section"] == section)
+        if not entries:
+            continue
+        parts.append(f"<h2>{html.escape(title)}</h2><ul>")
+        parts += [f"<li><a href='{html.escape(entry['path'])}'>{html.escape(entry['title'])}</a></li>"
+                  for _, entry in entries]
+        parts.append("</ul>")
+    text = "\n".join(parts)
+    atomic_write(output / "index.html", lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+
+def build(sections, output=OUTPUT_DIR, workers=None, force=False, png=False):
+    """바뀐 조합만 그리고 (그린 수, 건너뛴 수, 지운 수)를 돌려준다."""
+    manifest_path = output / "manifest.json"
+    previous = read_json(manifest_path) or {}
+    # 이번에 만들지 않는 분류(--only)의 항목은 그대로 둠
+    manifest = {key: entry for key, entry in previous.items() if entry["section"] not in sections}
+    old = {} if force else previous
+    jobs = []
+    for section in sections:
+        for folder, name, title, kind, frame, args in SECTIONS[section][1]():
+            key = f"{folder}/{name}"
+            digest = _digest(frame)
+            manifest[key] = {"section": section, "title": title, "path": f"{key}.html", "hash": digest}
+            path = output / f"{key}.html"
+            # --png면 PNG까지 있어야 건너뜀 (HTML만 만들어 둔 조합도 이번에 PNG를 만듦)
+            done = path.exists() and (not png or path.with_suffix(".png").exists())
+            if old.get(key, {}).get("hash") == digest and done:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            jobs.append((kind, frame, args, path, png))
+
+    if jobs:
+        # 조합이 적으면 프로세스를 띄우는 비용이 더 커서 그냥 이 프로세스에서 그림
+        workers = workers or os.cpu_count() or 1
+        if len(jobs) < 8 or workers == 1:
+            list(map(render, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(render, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+
+    # 더 이상 없는 조합(지난 데이터의 날짜 등)은 지움
+    removed = [key for key in previous if key not in manifest]
+    for key in removed:
+        (output / f"{key}.html").unlink(missing_ok=True)
+        (output / f"{key}.png").unlink(missing_ok=True)
+
+    output.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(manifest, ensure_ascii=False, indent=1)
+    atomic_write(manifest_path, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    write_index(output, manifest)
+    built = sum(entry["section"] in sections for entry in manifest.values())
+    return len(jobs), built - len(jobs), len(removed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=list(SECTIONS), action="append", help="이 분류만 (여러 번 가능)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="결과 폴더 (기본: reports/)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="바뀌지 않은 조합도 모두 다시 그림")
+    parser.add_argument("--png", action="store_true", help="PNG도 함께 저장 (kaleido 필요)")
+    args = parser.parse_args()
+
+    if args.png:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            print("❌ PNG를 만들려면 kaleido가 필요합니다: pip install kaleido", file=sys.stderr)
+            return 1
+
+    start = time.perf_counter()
+    rendered, skipped, removed = build(args.only or list(SECTIONS), args.output, args.workers, args.force, args.png)
+    print(f"📑 보고서: {rendered}개 그림, {skipped}개는 그대로, {removed}개 삭제 "
+          f"({time.perf_counter() - start:.2f}s) → {args.output / 'index.html'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""서버가 요청을 받기 전에 모든 데이터셋과 파생 색인을 미리 만들어 두는 워밍업.
+
+CSV 파싱·타입 변환 결과는 Arrow 파일(.cache/*.arrow, 승하차는 .cache/ridership/ 월 파티션)로,
+색인은 피클(.cache/objects/)로 남기므로 서버의 첫 요청은 파싱·색인 계산 없이 디스크에서 바로 읽는다.
+이미 캐시가 최신이면 몇십 ms 안에 끝난다. 끝나면 모두 올라온 상태의 메모리 보고를
+함께 남기므로, 워커(레플리카) 하나에 필요한 메모리를 가늠할 수 있다.
+CSV를 새로 읽을 때 검사에서 걸려 격리된 행이 있으면 원본별로 알려 준다.
+
+    python warmup.py                            # 시작 전 훅으로 실행
+    python warmup.py & streamlit run main.py    # 서버와 나란히 실행해도 됨
+    python warmup.py --json                     # 결과를 JSON으로 출력
+"""
+import argparse
+import json
+import sys
+import time
+
+from common import validation
+from common.cache import CACHE_DIR, atomic_write
+from common.clustering import METHODS
+from common.indexes import get_index
+from common.ingest import RidershipStore
+from common.loader import get_frame
+from common.memory import summary
+from common.similarity import METRICS
+
+REPORT_PATH = CACHE_DIR / "warmup.json"
+
+
+def _subway():
+    # 승하차는 월 파티션 저장소로만 읽음 — 수집해 두고 그 조각으로 만드는 색인을 데움
+    store = RidershipStore()
+    store.ingest()
+    get_index("subway_stations")
+    for month in store.months():
+        get_index("subway_ranking", month)
+    get_index("subway_anomalies")
+
+
+def _mbti():
+    get_frame("mbti")
+    get_index("mbti_ranks")
+    get_index("mbti_similarity")
+    for metric in METRICS:
+        for method in METHODS:
+            get_index("mbti_clustering", metric, method)
+
+
+def _brands():
+    get_frame("brands")
+    get_index("brands")
+
+
+def _tea():
+    get_frame("tea")
+    get_index("recipes")
+
+
+def _places():
+    get_frame("places")
+    get_index("places")
+
+
+# 데이터셋(원본 파일) → 그 파일로 만드는 프레임과 색인을 모두 데우는 함수
+STEPS = {
+    "damn.csv": _subway,
+    "countriesMBTI_16types.csv": _mbti,
+    "altificial.csv": _brands,
+    "TEA.csv": _tea,
+    "places.csv": _places,
+    "mbti_catalog.json": lambda: get_index("catalog"),
+}
+
+
+def warm(steps=STEPS):
+    """단계마다 (이름, 소요 초, 오류 메시지 또는 None)을 돌려준다. 실패해도 다음 단계는 계속."""
+    results = []
+    for name, step in steps.items():
+        start = time.perf_counter()
+        try:
+            step()
+            error = None
+        except Exception as e:  # 한 데이터셋이 없거나 깨져도 나머지는 데움
+            error = f"{type(e).__name__}: {e}"
+        results.append((name, time.perf_counter() - start, error))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = warm()
+    total = time.perf_counter() - start
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "total_s": total,
+        "datasets": {name: {"seconds": seconds, "error": error} for name, seconds, error in results},
+        "memory": summary(),
+        "quarantine": validation.summary(),
+    }
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        text = json.dumps(report, ensure_ascii=False, indent=1)
+        atomic_write(REPORT_PATH, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+    except OSError:
+        pass
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        for name, seconds, error in results:
+            print(f"{'❌' if error else '✅'} {name:28s} {seconds:7.3f}s" + (f"  {error}" if error else ""))
+        print(f"🔥 워밍업 완료: {total:.3f}s ({len(results)}개 파일)")
+        memory = report["memory"]
+        print(f"🧠 메모리: 데이터셋 {sum(memory['datasets'].values()) / (1 << 20):.2f} MB · "
+              f"색인 {sum(memory['indexes'].values()) / (1 << 20):.2f} MB · "
+              f"프로세스 RSS {(memory['rss'] or 0) / (1 << 20):.1f} MB")
+        for name, entry in report["quarantine"].items():
+            if entry["quarantined"]:
+                reasons = ", ".join(f"{reason} {count}" for reason, count in entry["reasons"].items())
+                print(f"🧹 {name}: {entry['rows']:,}행 중 {entry['quarantined']:,}행 격리 ({reasons}) "
+                      f"→ {validation.QUARANTINE_DIR / name}.csv")
+    return 1 if any(error for _, _, error in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())